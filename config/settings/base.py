@@ -4,6 +4,7 @@ Base settings to build other settings files upon.
 from pathlib import Path
 
 import environ
+from celery.schedules import crontab
 
 ROOT_DIR = Path(__file__).resolve(strict=True).parent.parent.parent
 # hisitter/
@@ -73,7 +74,8 @@ THIRD_PARTY_APPS = [
 LOCAL_APPS = [
     "hisitter.users.apps.UsersAppsConfig",
     "hisitter.services.apps.ServicesAppsConfig",
-    "hisitter.reviews.apps.ReviewsAppsConfig"
+    "hisitter.reviews.apps.ReviewsAppsConfig",
+    "hisitter.outbox.apps.OutboxAppsConfig"
     # Your stuff: custom apps go here
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
@@ -126,6 +128,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "hisitter.users.roles.RolesMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.common.BrokenLinkEmailsMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
@@ -257,6 +260,35 @@ CELERY_TASK_TIME_LIMIT = 5 * 60
 CELERY_TASK_SOFT_TIME_LIMIT = 60
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#beat-scheduler
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+CELERY_BEAT_SCHEDULE = {
+    # Picks up outbox messages whose drain task was lost with the broker.
+    "drain-outbox": {"task": "drain_outbox", "schedule": 60.0},
+    # Repairs the babysitters' rating counters that drifted from the reviews.
+    "reconcile-reputation": {
+        "task": "reconcile_reputation",
+        "schedule": crontab(minute=30, hour=3),
+    },
+}
+
+# Signed access tokens
+# ------------------------------------------------------------------------------
+# When enabled, login also returns a JWT access/refresh pair, sent as
+# "Authorization: Bearer <access>". Opaque "Token <key>" tokens keep working.
+JWT_AUTH_ENABLED = env.bool("DJANGO_JWT_AUTH_ENABLED", default=False)
+# Lifetimes in seconds.
+JWT_ACCESS_TOKEN_LIFETIME = env.int("DJANGO_JWT_ACCESS_TOKEN_LIFETIME", default=15 * 60)
+JWT_REFRESH_TOKEN_LIFETIME = env.int("DJANGO_JWT_REFRESH_TOKEN_LIFETIME", default=14 * 24 * 60 * 60)
+
+# Geocoding
+# ------------------------------------------------------------------------------
+# Backend that turns addresses into coordinates, see hisitter.users.geocoding.
+GEOCODER_BACKEND = env(
+    "DJANGO_GEOCODER_BACKEND", default="hisitter.users.geocoding.NominatimGeocoder"
+)
+# Seconds a geocoder request may take, it runs in the Celery workers.
+GEOCODER_TIMEOUT = env.int("DJANGO_GEOCODER_TIMEOUT", default=10)
+# Addresses each process keeps in memory in front of the GeocodeCache table.
+GEOCODER_LRU_SIZE = env.int("DJANGO_GEOCODER_LRU_SIZE", default=1024)
 
 # django-rest-framework
 # -------------------------------------------------------------------------------
@@ -266,6 +298,7 @@ REST_FRAMEWORK = {
         "rest_framework.renderers.JSONRenderer",
     ),
     "DEFAULT_AUTHENTICATION_CLASSES": (
+        "hisitter.users.authentication.JWTAuthentication",
         "rest_framework.authentication.TokenAuthentication",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
@@ -47,5 +47,9 @@ TEMPLATES[-1]["OPTIONS"]["loaders"] = [  # type: ignore[index] # noqa F405
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
+# GEOCODING
+# ------------------------------------------------------------------------------
+GEOCODER_BACKEND = "hisitter.users.geocoding.DummyGeocoder"
+
 # Your stuff...
 # ------------------------------------------------------------------------------
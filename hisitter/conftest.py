@@ -1,7 +1,8 @@
 import pytest
+from rest_framework.test import APIClient
 
-from hisitter.users.models import User
-from hisitter.users.tests.factories import UserFactory
+from hisitter.users.models import Client, User
+from hisitter.users.tests.factories import ClientFactory, UserFactory
 
 
 @pytest.fixture(autouse=True)
@@ -12,3 +13,16 @@ def media_storage(settings, tmpdir):
 @pytest.fixture
 def user() -> User:
     return UserFactory()
+
+
+@pytest.fixture
+def client_user() -> Client:
+    return ClientFactory()
+
+
+@pytest.fixture
+def api_client(client_user) -> APIClient:
+    """ API client authenticated as client_user. """
+    api_client = APIClient()
+    api_client.force_authenticate(client_user.user_client)
+    return api_client
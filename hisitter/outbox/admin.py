@@ -0,0 +1,14 @@
+""" Admin for control Outbox model. """
+
+# Django imports
+from django.contrib import admin
+
+# Models
+from hisitter.outbox.models import OutboxMessage
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    """ Outbox message Admin. """
+    list_display = ('task', 'attempts', 'created_at', 'processed_at')
+    list_filter = ('task', 'processed_at')
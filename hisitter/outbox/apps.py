@@ -0,0 +1,10 @@
+"""Outbox apps"""
+
+# Django imports
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class OutboxAppsConfig(AppConfig):
+    name = "hisitter.outbox"
+    verbose_name = _("Outbox")
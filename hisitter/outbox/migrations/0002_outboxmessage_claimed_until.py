@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("outbox", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="outboxmessage",
+            name="claimed_until",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="A drain is running the task, other drains skip it until then.",
+                null=True,
+                verbose_name="claimed until",
+            ),
+        ),
+    ]
@@ -0,0 +1 @@
+from .messages import *
@@ -0,0 +1,74 @@
+""" Outbox messages model. """
+
+# Django imports
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+# Utils abstract model
+from hisitter.utils.abstract_users import HisitterModel
+
+__all__ = ['OutboxMessage']
+
+# Failed messages are retried until they reach this number of attempts.
+MAX_ATTEMPTS = 5
+
+
+class OutboxMessageQuerySet(models.QuerySet):
+    """ Outbox messages queries. """
+
+    def pending(self):
+        """ Messages not delivered yet that can still be retried. """
+        return self.filter(processed_at__isnull=True, attempts__lt=MAX_ATTEMPTS)
+
+    def claimable(self, now):
+        """ Pending messages not claimed by a drain, or whose claim expired. """
+        return self.pending().filter(
+            models.Q(claimed_until__isnull=True) | models.Q(claimed_until__lt=now)
+        )
+
+
+class OutboxMessage(HisitterModel):
+    """ A Celery task to run once the transaction that wrote it commits.
+
+        The message is written with the rows that caused it, so a rolled
+        back request leaves nothing to send, and the task runs outside
+        the request.
+    """
+    task = models.CharField(
+        _("Task"),
+        max_length=100,
+        help_text='Registered name of the Celery task.'
+    )
+    payload = models.JSONField(
+        _("Payload"),
+        default=dict,
+        help_text='Keyword arguments of the task.'
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    claimed_until = models.DateTimeField(
+        'claimed until',
+        blank=True,
+        null=True,
+        help_text='A drain is running the task, other drains skip it until then.'
+    )
+    processed_at = models.DateTimeField(
+        'processed at',
+        blank=True,
+        null=True,
+        help_text='Date time on which the task ran successfully.'
+    )
+
+    objects = OutboxMessageQuerySet.as_manager()
+
+    class Meta(HisitterModel.Meta):
+        indexes = [
+            models.Index(
+                fields=['id'],
+                condition=models.Q(processed_at__isnull=True),
+                name='outbox_pending_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.task} #{self.pk}'
@@ -0,0 +1,89 @@
+""" Outbox celery tasks."""
+
+# Python
+from datetime import timedelta
+
+# Django imports
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+# Celery imports
+from celery import current_app, shared_task
+
+# Models
+from hisitter.outbox.models import OutboxMessage
+
+# Messages claimed at a time.
+BATCH_SIZE = 100
+
+# A claim outlives the drain that made it, which Celery stops after
+# CELERY_TASK_TIME_LIMIT. Claims of a drain that died are taken over then.
+CLAIM_TIMEOUT = timedelta(seconds=2 * settings.CELERY_TASK_TIME_LIMIT)
+
+
+def enqueue(task, **kwargs):
+    """ Write a message for the task in the current transaction and
+        drain the outbox once it commits. kwargs must be JSON serializable.
+    """
+    message = OutboxMessage.objects.create(task=task.name, payload=kwargs)
+    transaction.on_commit(drain_outbox.delay)
+    return message
+
+
+def enqueue_many(task, kwargs_list):
+    """ Like enqueue(), writing one message per kwargs with a single insert. """
+    messages = OutboxMessage.objects.bulk_create(
+        OutboxMessage(task=task.name, payload=kwargs) for kwargs in kwargs_list
+    )
+    if messages:
+        transaction.on_commit(drain_outbox.delay)
+    return messages
+
+
+@shared_task(name='drain_outbox')
+def drain_outbox(batch_size=BATCH_SIZE):
+    """ Run the pending outbox messages in batches.
+
+        Each batch is claimed in a short transaction with SKIP LOCKED, so
+        several workers can drain at the same time without running a
+        message twice, and the locks aren't held while the tasks run.
+        Every message then runs in its own transaction: a failed one,
+        database errors included, keeps its error for the next drain
+        without undoing the others. Return the number of messages
+        delivered.
+    """
+    delivered = 0
+    last_id = 0
+    while True:
+        now = timezone.now()
+        with transaction.atomic():
+            messages = list(
+                OutboxMessage.objects.claimable(now)
+                .filter(id__gt=last_id)
+                .select_for_update(skip_locked=True)
+                .order_by('id')[:batch_size]
+            )
+            OutboxMessage.objects.filter(id__in=[message.id for message in messages]).update(
+                claimed_until=now + CLAIM_TIMEOUT
+            )
+        for message in messages:
+            try:
+                with transaction.atomic():
+                    current_app.tasks[message.task](**message.payload)
+            except Exception as error:
+                OutboxMessage.objects.filter(id=message.id).update(
+                    attempts=F('attempts') + 1,
+                    last_error=repr(error),
+                    claimed_until=None
+                )
+            else:
+                OutboxMessage.objects.filter(id=message.id).update(
+                    processed_at=timezone.now(),
+                    claimed_until=None
+                )
+                delivered += 1
+        if len(messages) < batch_size:
+            return delivered
+        last_id = messages[-1].id
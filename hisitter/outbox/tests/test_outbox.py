@@ -0,0 +1,121 @@
+import datetime
+from unittest import mock
+
+import pytest
+from celery import shared_task
+from django.core import mail
+from django.db import connection, transaction
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from hisitter.outbox.models import OutboxMessage
+from hisitter.outbox.tasks import drain_outbox, enqueue
+from hisitter.services.tasks import create_a_service_email
+from hisitter.users.models import Availability
+from hisitter.users.tests.factories import BabysitterFactory, ClientFactory
+
+pytestmark = pytest.mark.django_db
+
+SLOT_DATE = datetime.date.today() + datetime.timedelta(days=7)
+
+
+def email_kwargs(**overrides):
+    kwargs = {
+        "client_username": "client",
+        "bbs_username": "babysitter",
+        "client_email": "client@hisitter.test",
+        "bbs_email": "babysitter@hisitter.test",
+        "date": SLOT_DATE.isoformat(),
+        "shift": "morning",
+    }
+    kwargs.update(overrides)
+    return kwargs
+
+
+def test_booking_writes_the_email_to_the_outbox(django_capture_on_commit_callbacks):
+    client, babysitter = ClientFactory(), BabysitterFactory()
+    Availability.objects.create(bbs=babysitter, day=SLOT_DATE.strftime("%A"), shift="morning")
+    api_client = APIClient()
+    api_client.force_authenticate(client.user_client)
+    url = reverse(
+        "services:services-creation-create-service",
+        kwargs={"babysitter": babysitter.user_bbs.username}
+    )
+
+    with mock.patch.object(drain_outbox, "delay") as delay:
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(url, {
+                "date": SLOT_DATE.isoformat(),
+                "shift": "morning",
+                "scheduled_start": f"{SLOT_DATE.isoformat()}T08:00:00Z",
+                "count_children": 1,
+                "special_cares": "",
+            }, format="json")
+
+    assert response.status_code == 201
+    assert mail.outbox == []
+    delay.assert_called_once_with()
+    message = OutboxMessage.objects.get()
+    assert message.task == "create_a_service_mail"
+    assert message.payload["bbs_username"] == babysitter.user_bbs.username
+
+
+def test_a_rolled_back_transaction_leaves_no_message(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks() as callbacks:
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                enqueue(create_a_service_email, **email_kwargs())
+                raise RuntimeError
+
+    assert callbacks == []
+    assert not OutboxMessage.objects.exists()
+
+
+def test_drain_runs_the_pending_messages_in_batches():
+    for index in range(5):
+        enqueue(create_a_service_email, **email_kwargs(client_username=f"client{index}"))
+
+    assert drain_outbox(batch_size=2) == 5
+
+    assert len(mail.outbox) == 5
+    assert not OutboxMessage.objects.pending().exists()
+    assert drain_outbox() == 0
+    assert len(mail.outbox) == 5
+
+
+def test_a_failed_message_is_kept_for_the_next_drain():
+    failing = enqueue(create_a_service_email, **email_kwargs())
+    OutboxMessage.objects.filter(pk=failing.pk).update(payload={"unexpected": True})
+    enqueue(create_a_service_email, **email_kwargs())
+
+    assert drain_outbox() == 1
+
+    failing.refresh_from_db()
+    assert failing.processed_at is None
+    assert failing.attempts == 1
+    assert "unexpected" in failing.last_error
+    assert list(OutboxMessage.objects.pending()) == [failing]
+
+
+@shared_task(name="outbox_test_broken_query")
+def broken_query():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT * FROM outbox_test_no_such_table")
+
+
+def test_a_database_error_doesnt_undo_the_rest_of_the_batch():
+    enqueue(create_a_service_email, **email_kwargs(client_username="before"))
+    failing = enqueue(broken_query)
+    enqueue(create_a_service_email, **email_kwargs(client_username="after"))
+
+    assert drain_outbox() == 2
+
+    assert len(mail.outbox) == 2
+    failing.refresh_from_db()
+    assert failing.attempts == 1
+    assert failing.claimed_until is None
+    assert "outbox_test_no_such_table" in failing.last_error
+    assert list(OutboxMessage.objects.pending()) == [failing]
+    # Delivered messages aren't sent again.
+    assert drain_outbox() == 0
+    assert len(mail.outbox) == 2
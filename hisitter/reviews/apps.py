@@ -8,3 +8,7 @@ from django.utils.translation import gettext_lazy as _
 class ReviewsAppsConfig(AppConfig):
     name = "hisitter.reviews"
     verbose_name = _("Reviews")
+
+    def ready(self):
+        """ Connect the reviews signals. """
+        from hisitter.reviews import signals  # noqa: F401
@@ -0,0 +1,25 @@
+"""Management command to repair the rating counters and reputations that drifted from the reviews."""
+
+from django.core.management.base import BaseCommand
+
+from hisitter.reviews.reputation import reconcile
+
+
+class Command(BaseCommand):
+    help = "Recompute the babysitters' rating counters and reputation from their reviews"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Babysitters read and updated per query')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report the babysitters that drifted'
+        )
+
+    def handle(self, *args, **options):
+        result = reconcile(batch_size=options['batch_size'], dry_run=options['dry_run'])
+        action = 'would be repaired' if options['dry_run'] else 'repaired'
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {result['checked']} babysitters, {result['changed']} {action} "
+            f"in {result['seconds']:.1f}s"
+        ))
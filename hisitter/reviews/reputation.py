@@ -0,0 +1,135 @@
+""" Babysitters' reputation from running rating counters.
+
+    Each Babysitter keeps rating_sum and rating_count of its reviews, moved
+    with F() expressions when a review is created, and the reputation of
+    its user is derived from them, together with rating_1..rating_5, the
+    number of reviews that gave each number of stars. reconcile()
+    recomputes the counters of locked batches of babysitters from their
+    reviews with a GROUP BY and repairs the rows that drifted (reviews
+    edited or deleted from the admin, for example).
+"""
+
+# Python
+import time
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+
+# Django imports
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+# Models
+from hisitter.reviews.models import Review
+from hisitter.users.models import Babysitter, BabysitterCard, User
+
+# Cache
+from hisitter.users import profile_cache
+
+# Reputation of a babysitter without reviews, the User.reputation default.
+DEFAULT_REPUTATION = Decimal('5.0')
+
+STARS = range(1, 6)
+HISTOGRAM_FIELDS = tuple(f'rating_{stars}' for stars in STARS)
+COUNTER_FIELDS = ('rating_sum', 'rating_count', *HISTOGRAM_FIELDS)
+
+
+def average(rating_sum, rating_count):
+    """ Return the reputation of the counters, rounded to one decimal. """
+    if not rating_count:
+        return DEFAULT_REPUTATION
+    return (Decimal(rating_sum) / rating_count).quantize(Decimal('0.1'), rounding=ROUND_HALF_UP)
+
+
+def add_rating(babysitter_id, rating):
+    """ Count a new rating of the babysitter and update its reputation.
+
+        Meant to run in the transaction that creates the review: the
+        UPDATE locks the babysitter's row, so concurrent reviews are added
+        one after the other and the counters read back are this
+        transaction's.
+    """
+    counters = {
+        'rating_sum': F('rating_sum') + rating,
+        'rating_count': F('rating_count') + 1
+    }
+    if rating in STARS:
+        counters[f'rating_{rating}'] = F(f'rating_{rating}') + 1
+    Babysitter.objects.filter(pk=babysitter_id).update(**counters)
+    rating_sum, rating_count, user_id, username = Babysitter.objects.filter(
+        pk=babysitter_id
+    ).values_list('rating_sum', 'rating_count', 'user_bbs', 'user_bbs__username').get()
+    reputation = average(rating_sum, rating_count)
+    now = timezone.now()
+    User.objects.filter(pk=user_id).update(reputation=reputation, updated_at=now)
+    BabysitterCard.objects.filter(user=user_id).update(reputation=reputation, updated_at=now)
+    profile_cache.invalidate_profiles([username])
+    return reputation
+
+
+def review_totals(babysitter_ids):
+    """ Return {babysitter id: (rating sum, rating count, *histogram)} of
+        the babysitters from their reviews, in the order of COUNTER_FIELDS.
+    """
+    rows = Review.objects.filter(service_origin__user_bbs__in=babysitter_ids).order_by().values(
+        'service_origin__user_bbs', 'reputation'
+    ).annotate(total=Count('id')).values_list('service_origin__user_bbs', 'reputation', 'total')
+    totals = defaultdict(lambda: [0] * len(COUNTER_FIELDS))
+    for babysitter_id, rating, total in rows:
+        counters = totals[babysitter_id]
+        counters[0] += rating * total
+        counters[1] += total
+        if rating in STARS:
+            counters[1 + rating] += total
+    return {babysitter_id: tuple(counters) for babysitter_id, counters in totals.items()}
+
+
+def reconcile(batch_size=1000, dry_run=False):
+    """ Compare every babysitter's counters and reputation with its reviews
+        and repair the ones that drifted, batch_size rows per UPDATE.
+        Return {'checked': babysitters read, 'changed': babysitters that
+        drifted, 'seconds': time taken}.
+
+        Each batch is locked before its reviews are counted, in the same
+        transaction as its writes. add_rating() updates the same rows, so a
+        review created meanwhile is either counted or waits for the batch.
+    """
+    start = time.monotonic()
+    empty = (0,) * len(COUNTER_FIELDS)
+    checked, changed, last_pk = 0, 0, 0
+    while True:
+        with transaction.atomic():
+            babysitters = Babysitter.objects.filter(pk__gt=last_pk).order_by('pk')
+            if not dry_run:
+                babysitters = babysitters.select_for_update(of=('self',))
+            batch = list(babysitters.values_list(
+                'pk', 'user_bbs', 'user_bbs__username', 'user_bbs__reputation', *COUNTER_FIELDS
+            )[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            checked += len(batch)
+            totals = review_totals([row[0] for row in batch])
+            counters, users = [], []
+            for pk, user_id, username, stored_reputation, *stored in batch:
+                expected = totals.get(pk, empty)
+                reputation = average(*expected[:2])
+                if tuple(stored) == expected and stored_reputation == reputation:
+                    continue
+                counters.append(Babysitter(pk=pk, **dict(zip(COUNTER_FIELDS, expected))))
+                users.append((User(pk=user_id, reputation=reputation), username))
+            changed += len(counters)
+            if dry_run or not counters:
+                continue
+            now = timezone.now()
+            for user, username in users:
+                user.updated_at = now
+            Babysitter.objects.bulk_update(counters, COUNTER_FIELDS)
+            User.objects.bulk_update([user for user, username in users], ['reputation', 'updated_at'])
+            BabysitterCard.objects.refresh(user.pk for user, username in users)
+            profile_cache.invalidate_profiles(username for user, username in users)
+    return {
+        'checked': checked,
+        'changed': changed,
+        'seconds': round(time.monotonic() - start, 3)
+    }
@@ -1,7 +1,8 @@
 """ Review Serializers. """
 
 # Django imports
-from django.db.models import Avg
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import IntegrityError, transaction
 
 # Django Rest Framework Serializers
 from rest_framework import serializers
@@ -9,6 +10,12 @@ from rest_framework import serializers
 # Models
 from hisitter.reviews.models import Review
 
+# Reputation
+from hisitter.reviews.reputation import add_rating
+
+# Utils
+from hisitter.utils.values_serializers import ValuesSerializer
+
 class CreateReviewModelSerializer(serializers.ModelSerializer):
     """ Create Review Serializer. """
 
@@ -28,22 +35,31 @@ class CreateReviewModelSerializer(serializers.ModelSerializer):
         service = self.context['service']
         if service.is_active:
             raise serializers.ValidationError('You need to finish the Service after write a review.')
+        try:
+            service.service_origin
+        except ObjectDoesNotExist:
+            pass
+        else:
+            raise serializers.ValidationError('The service already has a review.')
         data['service'] = service
         return data
         
     def create(self, data):
-        """ Create the review. """
-        user_bbs = data['service'].user_bbs.user_bbs
-        review = Review.objects.create(
-            service_origin=data['service'],
-            review=data['review'],
-            reputation=data['reputation']
-        )
-        reputation_avg = Review.objects.filter(
-            service_origin__user_bbs__user_bbs=user_bbs
-        ).aggregate(Avg('reputation'))
-        user_bbs.reputation = reputation_avg['reputation__avg']
-        user_bbs.save()
+        """ Create the review and count its rating in the babysitter's
+            reputation, both in the same transaction.
+        """
+        # A concurrent request may review the service after validate(), the
+        # savepoint keeps the request transaction usable if it did.
+        try:
+            with transaction.atomic():
+                review = Review.objects.create(
+                    service_origin=data['service'],
+                    review=data['review'],
+                    reputation=data['reputation']
+                )
+                add_rating(data['service'].user_bbs_id, review.reputation)
+        except IntegrityError:
+            raise serializers.ValidationError('The service already has a review.')
         return review
 
 class ReviewModelSerializer(serializers.ModelSerializer):
@@ -58,4 +74,33 @@ class ReviewModelSerializer(serializers.ModelSerializer):
             'reputation',
             'review'
         )
-    
\ No newline at end of file
+
+
+class ReviewValuesSerializer(ValuesSerializer):
+    """ ReviewModelSerializer built from .values() rows. """
+    serializer_class = ReviewModelSerializer
+    null_column = 'id'
+
+
+class BabysitterReviewSerializer(serializers.ModelSerializer):
+    """ A review in the list of a babysitter's reviews. """
+    client = serializers.CharField(
+        source='service_origin.user_client.user_client.username',
+        read_only=True
+    )
+
+    class Meta:
+        """ Meta class."""
+        model = Review
+        fields = (
+            'id',
+            'reputation',
+            'review',
+            'client',
+            'created_at'
+        )
+
+
+class BabysitterReviewValuesSerializer(ValuesSerializer):
+    """ BabysitterReviewSerializer built from .values() rows. """
+    serializer_class = BabysitterReviewSerializer
@@ -0,0 +1,27 @@
+""" Reviews signals. """
+
+# Django imports
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# Models
+from hisitter.reviews.models import Review
+from hisitter.users.models import User
+
+# Cache
+from hisitter.users import profile_cache
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_reviewed_profile(sender, instance, created=False, **kwargs):
+    """ Forget the cached profile of the reviewed babysitter. New reviews
+        go through reputation.add_rating(), which already does it.
+    """
+    if created:
+        return
+    profile_cache.invalidate_profiles(
+        User.objects.filter(
+            user_bbs__bbs_service=instance.service_origin_id
+        ).values_list('username', flat=True)
+    )
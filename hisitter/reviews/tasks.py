@@ -0,0 +1,27 @@
+""" Reviews celery tasks."""
+
+# Python
+import logging
+
+# Celery imports
+from celery import shared_task
+
+# Reputation
+from hisitter.reviews.reputation import reconcile
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='reconcile_reputation')
+def reconcile_reputation(batch_size=1000):
+    """ Repair the babysitters whose rating counters or reputation drifted
+        from their reviews. Scheduled every night in CELERY_BEAT_SCHEDULE.
+        Return the counts and the time taken, also logged.
+    """
+    result = reconcile(batch_size=batch_size)
+    logger.info(
+        'Reputation reconciled: %(checked)d babysitters checked, '
+        '%(changed)d changed in %(seconds).3fs',
+        result
+    )
+    return result
@@ -0,0 +1,46 @@
+import pytest
+from django.urls import reverse
+
+from hisitter.reviews.models import Review
+from hisitter.services.tests.factories import ServiceFactory
+from hisitter.users.tests.factories import BabysitterFactory
+
+from .test_reputation import post_review
+
+pytestmark = pytest.mark.django_db
+
+
+def reviews_url(babysitter):
+    return reverse("reviews:babysitter-reviews-list", args=[babysitter.user_bbs.username])
+
+
+def test_reviews_with_histogram(api_client, django_assert_num_queries):
+    babysitter = BabysitterFactory()
+    for rating in (5, 4, 4, 1):
+        assert post_review(ServiceFactory(user_bbs=babysitter, is_active=False), rating).status_code == 201
+    # Reviews of other babysitters are not listed.
+    post_review(ServiceFactory(is_active=False), 3)
+
+    # SAVEPOINT, the counters, the page, RELEASE; no GROUP BY over the reviews.
+    with django_assert_num_queries(4) as context:
+        response = api_client.get(reviews_url(babysitter), {"limit": 3})
+
+    assert response.status_code == 200
+    assert not any("GROUP BY" in query["sql"] for query in context.captured_queries)
+    assert response.data["rating"] == {
+        "reputation": "3.5",
+        "count": 4,
+        "histogram": {"1": 1, "2": 0, "3": 0, "4": 2, "5": 1},
+    }
+    assert [review["reputation"] for review in response.data["results"]] == [1, 4, 4]
+    first = response.data["results"][0]
+    assert first["client"] == Review.objects.get(pk=first["id"]).service_origin.user_client.user_client.username
+
+    response = api_client.get(response.data["next"])
+    assert [review["reputation"] for review in response.data["results"]] == [5]
+    assert response.data["next"] is None
+
+
+def test_unknown_babysitter(api_client):
+    response = api_client.get(reverse("reviews:babysitter-reviews-list", args=["nobody"]))
+    assert response.status_code == 404
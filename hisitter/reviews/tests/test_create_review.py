@@ -0,0 +1,68 @@
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from hisitter.reviews.models import Review
+from hisitter.reviews.views.reviews import ReviewViewSet
+from hisitter.services.models import Service
+from hisitter.services.tests.factories import ServiceFactory
+
+from .test_reputation import post_review
+
+pytestmark = pytest.mark.django_db
+
+
+def test_review_query_budget(django_assert_num_queries):
+    service = ServiceFactory(is_active=False)
+
+    # Savepoint, service with its client and review, savepoint, INSERT
+    # review, UPDATE counters, SELECT counters, UPDATE user, UPDATE card,
+    # release, release.
+    with django_assert_num_queries(10):
+        response = post_review(service, 4)
+
+    assert response.status_code == 201
+    assert Review.objects.get(service_origin=service).reputation == 4
+
+
+def test_service_is_reviewed_once():
+    service = ServiceFactory(is_active=False)
+    assert post_review(service, 4).status_code == 201
+
+    response = post_review(service, 1)
+
+    assert response.status_code == 400
+    assert Review.objects.filter(service_origin=service).count() == 1
+    service.user_bbs.refresh_from_db()
+    assert service.user_bbs.rating_count == 1
+
+
+def test_concurrent_review_of_the_service():
+    service = ServiceFactory(is_active=False)
+    # Read before the other request wrote its review, as a racing request would.
+    stale = Service.objects.select_related("user_client", "service_origin").get(pk=service.pk)
+    Review.objects.create(service_origin=service, review="First", reputation=5)
+
+    with mock.patch.object(ReviewViewSet, "service", stale):
+        response = post_review(service, 1)
+
+    assert response.status_code == 400
+    assert Review.objects.get(service_origin=service).reputation == 5
+    service.user_bbs.refresh_from_db()
+    assert service.user_bbs.rating_count == 0
+
+
+def test_unknown_service_after_authentication():
+    url = reverse("reviews:reviews-list", kwargs={"service": 0})
+    with CaptureQueriesContext(connection) as context:
+        assert APIClient().post(url, {}, format="json").status_code == 401
+    # Anonymous requests are turned away before the service is read.
+    assert not any("services_service" in query["sql"] for query in context.captured_queries)
+
+    api_client = APIClient()
+    api_client.force_authenticate(ServiceFactory().user_client.user_client)
+    assert api_client.post(url, {}, format="json").status_code == 404
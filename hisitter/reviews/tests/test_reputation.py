@@ -0,0 +1,102 @@
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from celery.schedules import crontab
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from hisitter.reviews.models import Review
+from hisitter.reviews import reputation
+from hisitter.reviews.reputation import average, reconcile
+from hisitter.reviews.tasks import reconcile_reputation
+from hisitter.services.tests.factories import ServiceFactory
+from hisitter.users.models import Babysitter, BabysitterCard, User
+from hisitter.users.tests.factories import BabysitterFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def post_review(service, rating):
+    api_client = APIClient()
+    api_client.force_authenticate(service.user_client.user_client)
+    return api_client.post(
+        reverse("reviews:reviews-list", kwargs={"service": service.pk}),
+        {"reputation": rating, "review": "Review"},
+        format="json",
+    )
+
+
+def test_average():
+    assert average(0, 0) == Decimal("5.0")
+    assert average(13, 3) == Decimal("4.3")
+    assert average(9, 2) == Decimal("4.5")
+
+
+def test_reviews_move_the_counters():
+    babysitter = BabysitterFactory()
+    for rating in (5, 4, 4):
+        service = ServiceFactory(user_bbs=babysitter, is_active=False)
+        assert post_review(service, rating).status_code == 201
+
+    babysitter.refresh_from_db()
+    assert (babysitter.rating_sum, babysitter.rating_count) == (13, 3)
+    assert (babysitter.rating_4, babysitter.rating_5, babysitter.rating_1) == (2, 1, 0)
+    assert User.objects.get(pk=babysitter.user_bbs_id).reputation == Decimal("4.3")
+    assert BabysitterCard.objects.get(user=babysitter.user_bbs_id).reputation == Decimal("4.3")
+
+
+def test_reconcile_repairs_drift():
+    drifted, exact = BabysitterFactory.create_batch(2)
+    for babysitter in (drifted, exact):
+        post_review(ServiceFactory(user_bbs=babysitter, is_active=False), 4)
+    # Deleting a review from the admin doesn't move the counters.
+    Review.objects.filter(service_origin__user_bbs=drifted).delete()
+
+    assert reconcile(dry_run=True)["changed"] == 1
+    assert Babysitter.objects.get(pk=drifted.pk).rating_count == 1
+
+    call_command("reconcile_reputation", batch_size=1)
+
+    drifted.refresh_from_db()
+    assert (drifted.rating_sum, drifted.rating_count, drifted.rating_4) == (0, 0, 0)
+    assert User.objects.get(pk=drifted.user_bbs_id).reputation == Decimal("5.0")
+    assert BabysitterCard.objects.get(user=drifted.user_bbs_id).reputation == Decimal("5.0")
+    assert reconcile()["changed"] == 0
+
+
+def test_reconcile_keeps_reviews_created_while_it_runs():
+    first, second = BabysitterFactory.create_batch(2)
+    service = ServiceFactory(user_bbs=second, is_active=False)
+    review_totals = reputation.review_totals
+
+    def review_after_counting(babysitter_ids):
+        totals = review_totals(babysitter_ids)
+        # A review of a babysitter of a later batch.
+        if first.pk in babysitter_ids:
+            assert post_review(service, 3).status_code == 201
+        return totals
+
+    with mock.patch.object(reputation, "review_totals", side_effect=review_after_counting):
+        assert reconcile(batch_size=1)["changed"] == 0
+
+    second.refresh_from_db()
+    assert (second.rating_sum, second.rating_count, second.rating_3) == (3, 1, 1)
+    assert User.objects.get(pk=second.user_bbs_id).reputation == Decimal("3.0")
+
+
+def test_reconcile_task_is_scheduled(settings):
+    entry = settings.CELERY_BEAT_SCHEDULE["reconcile-reputation"]
+    assert entry["task"] == "reconcile_reputation"
+    assert entry["schedule"] == crontab(minute=30, hour=3)
+
+
+def test_reconcile_task_reports_the_changes():
+    babysitter = BabysitterFactory()
+    Babysitter.objects.filter(pk=babysitter.pk).update(rating_count=3, rating_sum=12)
+
+    result = reconcile_reputation()
+
+    assert result["changed"] == 1
+    assert result["seconds"] >= 0
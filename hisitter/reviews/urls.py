@@ -12,6 +12,11 @@ from .views import reviews as reviews_views
 
 router = DefaultRouter()
 router.register(r'reviews/(?P<service>[0-9]+)/service', reviews_views.ReviewViewSet, basename='reviews')
+router.register(
+    r'reviews/babysitters/(?P<username>[\w.@+-]+)',
+    reviews_views.BabysitterReviewViewSet,
+    basename='babysitter-reviews'
+)
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,12 +1,14 @@
 """ Reviews view."""
 
 # Ptyhon
+from collections import OrderedDict
 import datetime
 from datetime import timezone
 import logging
 
 # Django imports
 from django.db.models import Q
+from django.utils.functional import cached_property
 
 # Django REST Framework imports
 from rest_framework.response import Response
@@ -14,9 +16,9 @@ from rest_framework import status, viewsets, mixins
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.generics import get_object_or_404
+from rest_framework.exceptions import NotFound
 
 # Permissions
-from hisitter.services.permissions import IsUserClient
 from hisitter.reviews.permissions import IsServiceOwner
 
 # Models
@@ -25,7 +27,16 @@ from hisitter.services.models import Service
 from hisitter.reviews.models import Review
 
 # Serializers
-from hisitter.reviews.serializers import CreateReviewModelSerializer, ReviewModelSerializer
+from hisitter.reviews.serializers import (
+    CreateReviewModelSerializer,
+    ReviewModelSerializer,
+    BabysitterReviewSerializer,
+    BabysitterReviewValuesSerializer
+)
+
+# Utils
+from hisitter.reviews.reputation import HISTOGRAM_FIELDS
+from hisitter.utils.pagination import ReviewKeysetPagination
 
 # Swagger
 from drf_yasg.utils import swagger_auto_schema
@@ -44,12 +55,16 @@ class ReviewViewSet(
 
     serializer_class = CreateReviewModelSerializer
 
-    def dispatch(self, request, *args, **kwargs):
-        """ Obtain the babysitter as url parameter, to return 
-            all the reviews about that babysitter. """
-        service = kwargs['service']
-        self.service = get_object_or_404(Service, id=service)
-        return super().dispatch(request, *args, **kwargs)
+    @cached_property
+    def service(self):
+        """ The service of the url, read when the permissions first need
+            it (after authentication) with its client and review joined,
+            so the ownership and the existing review cost no other query.
+        """
+        return get_object_or_404(
+            Service.objects.select_related('user_client', 'service_origin'),
+            pk=self.kwargs['service']
+        )
 
     def get_queryset(self):
         """ Return service review data. """
@@ -59,7 +74,7 @@ class ReviewViewSet(
         """ Validate if the user in the request is owner of the service.
             else, denied the permission.
         """
-        permissions = [IsAuthenticated, IsUserClient, IsServiceOwner]
+        permissions = [IsAuthenticated, IsServiceOwner]
         return [p() for p in permissions]
 
     def get_serializer_context(self, *args, **kwargs):
@@ -81,4 +96,45 @@ class ReviewViewSet(
         ]
     )
     def create(self, request, *args, **kwargs):
-        return super(ReviewViewSet, self).create(request, *args, **kwargs)
\ No newline at end of file
+        return super(ReviewViewSet, self).create(request, *args, **kwargs)
+
+
+class BabysitterReviewViewSet(viewsets.GenericViewSet):
+    """ Reviews of a babysitter, newest first. """
+
+    serializer_class = BabysitterReviewSerializer
+    pagination_class = ReviewKeysetPagination
+    permission_classes = [IsAuthenticated]
+
+    def get_rating(self):
+        """ Return the babysitter's id and rating summary, read from its
+            running counters in one query instead of grouping the reviews.
+        """
+        row = Babysitter.objects.filter(user_bbs__username=self.kwargs['username']).values_list(
+            'pk', 'user_bbs__reputation', 'rating_count', *HISTOGRAM_FIELDS
+        ).first()
+        if row is None:
+            raise NotFound('Babysitter not found')
+        pk, reputation, rating_count, *histogram = row
+        return pk, OrderedDict([
+            ('reputation', str(reputation)),
+            ('count', rating_count),
+            ('histogram', {str(stars): total for stars, total in enumerate(histogram, 1)})
+        ])
+
+    @swagger_auto_schema(
+        manual_parameters=[is_authenticated_permission]
+    )
+    def list(self, request, *args, **kwargs):
+        """ Page through the reviews of the babysitter with ?cursor=, the
+            rating summary and the 1 to 5 stars histogram come first.
+        """
+        pk, rating = self.get_rating()
+        values_serializer = BabysitterReviewValuesSerializer(context=self.get_serializer_context())
+        queryset = Review.objects.filter(service_origin__user_bbs=pk).values(
+            *values_serializer.get_columns()
+        )
+        page = self.paginate_queryset(queryset)
+        response = self.get_paginated_response(values_serializer.serialize(page))
+        response.data = OrderedDict([('rating', rating), *response.data.items()])
+        return response
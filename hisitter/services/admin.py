@@ -9,6 +9,6 @@ from hisitter.services.models import Service
 @admin.register(Service)
 class ServiceAdmin(admin.ModelAdmin):
     """ Service Admin. """
-    list_display = ('user_client', 'user_bbs', 'date')
+    list_display = ('user_client', 'user_bbs', 'date', 'status')
     search_fields = ('date', 'user_client__username', 'user_bbs__pk')
-    list_filter = ('created_at', 'updated_at', 'deleted_at', 'is_active')
+    list_filter = ('created_at', 'updated_at', 'deleted_at', 'is_active', 'status')
@@ -8,3 +8,7 @@ class ServicesAppsConfig(AppConfig):
     """Services app configutarion."""
     name = 'hisitter.services'
     verbose_name = _('Services')
+
+    def ready(self):
+        """ Connect the services signals. """
+        from hisitter.services import signals  # noqa: F401
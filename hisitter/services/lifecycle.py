@@ -0,0 +1,74 @@
+""" Service lifecycle transitions.
+
+    Each transition is a single conditional UPDATE: the row is only written
+    when it still matches the precondition of the transition, so two
+    concurrent taps can't both apply it. The loser gets a 409 instead of
+    overwriting the winner's values.
+"""
+
+# Django imports
+from django.db.models import Q
+from django.utils import timezone
+
+# Django REST Framework imports
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+# Models
+from hisitter.services.models import Service, ServiceEvent
+
+# Cache
+from hisitter.users.free_slots import invalidate_slot
+
+
+# State the row must be in for each transition to apply, and the state
+# it moves to.
+PRECONDITIONS = {
+    'start': Q(status__in=['scheduled', 'on_my_way', 'arrived'], service_start__isnull=True),
+    'on_my_way': Q(status='scheduled', on_my_way__isnull=True),
+    'arrival': Q(status='on_my_way', arrival__isnull=True),
+    'end': Q(status='in_progress', service_end__isnull=True),
+}
+TARGETS = {
+    'start': 'in_progress',
+    'on_my_way': 'on_my_way',
+    'arrival': 'arrived',
+    'end': 'finished',
+}
+
+
+class TransitionConflict(APIException):
+    """ The service changed since it was read and the transition no longer applies. """
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'The service was updated by another request, reload it and try again.'
+    default_code = 'conflict'
+
+
+def transition(service, name, actor=None, **changes):
+    """ Apply the transition `name` writing only the changed columns, and
+        append its ServiceEvent.
+
+        The UPDATE has no RETURNING in the ORM, the new values are the ones
+        written, so they are set on the instance instead of reading the row
+        again. Raise TransitionConflict when no row matched.
+    """
+    now = timezone.now()
+    changes['status'] = TARGETS[name]
+    changes['updated_at'] = now
+    updated = Service.objects.filter(
+        PRECONDITIONS[name],
+        pk=service.pk
+    ).update(**changes)
+    if not updated:
+        raise TransitionConflict()
+    ServiceEvent.objects.create(
+        service_id=service.pk,
+        status=changes['status'],
+        actor=actor,
+        occurred_at=now
+    )
+    if 'is_active' in changes:
+        invalidate_slot(service.date, service.shift)
+    for field, value in changes.items():
+        setattr(service, field, value)
+    return service
@@ -0,0 +1,151 @@
+"""Management command to compare the DRF serializers with the values serializers."""
+
+import datetime
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from hisitter.services.models import Service
+from hisitter.services.serializers import ServiceModelSerializer, ServiceValuesSerializer
+from hisitter.users.models import User, Client, Babysitter, Availability
+from hisitter.users.serializers import (
+    UserModelSerializer,
+    UserValuesSerializer,
+    BabysitterPublicSerializer,
+    BabysitterPublicValuesSerializer
+)
+
+
+class Rollback(Exception):
+    """Raised to discard the benchmark data."""
+
+
+class Command(BaseCommand):
+    help = "Measure rows/sec of the DRF serializers against the values serializers"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Rows per serializer')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per serializer, the best one is kept')
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        try:
+            with transaction.atomic():
+                self.seed(rows)
+                self.run(rows, repeat)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, rows):
+        """Create `rows` babysitters and `rows` services, rolled back at the end."""
+        users = User.objects.bulk_create(
+            User(
+                username=f'benchmark{index}',
+                email=f'benchmark{index}@hisitter.test',
+                first_name='Bench',
+                last_name=f'Mark {index}',
+                birthdate=datetime.date(1990, 1, 1),
+                address='123 Benchmark Street',
+                lat=Decimal('19.432608'),
+                long=Decimal('-99.133209'),
+                picture=f'pictures/benchmark{index}.png'
+            )
+            for index in range(rows + 1)
+        )
+        client = Client.objects.create(user_client=users[0])
+        babysitters = Babysitter.objects.bulk_create(
+            Babysitter(
+                user_bbs=user,
+                education_degree='Early Childhood Education',
+                about_me='Benchmark babysitter',
+                cost_of_service=Decimal('25.00')
+            )
+            for user in users[1:]
+        )
+        Availability.objects.bulk_create(
+            Availability(bbs=babysitter, day=day, shift='morning')
+            for babysitter in babysitters
+            for day in ('Monday', 'Wednesday', 'Friday')
+        )
+        Service.objects.bulk_create(
+            Service(
+                user_client=client,
+                user_bbs=babysitter,
+                date=datetime.date(2030, 1, 1),
+                shift='morning',
+                address='123 Benchmark Street',
+                count_children=2,
+                duration=datetime.timedelta(hours=4),
+                total_cost=Decimal('100.00')
+            )
+            for babysitter in babysitters
+        )
+
+    def run(self, rows, repeat):
+        # Pictures are rendered as absolute urls when a request is available.
+        context = {}
+        if settings.ALLOWED_HOSTS:
+            host = settings.ALLOWED_HOSTS[0].lstrip('.').replace('*', 'localhost')
+            context['request'] = APIRequestFactory().get('/', HTTP_HOST=host)
+        services = Service.objects.filter(address='123 Benchmark Street')
+        users = User.objects.filter(username__startswith='benchmark', user_bbs__isnull=False)
+        cases = [
+            (
+                'ServiceModelSerializer',
+                lambda: ServiceModelSerializer(
+                    services.select_related(
+                        'user_client__user_client', 'user_bbs__user_bbs', 'service_origin'
+                    ),
+                    many=True,
+                    context=context
+                ).data,
+                lambda: self.values(ServiceValuesSerializer(context=context), services)
+            ),
+            (
+                'UserModelSerializer',
+                lambda: UserModelSerializer(
+                    users.select_related('user_bbs').prefetch_related('user_bbs__availabilities'),
+                    many=True,
+                    context=context
+                ).data,
+                lambda: self.values(UserValuesSerializer(context=context), users)
+            ),
+            (
+                'BabysitterPublicSerializer',
+                lambda: BabysitterPublicSerializer(
+                    users.select_related('user_bbs').prefetch_related('user_bbs__availabilities'),
+                    many=True,
+                    context=context
+                ).data,
+                lambda: self.values(BabysitterPublicValuesSerializer(context=context), users)
+            ),
+        ]
+        renderer = JSONRenderer()
+        for name, drf, values in cases:
+            drf_time, drf_output = self.measure(drf, repeat)
+            values_time, values_output = self.measure(values, repeat)
+            identical = renderer.render(drf_output) == renderer.render(values_output)
+            self.stdout.write(
+                f"{name}: DRF {rows / drf_time:,.0f} rows/sec, "
+                f"values {rows / values_time:,.0f} rows/sec "
+                f"({drf_time / values_time:.1f}x), identical JSON: {identical}"
+            )
+
+    def values(self, values_serializer, queryset):
+        return values_serializer.serialize(queryset.values(*values_serializer.get_columns()))
+
+    def measure(self, serialize, repeat):
+        """Return the best time of `repeat` runs, queries included, and the output."""
+        best, output = None, None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = serialize()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, output
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.4 on 2026-10-18 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("services", "0006_add_arrival_field"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(
+                fields=["user_client", "-created_at"], name="service_client_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(
+                fields=["user_bbs", "-created_at"], name="service_bbs_created_idx"
+            ),
+        ),
+    ]
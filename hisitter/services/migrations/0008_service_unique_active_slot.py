@@ -0,0 +1,21 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("services", "0007_add_participant_indexes"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="service",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_active", True)),
+                fields=("user_bbs", "date", "shift"),
+                name="service_unique_active_slot",
+            ),
+        ),
+    ]
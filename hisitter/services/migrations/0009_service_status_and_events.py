@@ -0,0 +1,117 @@
+# Generated by Django 5.1.4 on 2026-10-18 21:40
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("services", "0008_service_unique_active_slot"),
+        ("users", "0005_backfill_availability_bits"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ServiceEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("scheduled", "scheduled"),
+                            ("on_my_way", "on my way"),
+                            ("arrived", "arrived"),
+                            ("in_progress", "in progress"),
+                            ("finished", "finished"),
+                            ("cancelled", "cancelled"),
+                        ],
+                        max_length=11,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "occurred_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="occurred at"
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["occurred_at", "id"],
+                "get_latest_by": "occurred_at",
+            },
+        ),
+        migrations.AddField(
+            model_name="service",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("scheduled", "scheduled"),
+                    ("on_my_way", "on my way"),
+                    ("arrived", "arrived"),
+                    ("in_progress", "in progress"),
+                    ("finished", "finished"),
+                    ("cancelled", "cancelled"),
+                ],
+                default="scheduled",
+                help_text="Last state reached, the history is kept in ServiceEvent.",
+                max_length=11,
+                verbose_name="Status",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(
+                condition=models.Q(
+                    ("status__in", ["scheduled", "on_my_way", "arrived", "in_progress"])
+                ),
+                fields=["status", "id"],
+                name="service_open_status_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="serviceevent",
+            name="actor",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="User that caused the event, empty for the system.",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Actor",
+            ),
+        ),
+        migrations.AddField(
+            model_name="serviceevent",
+            name="service",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="events",
+                to="services.service",
+                verbose_name="Service",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="serviceevent",
+            index=models.Index(
+                fields=["service", "occurred_at", "id"],
+                include=("status",),
+                name="service_event_timeline_idx",
+            ),
+        ),
+    ]
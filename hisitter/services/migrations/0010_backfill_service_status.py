@@ -0,0 +1,51 @@
+# Generated by Django 5.1.4 on 2026-10-18 21:42
+
+from django.db import migrations
+
+# (status, timestamp column) in the order a service goes through them.
+STEPS = [
+    ("scheduled", "created_at"),
+    ("on_my_way", "on_my_way"),
+    ("arrived", "arrival"),
+    ("in_progress", "service_start"),
+    ("finished", "service_end"),
+]
+
+
+def backfill_service_status(apps, schema_editor):
+    """ Derive the status and the events of the existing services from
+        their timestamp columns.
+    """
+    Service = apps.get_model("services", "Service")
+    ServiceEvent = apps.get_model("services", "ServiceEvent")
+    columns = [column for status, column in STEPS]
+    services, events = [], []
+    for service in Service.objects.only("pk", "is_active", "updated_at", *columns).iterator(chunk_size=2000):
+        for status, column in STEPS:
+            moment = getattr(service, column)
+            if moment is not None:
+                service.status = status
+                events.append(ServiceEvent(service_id=service.pk, status=status, occurred_at=moment))
+        if not service.is_active and service.status != "finished":
+            service.status = "cancelled"
+            events.append(ServiceEvent(
+                service_id=service.pk, status="cancelled", occurred_at=service.updated_at
+            ))
+        services.append(service)
+        if len(services) >= 2000:
+            Service.objects.bulk_update(services, ["status"])
+            ServiceEvent.objects.bulk_create(events)
+            services, events = [], []
+    Service.objects.bulk_update(services, ["status"])
+    ServiceEvent.objects.bulk_create(events)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("services", "0009_service_status_and_events"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_service_status, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.4 on 2026-10-19 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("services", "0010_backfill_service_status"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="serviceevent",
+            name="service_event_timeline_idx",
+        ),
+        migrations.AddIndex(
+            model_name="serviceevent",
+            index=models.Index(
+                fields=["service", "occurred_at", "id"],
+                include=("status", "actor"),
+                name="service_event_timeline_idx",
+            ),
+        ),
+    ]
@@ -1 +1,2 @@
-from .services import *
\ No newline at end of file
+from .services import *
+from .events import *
@@ -0,0 +1,67 @@
+""" Service events model. """
+
+# Django imports
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+# Models
+from .services import Service
+
+__all__ = ['ServiceEvent']
+
+
+class ServiceEvent(models.Model):
+    """ A state reached by a service.
+
+        Events are only appended, one per transition, and never updated,
+        so they have no updated_at or deleted_at. The current state is
+        denormalized in Service.status.
+    """
+    service = models.ForeignKey(
+        "services.Service",
+        verbose_name=_("Service"),
+        related_name='events',
+        on_delete=models.CASCADE,
+        db_index=False
+    )
+    status = models.CharField(
+        _("Status"),
+        max_length=11,
+        choices=Service.STATUSES
+    )
+    actor = models.ForeignKey(
+        "users.User",
+        verbose_name=_("Actor"),
+        related_name='+',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        help_text='User that caused the event, empty for the system.'
+    )
+    occurred_at = models.DateTimeField(
+        'occurred at',
+        default=timezone.now
+    )
+
+    class Meta:
+        """ Meta options. """
+        ordering = ['occurred_at', 'id']
+        get_latest_by = 'occurred_at'
+        indexes = [
+            # Covers the columns the timeline reads, so on PostgreSQL it
+            # is served by an index-only scan once the table is vacuumed.
+            models.Index(
+                fields=['service', 'occurred_at', 'id'],
+                include=['status', 'actor'],
+                name='service_event_timeline_idx'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None and not self._state.adding:
+            raise ValueError('Service events are append-only.')
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f'{self.service_id} {self.status} at {self.occurred_at}'
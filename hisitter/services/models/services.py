@@ -8,6 +8,42 @@ from django.core.validators import MaxValueValidator
 # Utils Abstract model
 from hisitter.utils.abstract_users import HisitterModel
 
+# States a service can still move from.
+OPEN_STATUSES = ('scheduled', 'on_my_way', 'arrived', 'in_progress')
+
+
+class ServiceQuerySet(models.QuerySet):
+    """ Service queryset with the lookups used by the services feed. """
+
+    def for_participant(self, client_id=None, babysitter_id=None):
+        """ Return the services where the client or the babysitter
+            participates.
+
+            Each side is an index seek over its (participant, -created_at)
+            index; when the user has both roles the two seeks are combined
+            with a UNION instead of an OR across the join chains.
+        """
+        if client_id and babysitter_id:
+            as_client = Service.objects.filter(user_client_id=client_id).order_by().values('pk')
+            as_babysitter = Service.objects.filter(user_bbs_id=babysitter_id).order_by().values('pk')
+            return self.filter(pk__in=as_client.union(as_babysitter))
+        if client_id:
+            return self.filter(user_client_id=client_id)
+        if babysitter_id:
+            return self.filter(user_bbs_id=babysitter_id)
+        return self.none()
+
+    def in_state(self, *states):
+        """ Return the services whose current status is one of states.
+
+            The OPEN_STATUSES are covered by the service_open_status_idx
+            partial index, which stays as small as the number of services
+            in progress however long the history grows. Finished and
+            cancelled services aren't indexed by status.
+        """
+        return self.filter(status__in=states)
+
+
 class Service(HisitterModel):
     """ This model hast the main activity in the application
         recieving the user-client, and the user-bbs, on the
@@ -121,5 +157,50 @@ class Service(HisitterModel):
         blank=True,
         null=True
     )
+    STATUSES = [
+        ('scheduled', 'scheduled'),
+        ('on_my_way', 'on my way'),
+        ('arrived', 'arrived'),
+        ('in_progress', 'in progress'),
+        ('finished', 'finished'),
+        ('cancelled', 'cancelled')
+    ]
+    OPEN_STATUSES = OPEN_STATUSES
+    status = models.CharField(
+        _("Status"),
+        max_length=11,
+        choices=STATUSES,
+        default='scheduled',
+        help_text='Last state reached, the history is kept in ServiceEvent.'
+    )
+
+    objects = ServiceQuerySet.as_manager()
+
+    class Meta(HisitterModel.Meta):
+        """ Meta options. """
+        indexes = [
+            models.Index(
+                fields=['user_client', '-created_at'],
+                name='service_client_created_idx'
+            ),
+            models.Index(
+                fields=['user_bbs', '-created_at'],
+                name='service_bbs_created_idx'
+            ),
+            models.Index(
+                fields=['status', 'id'],
+                condition=models.Q(status__in=list(OPEN_STATUSES)),
+                name='service_open_status_idx'
+            ),
+        ]
+        constraints = [
+            # A babysitter can't have two active services in the same slot.
+            models.UniqueConstraint(
+                fields=['user_bbs', 'date', 'shift'],
+                condition=models.Q(is_active=True),
+                name='service_unique_active_slot'
+            ),
+        ]
+
     def __str__(self):
         return  'id ' + str(self.id) + ', ' + str(self.user_client) + f'{str(self.user_bbs)}, {str(self.date)}'
\ No newline at end of file
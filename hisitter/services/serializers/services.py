@@ -2,31 +2,40 @@
 
 # Python
 import datetime
-import logging
 
 # Django imports
-from django.db.models import Q
+from django.db import IntegrityError, transaction
 from django.conf import settings
+from django.utils import timezone
 
 # Django Rest Framework Serializers
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
 # Serializers
-from hisitter.reviews.serializers import ReviewModelSerializer
+from hisitter.reviews.serializers import ReviewModelSerializer, ReviewValuesSerializer
 from hisitter.users.serializers import (
     BabysitterFullNameSerializer,
-    ClientFullNameSerializer
+    ClientFullNameSerializer,
+    FullNameValuesSerializer
 )
 
 # Models
-from hisitter.services.models import Service
-from hisitter.users.models import Availability
+from hisitter.services.models import Service, ServiceEvent
+
+# Cache
+from hisitter.users.free_slots import invalidate_slot
 
 # Task
+from hisitter.outbox.tasks import enqueue, enqueue_many
 from hisitter.services.tasks import create_a_service_email
 
+# Sparse fieldsets
+from hisitter.utils.sparse_fields import SparseFieldsetSerializerMixin
+from hisitter.utils.values_serializers import ValuesSerializer
+
 
-class ServiceModelSerializer(serializers.ModelSerializer):
+class ServiceModelSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """ Service Model Serializer. """
     service_origin = ReviewModelSerializer(read_only=True)
     user_bbs = BabysitterFullNameSerializer(read_only=True)
@@ -53,6 +62,7 @@ class ServiceModelSerializer(serializers.ModelSerializer):
             'service_start',
             'service_end',
             'total_cost',
+            'status',
             'service_origin'
         ]
         read_only_fields = (
@@ -62,10 +72,28 @@ class ServiceModelSerializer(serializers.ModelSerializer):
             'arrival',
             'service_start',
             'service_end',
-            'total_cost'
+            'total_cost',
+            'status'
         )
 
 
+class ServiceValuesSerializer(ValuesSerializer):
+    """ ServiceModelSerializer built from .values() rows. """
+    serializer_class = ServiceModelSerializer
+    nested = {
+        'user_client': (FullNameValuesSerializer, 'user_client__user_client'),
+        'user_bbs': (FullNameValuesSerializer, 'user_bbs__user_bbs'),
+        'service_origin': (ReviewValuesSerializer, 'service_origin'),
+    }
+
+
+class ServiceEventSerializer(serializers.Serializer):
+    """ Event of the timeline of a service, read from .values() rows. """
+    status = serializers.CharField()
+    occurred_at = serializers.DateTimeField()
+    actor = serializers.IntegerField(source='actor_id', allow_null=True)
+
+
 class CreateServiceSerializer(serializers.ModelSerializer):
     """ Create Service Serializer. """
     date = serializers.DateField()
@@ -92,26 +120,15 @@ class CreateServiceSerializer(serializers.ModelSerializer):
             'user_bbs',
             'user_client'
         )
+        # The slot is checked by the database on insert, see create().
+        validators = []
 
     def validate(self, data):
-        """ Validate if the date it's a day in the availability registers
+        """ Validate if the date and shift are in the availability
             of the Babysitter.
         """
-        availabilities = Availability.objects.filter(bbs=data['user_bbs'])
-        date = data['date']
-        weekday = date.strftime("%A")
-        shift = data['shift']
-        possible = False
-        for availability in availabilities:
-            if availability.day == weekday and shift == availability.shift:
-                logging.info('This date and shift is available')
-                possible = True
-        if possible == False:
+        if not data['user_bbs'].is_available(data['date'], data['shift']):
             raise serializers.ValidationError("This date and shift it's impossible.")
-        services = Service.objects.filter(Q(user_bbs=data['user_bbs']) & Q(is_active=True))
-        for service in services:
-            if service.date == date and service.shift == shift:
-                raise serializers.ValidationError('This datetime is schedule by other client')       
         return data
 
     def create(self, data):
@@ -127,7 +144,18 @@ class CreateServiceSerializer(serializers.ModelSerializer):
         bbs_email = bbs.email
         date = data['date'].strftime("%Y-%m-%w")
         shift = data['shift']
-        create_a_service_email(
+        # The slot is reserved by the service_unique_active_slot constraint,
+        # the savepoint keeps the request transaction usable if it's taken.
+        try:
+            with transaction.atomic():
+                service = Service.objects.create(**data, is_active=True)
+        except IntegrityError:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: ['This datetime is schedule by other client']
+            })
+        ServiceEvent.objects.create(service=service, status=service.status, actor=client)
+        enqueue(
+            create_a_service_email,
             client_username=client_username,
             bbs_username=bbs_username,
             client_email=client_email,
@@ -135,10 +163,120 @@ class CreateServiceSerializer(serializers.ModelSerializer):
             date=date,
             shift=shift
         )
-        service = Service.objects.create(**data, is_active=True)
         return service
 
 
+class RecurringServiceSerializer(serializers.Serializer):
+    """ Book the same weekday and shift with a babysitter for several weeks.
+
+        The occurrences are checked against the babysitter's availability
+        and active services with one query, the free ones are inserted
+        together and the result of each occurrence is returned.
+    """
+    UNAVAILABLE = "This date and shift it's impossible."
+    TAKEN = 'This datetime is schedule by other client'
+
+    start_date = serializers.DateField(help_text='Date of the first occurrence.')
+    weeks = serializers.IntegerField(min_value=1, max_value=52)
+    shift = serializers.ChoiceField(choices=Service.SHIFTS)
+    start_time = serializers.TimeField(help_text='Scheduled start time of each occurrence.')
+    count_children = serializers.IntegerField(max_value=10, min_value=1)
+    special_cares = serializers.CharField(allow_blank=True, required=False)
+
+    def validate(self, data):
+        """ Build the occurrences, the babysitter comes in the context. """
+        babysitter = self.context['babysitter']
+        dates = [
+            data['start_date'] + datetime.timedelta(weeks=week)
+            for week in range(data['weeks'])
+        ]
+        if not babysitter.is_available(data['start_date'], data['shift']):
+            taken = set(dates)
+            reason = self.UNAVAILABLE
+        else:
+            taken = set(Service.objects.filter(
+                user_bbs=babysitter,
+                shift=data['shift'],
+                is_active=True,
+                date__in=dates
+            ).values_list('date', flat=True))
+            reason = self.TAKEN
+        data['occurrences'] = [
+            (date, reason if date in taken else None) for date in dates
+        ]
+        return data
+
+    def create(self, data):
+        """ Insert the free occurrences and return the result of each one.
+
+            A slot booked by someone else after the check is skipped by the
+            insert and reported as taken.
+        """
+        client = self.context['client']
+        babysitter = self.context['babysitter']
+        user_client, user_bbs = client.user_client, babysitter.user_bbs
+        free = [date for date, reason in data['occurrences'] if reason is None]
+        current_timezone = timezone.get_current_timezone()
+        Service.objects.bulk_create(
+            [
+                Service(
+                    user_client=client,
+                    user_bbs=babysitter,
+                    date=date,
+                    shift=data['shift'],
+                    scheduled_start=timezone.make_aware(
+                        datetime.datetime.combine(date, data['start_time']),
+                        current_timezone
+                    ),
+                    count_children=data['count_children'],
+                    special_cares=data.get('special_cares', ''),
+                    address=user_client.address,
+                    lat=user_client.lat,
+                    long=user_client.long,
+                    is_active=True
+                )
+                for date in free
+            ],
+            ignore_conflicts=True
+        )
+        # ignore_conflicts doesn't return the primary keys.
+        booked = dict(Service.objects.filter(
+            user_client=client,
+            user_bbs=babysitter,
+            shift=data['shift'],
+            is_active=True,
+            date__in=free
+        ).values_list('date', 'pk'))
+        ServiceEvent.objects.bulk_create(
+            ServiceEvent(service_id=pk, status='scheduled', actor=user_client)
+            for pk in booked.values()
+        )
+        for date in booked:
+            invalidate_slot(date, data['shift'])
+        enqueue_many(create_a_service_email, [
+            {
+                'client_username': user_client.username,
+                'bbs_username': user_bbs.username,
+                'client_email': user_client.email,
+                'bbs_email': user_bbs.email,
+                'date': date.strftime("%Y-%m-%w"),
+                'shift': data['shift']
+            }
+            for date in free if date in booked
+        ])
+        results = []
+        for date, reason in data['occurrences']:
+            if reason is None and date not in booked:
+                reason = self.TAKEN
+            result = {'date': date.isoformat(), 'accepted': reason is None}
+            if reason is None:
+                result['service'] = booked[date]
+            else:
+                result['reason'] = reason
+            results.append(result)
+        return results
+
+
 class StartServiceSerializer(serializers.ModelSerializer):
     """ Start the service with the time of server. """
     service_start = serializers.DateTimeField()
@@ -0,0 +1,32 @@
+""" Services signals. """
+
+# Django imports
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+# Models
+from hisitter.services.models import Service
+
+# Cache
+from hisitter.users.free_slots import invalidate_slot
+
+
+@receiver(pre_save, sender=Service)
+def invalidate_previous_slot(sender, instance, **kwargs):
+    """ A service moved to another date or shift frees its old slot. """
+    if instance._state.adding or instance.pk is None:
+        return
+    previous = Service.objects.filter(pk=instance.pk).values_list('date', 'shift').first()
+    if previous is not None and previous != (instance.date, instance.shift):
+        invalidate_slot(*previous)
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def invalidate_service_slot(sender, instance, **kwargs):
+    """ Saving or deleting a service can take or free its slot.
+
+        bulk_create() and queryset updates don't send signals, callers
+        using them invalidate with hisitter.users.free_slots.
+    """
+    invalidate_slot(instance.date, instance.shift)
@@ -0,0 +1,28 @@
+import datetime
+
+from factory import Faker, Sequence, SubFactory
+from factory.django import DjangoModelFactory
+
+from hisitter.services.models import Service
+from hisitter.users.tests.factories import BabysitterFactory, ClientFactory
+
+
+class ServiceFactory(DjangoModelFactory):
+
+    user_client = SubFactory(ClientFactory)
+    user_bbs = SubFactory(BabysitterFactory)
+    # One day per service, so active services never share a slot.
+    date = Sequence(lambda n: datetime.date.today() + datetime.timedelta(days=n + 1))
+    shift = "morning"
+    address = Faker("address")
+    count_children = 1
+    is_active = True
+    scheduled_start = Faker(
+        "date_time_between",
+        start_date="+1d",
+        end_date="+60d",
+        tzinfo=datetime.timezone.utc
+    )
+
+    class Meta:
+        model = Service
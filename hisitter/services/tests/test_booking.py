@@ -0,0 +1,107 @@
+import datetime
+import threading
+
+import pytest
+from django.db import connection, transaction
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from hisitter.services.models import Service
+from hisitter.services.serializers import CreateServiceSerializer
+from hisitter.users.models import Availability
+from hisitter.users.tests.factories import BabysitterFactory, ClientFactory
+
+SLOT_DATE = datetime.date.today() + datetime.timedelta(days=7)
+
+
+def booking_data(client, babysitter):
+    return {
+        "date": SLOT_DATE.isoformat(),
+        "shift": "morning",
+        "scheduled_start": f"{SLOT_DATE.isoformat()}T08:00:00Z",
+        "count_children": 1,
+        "special_cares": "",
+        "user_client": client.pk,
+        "user_bbs": babysitter.pk,
+    }
+
+
+@pytest.fixture
+def babysitter():
+    babysitter = BabysitterFactory()
+    Availability.objects.create(bbs=babysitter, day=SLOT_DATE.strftime("%A"), shift="morning")
+    return babysitter
+
+
+@pytest.mark.django_db
+def test_booking_a_taken_slot_is_rejected(babysitter):
+    first, second = ClientFactory(), ClientFactory()
+    api_client = APIClient()
+    url = reverse(
+        "services:services-creation-create-service",
+        kwargs={"babysitter": babysitter.user_bbs.username}
+    )
+
+    api_client.force_authenticate(first.user_client)
+    assert api_client.post(url, booking_data(first, babysitter), format="json").status_code == 201
+    api_client.force_authenticate(second.user_client)
+    response = api_client.post(url, booking_data(second, babysitter), format="json")
+
+    assert response.status_code == 400
+    assert response.data == {"non_field_errors": ["This datetime is schedule by other client"]}
+    assert Service.objects.filter(user_bbs=babysitter).count() == 1
+
+
+@pytest.mark.django_db
+def test_a_cancelled_service_frees_the_slot(babysitter):
+    client = ClientFactory()
+    serializer = CreateServiceSerializer(data=booking_data(client, babysitter), partial=True)
+    serializer.is_valid(raise_exception=True)
+    Service.objects.filter(pk=serializer.save().pk).update(is_active=False)
+
+    serializer = CreateServiceSerializer(data=booking_data(client, babysitter), partial=True)
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+
+    assert Service.objects.filter(user_bbs=babysitter, is_active=True).count() == 1
+
+
+@pytest.mark.skipif(
+    connection.vendor == "sqlite",
+    reason="SQLite locks the whole table instead of checking the index concurrently",
+)
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_bookings_have_exactly_one_winner(babysitter):
+    clients = ClientFactory.create_batch(8)
+    barrier = threading.Barrier(len(clients))
+    results = []
+
+    def book(client):
+        try:
+            serializer = CreateServiceSerializer(
+                data=booking_data(client, babysitter), partial=True
+            )
+            serializer.is_valid(raise_exception=True)
+            barrier.wait()
+            with transaction.atomic():
+                serializer.save()
+            results.append("booked")
+        except serializers.ValidationError as error:
+            results.append(error.detail["non_field_errors"])
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=book, args=(client,)) for client in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == len(clients)
+    assert results.count("booked") == 1
+    assert all(
+        result == ["This datetime is schedule by other client"]
+        for result in results if result != "booked"
+    )
+    assert Service.objects.filter(user_bbs=babysitter, is_active=True).count() == 1
@@ -0,0 +1,73 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from hisitter.reviews.models import Review
+from hisitter.services.lifecycle import transition
+from hisitter.services.tests.factories import ServiceFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def revalidate(api_client, url, response, **params):
+    return api_client.get(url, params, HTTP_IF_NONE_MATCH=response["ETag"])
+
+
+def test_retrieve_answers_304_until_the_service_changes(api_client, client_user):
+    service = ServiceFactory(user_client=client_user)
+    url = reverse("services:services-detail", kwargs={"pk": service.pk})
+    response = api_client.get(url)
+    assert response.status_code == 200
+    assert response["ETag"].startswith('W/"')
+    assert response["Last-Modified"]
+
+    not_modified = revalidate(api_client, url, response)
+    assert not_modified.status_code == 304
+    assert not_modified["ETag"] == response["ETag"]
+
+    Review.objects.create(service_origin=service, reputation=5)
+    assert revalidate(api_client, url, response).status_code == 200
+
+
+def test_list_answers_304_until_a_service_changes(api_client, client_user):
+    service = ServiceFactory(user_client=client_user)
+    url = reverse("services:services-list")
+    response = api_client.get(url, {"limit": 10})
+    assert revalidate(api_client, url, response, limit=10).status_code == 304
+    # Another page or fieldset is another representation.
+    assert revalidate(api_client, url, response, limit=5).status_code == 200
+
+    transition(service, "on_my_way", on_my_way=timezone.now())
+    assert revalidate(api_client, url, response, limit=10).status_code == 200
+
+
+def test_list_changes_when_a_service_or_review_is_deleted(api_client, client_user):
+    deleted, kept = ServiceFactory.create_batch(2, user_client=client_user)
+    Review.objects.create(service_origin=deleted, reputation=4)
+    Review.objects.create(service_origin=kept, reputation=5)
+    url = reverse("services:services-list")
+    response = api_client.get(url)
+
+    # The latest rows are kept, only the counts move.
+    Review.objects.filter(service_origin=deleted).delete()
+    assert revalidate(api_client, url, response).status_code == 200
+
+    response = api_client.get(url)
+    deleted.delete()
+    assert revalidate(api_client, url, response).status_code == 200
+
+
+def test_cursor_pages_are_versioned_by_their_rows(api_client, client_user):
+    services = ServiceFactory.create_batch(3, user_client=client_user)
+    url = reverse("services:services-list")
+    params = {"pagination": "cursor", "limit": 2}
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(url, params)
+    assert not any("COUNT(" in query["sql"] for query in context.captured_queries)
+    assert revalidate(api_client, url, response, **params).status_code == 304
+
+    # The oldest service is on the next page, deleting it drops the link.
+    services[0].delete()
+    assert revalidate(api_client, url, response, **params).status_code == 200
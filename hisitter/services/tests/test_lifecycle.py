@@ -0,0 +1,143 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from hisitter.services.lifecycle import TransitionConflict, transition
+from hisitter.services.models import Service
+from hisitter.services.models.services import ServiceQuerySet
+from hisitter.services.tests.factories import ServiceFactory
+from hisitter.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def service():
+    return ServiceFactory(
+        date=timezone.localdate(),
+        scheduled_start=timezone.now() + datetime.timedelta(minutes=30)
+    )
+
+
+def babysitter_client(service):
+    api_client = APIClient()
+    api_client.force_authenticate(User.objects.get(pk=service.user_bbs.user_bbs_id))
+    return api_client
+
+
+def test_transition_writes_only_the_changed_columns(service):
+    moment = timezone.now()
+
+    with CaptureQueriesContext(connection) as context:
+        transition(service, "on_my_way", on_my_way=moment)
+
+    update, event = context.captured_queries
+    assert update["sql"].startswith("UPDATE")
+    assert event["sql"].startswith("INSERT")
+    assert "on_my_way" in update["sql"] and "address" not in update["sql"]
+    assert service.on_my_way == moment
+    service.refresh_from_db()
+    assert service.on_my_way == moment
+
+
+def test_a_stale_transition_is_a_conflict(service):
+    stale = Service.objects.get(pk=service.pk)
+    transition(service, "on_my_way", on_my_way=timezone.now())
+
+    with pytest.raises(TransitionConflict):
+        transition(stale, "on_my_way", on_my_way=timezone.now())
+
+
+def test_lost_race_returns_409(service, monkeypatch):
+    api_client = babysitter_client(service)
+    url = reverse("services:services-on-my-way", kwargs={"pk": service.pk})
+    original_get = ServiceQuerySet.get
+
+    def get_then_lose_the_race(queryset, *args, **kwargs):
+        instance = original_get(queryset, *args, **kwargs)
+        Service.objects.filter(pk=instance.pk).update(on_my_way=timezone.now())
+        return instance
+
+    monkeypatch.setattr(ServiceQuerySet, "get", get_then_lose_the_race)
+    response = api_client.patch(url)
+
+    assert response.status_code == 409
+
+
+def test_lifecycle_through_the_api(service):
+    babysitter = babysitter_client(service)
+    client = APIClient()
+    client.force_authenticate(User.objects.get(pk=service.user_client.user_client_id))
+
+    def patch(api_client, name):
+        return api_client.patch(reverse(f"services:services-{name}", kwargs={"pk": service.pk}))
+
+    assert patch(babysitter, "on-my-way").status_code == 200
+    assert patch(babysitter, "arrival").status_code == 200
+    assert patch(client, "start").status_code == 200
+    assert patch(client, "start").status_code == 409
+    Service.objects.filter(pk=service.pk).update(
+        service_start=timezone.now() - datetime.timedelta(hours=2)
+    )
+    response = patch(client, "end")
+
+    assert response.status_code == 200
+    assert response.data["is_active"] is False
+    assert patch(client, "end").status_code == 400
+
+
+def test_timeline_and_status_filter(service):
+    babysitter = babysitter_client(service)
+    other = ServiceFactory(user_bbs=service.user_bbs)
+    babysitter.patch(reverse("services:services-on-my-way", kwargs={"pk": service.pk}))
+    babysitter.patch(reverse("services:services-arrival", kwargs={"pk": service.pk}))
+
+    response = babysitter.get(reverse("services:services-timeline", kwargs={"pk": service.pk}))
+
+    assert response.status_code == 200
+    assert [event["status"] for event in response.data] == ["on_my_way", "arrived"]
+    assert response.data[0]["actor"] == service.user_bbs.user_bbs_id
+    response = babysitter.get(reverse("services:services-list"), {"status": "arrived"})
+    assert [row["id"] for row in response.data["results"]] == [service.pk]
+    assert response.data["results"][0]["status"] == "arrived"
+    response = babysitter.get(reverse("services:services-list"), {"status": "scheduled,arrived"})
+    assert {row["id"] for row in response.data["results"]} == {service.pk, other.pk}
+    assert babysitter.get(reverse("services:services-list"), {"status": "lost"}).status_code == 400
+
+
+def test_timeline_is_private_to_the_participants(service):
+    outsider = APIClient()
+    outsider.force_authenticate(ServiceFactory().user_client.user_client)
+
+    response = outsider.get(reverse("services:services-timeline", kwargs={"pk": service.pk}))
+
+    assert response.status_code == 404
+
+
+def test_the_babysitter_can_start_and_end(service):
+    babysitter = babysitter_client(service)
+    url = reverse("services:services-start", kwargs={"pk": service.pk})
+    assert babysitter.patch(url).status_code == 200
+
+    Service.objects.filter(pk=service.pk).update(
+        service_start=timezone.now() - datetime.timedelta(hours=2)
+    )
+    url = reverse("services:services-end", kwargs={"pk": service.pk})
+    response = babysitter.patch(url)
+    assert response.status_code == 200
+    # Billed at the babysitter's rate, the request can't choose the amount.
+    assert Service.objects.get(pk=service.pk).total_cost == Decimal("50.00")
+
+
+def test_outsiders_cannot_end(service):
+    Service.objects.filter(pk=service.pk).update(service_start=timezone.now())
+    outsider = APIClient()
+    outsider.force_authenticate(ServiceFactory().user_client.user_client)
+    url = reverse("services:services-end", kwargs={"pk": service.pk})
+    assert outsider.patch(url).status_code == 401
@@ -0,0 +1,50 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from hisitter.services.tests.factories import ServiceFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_services_cursor_pagination_walks_every_service_once(api_client, client_user):
+    services = ServiceFactory.create_batch(12, user_client=client_user)
+    url = reverse("services:services-list") + "?pagination=cursor&limit=5"
+    seen = []
+    pages = 0
+    while url:
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(url)
+        assert response.status_code == 200
+        assert "count" not in response.data
+        assert not any("COUNT(" in query["sql"] for query in context.captured_queries)
+        seen += [row["id"] for row in response.data["results"]]
+        url = response.data["next"]
+        pages += 1
+    expected = sorted(services, key=lambda service: (service.created_at, service.pk), reverse=True)
+    assert seen == [service.pk for service in expected]
+    assert pages == 3
+
+
+def test_services_cursor_pagination_previous_link(api_client, client_user):
+    ServiceFactory.create_batch(7, user_client=client_user)
+    url = reverse("services:services-list") + "?pagination=cursor&limit=3"
+    first = api_client.get(url).data
+    assert first["previous"] is None
+    second = api_client.get(first["next"]).data
+    back = api_client.get(second["previous"]).data
+    assert [row["id"] for row in back["results"]] == [row["id"] for row in first["results"]]
+
+
+def test_services_invalid_cursor(api_client):
+    url = reverse("services:services-list")
+    response = api_client.get(url, {"pagination": "cursor", "cursor": "not-a-cursor"})
+    assert response.status_code == 404
+
+
+def test_services_offset_pagination_is_the_default(api_client, client_user):
+    ServiceFactory.create_batch(6, user_client=client_user)
+    response = api_client.get(reverse("services:services-list"))
+    assert response.data["count"] == 6
+    assert len(response.data["results"]) == 5
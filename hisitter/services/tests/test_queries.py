@@ -0,0 +1,109 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from hisitter.reviews.models import Review
+from hisitter.services.models import Service
+from hisitter.services.tests.factories import ServiceFactory
+from hisitter.users.models import User
+from hisitter.users.tests.factories import BabysitterFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def create_services(client, count):
+    """Create `count` services for `client`, spread over a few babysitters,
+    half of them finished and reviewed."""
+    babysitters = BabysitterFactory.create_batch(3)
+    services = Service.objects.bulk_create(
+        ServiceFactory.build(
+            user_client=client,
+            user_bbs=babysitters[i % len(babysitters)],
+            is_active=bool(i % 2),
+        )
+        for i in range(count)
+    )
+    Review.objects.bulk_create(
+        Review(service_origin=service, reputation=4, review="Good")
+        for service in services if not service.is_active
+    )
+    return services
+
+
+def count_queries(api_client, url, **params):
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(url, params)
+    assert response.status_code == 200
+    return response, len(context.captured_queries)
+
+
+@pytest.mark.parametrize("count", [5, 50, 500])
+def test_services_list_runs_constant_queries(api_client, client_user, count):
+    create_services(client_user, count)
+    baseline, baseline_queries = count_queries(
+        api_client, reverse("services:services-list"), limit=1
+    )
+    response, queries = count_queries(
+        api_client, reverse("services:services-list"), limit=count
+    )
+    assert len(response.data["results"]) == count
+    # Savepoint, participant ids, versions, COUNT(*), page SELECT, release.
+    assert baseline_queries == queries == 6
+
+
+@pytest.mark.parametrize("count", [5, 50, 500])
+def test_services_retrieve_runs_constant_queries(api_client, client_user, count):
+    services = create_services(client_user, count)
+    query_counts = set()
+    for service in (services[0], services[-1]):
+        response, queries = count_queries(
+            api_client, reverse("services:services-detail", kwargs={"pk": service.pk})
+        )
+        assert response.data["id"] == service.pk
+        query_counts.add(queries)
+    # Savepoint, participant ids, versions, joined SELECT, release.
+    assert query_counts == {5}
+
+
+def test_service_transition_reserializes_without_extra_queries(client_user):
+    service = create_services(client_user, 1)[0]
+    babysitter = User.objects.get(pk=service.user_bbs.user_bbs_id)
+    Service.objects.filter(pk=service.pk).update(
+        is_active=True, scheduled_start=timezone.now()
+    )
+    api_client = APIClient()
+    api_client.force_authenticate(babysitter)
+    url = reverse("services:services-on-my-way", kwargs={"pk": service.pk})
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.patch(url)
+    assert response.status_code == 200
+    assert response.data["user_bbs"]["username"] == babysitter.username
+    # Savepoint, babysitter lookup, joined SELECT, UPDATE, event INSERT, release.
+    assert len(context.captured_queries) == 6
+
+
+def test_services_list_nested_data(api_client, client_user):
+    services = create_services(client_user, 2)
+    response = api_client.get(reverse("services:services-list"))
+    data = {row["id"]: row for row in response.data["results"]}
+    finished, active = services
+    assert data[finished.pk]["service_origin"]["reputation"] == 4
+    assert data[active.pk]["service_origin"] is None
+    assert data[active.pk]["user_client"]["username"] == client_user.user_client.username
+    assert data[active.pk]["user_bbs"]["username"] == active.user_bbs.user_bbs.username
+
+
+def test_services_list_covers_both_participant_roles(client_user):
+    user = client_user.user_client
+    as_client = create_services(client_user, 2)
+    babysitter = BabysitterFactory(user_bbs=user)
+    as_babysitter = ServiceFactory(user_bbs=babysitter)
+    ServiceFactory()
+    api_client = APIClient()
+    api_client.force_authenticate(user)
+    response = api_client.get(reverse("services:services-list"), {"limit": 10})
+    ids = {row["id"] for row in response.data["results"]}
+    assert ids == {service.pk for service in as_client} | {as_babysitter.pk}
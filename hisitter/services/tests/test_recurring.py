@@ -0,0 +1,86 @@
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from hisitter.outbox.models import OutboxMessage
+from hisitter.services.models import Service, ServiceEvent
+from hisitter.services.tests.factories import ServiceFactory
+from hisitter.users.models import Availability
+from hisitter.users.tests.factories import BabysitterFactory
+
+pytestmark = pytest.mark.django_db
+
+TODAY = datetime.date.today()
+# Next Tuesday.
+START = TODAY + datetime.timedelta(days=(1 - TODAY.weekday()) % 7 or 7)
+
+
+@pytest.fixture
+def babysitter():
+    babysitter = BabysitterFactory()
+    Availability.objects.create(bbs=babysitter, day="Tuesday", shift="afternoon")
+    return babysitter
+
+
+def book(api_client, babysitter, weeks, shift="afternoon"):
+    url = reverse(
+        "services:services-creation-create-recurring",
+        kwargs={"babysitter": babysitter.user_bbs.username}
+    )
+    return api_client.post(url, {
+        "start_date": START.isoformat(),
+        "weeks": weeks,
+        "shift": shift,
+        "start_time": "14:00",
+        "count_children": 2,
+    }, format="json")
+
+
+def test_recurring_booking_reports_each_occurrence(api_client, client_user, babysitter):
+    taken = ServiceFactory(
+        user_bbs=babysitter, date=START + datetime.timedelta(weeks=2), shift="afternoon"
+    )
+
+    response = book(api_client, babysitter, weeks=4)
+
+    assert response.status_code == 201
+    assert [result["accepted"] for result in response.data] == [True, True, False, True]
+    assert response.data[2] == {
+        "date": taken.date.isoformat(),
+        "accepted": False,
+        "reason": "This datetime is schedule by other client",
+    }
+    services = Service.objects.filter(user_client=client_user).order_by("date")
+    assert [service.pk for service in services] == [
+        result["service"] for result in response.data if result["accepted"]
+    ]
+    assert {service.date.weekday() for service in services} == {1}
+    assert services[0].address == client_user.user_client.address
+    assert OutboxMessage.objects.filter(task="create_a_service_mail").count() == 3
+    assert ServiceEvent.objects.filter(service__in=services, status="scheduled").count() == 3
+
+
+def test_recurring_booking_outside_availability_is_a_conflict(api_client, babysitter):
+    response = book(api_client, babysitter, weeks=3, shift="morning")
+
+    assert response.status_code == 409
+    assert {result["reason"] for result in response.data} == {
+        "This date and shift it's impossible."
+    }
+    assert not Service.objects.exists()
+
+
+def test_recurring_booking_runs_constant_queries(api_client, babysitter):
+    other = BabysitterFactory()
+    Availability.objects.create(bbs=other, day="Tuesday", shift="afternoon")
+
+    with CaptureQueriesContext(connection) as one_week:
+        assert book(api_client, babysitter, weeks=1).status_code == 201
+    with CaptureQueriesContext(connection) as twelve_weeks:
+        assert book(api_client, other, weeks=12).status_code == 201
+
+    assert len(twelve_weeks.captured_queries) == len(one_week.captured_queries)
+    assert Service.objects.filter(user_bbs=other).count() == 12
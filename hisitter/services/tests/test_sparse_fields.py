@@ -0,0 +1,71 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from hisitter.services.tests.factories import ServiceFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def get_with_queries(api_client, url, **params):
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(url, params)
+    assert response.status_code == 200
+    page_query = [
+        query["sql"] for query in context.captured_queries
+        if query["sql"].startswith('SELECT "services_service"."id"')
+    ]
+    return response, page_query[-1]
+
+
+def test_services_fields_narrow_output_and_sql(api_client, client_user):
+    ServiceFactory.create_batch(2, user_client=client_user)
+    response, sql = get_with_queries(
+        api_client, reverse("services:services-list"), fields="id,date,shift"
+    )
+    assert [set(row) for row in response.data["results"]] == [{"id", "date", "shift"}] * 2
+    assert "JOIN" not in sql
+    assert '"services_service"."special_cares"' not in sql
+
+
+def test_services_fields_join_only_requested_relations(api_client, client_user):
+    ServiceFactory(user_client=client_user)
+    response, sql = get_with_queries(
+        api_client, reverse("services:services-list"), fields="id,user_bbs"
+    )
+    row = response.data["results"][0]
+    assert set(row) == {"id", "user_bbs"}
+    assert row["user_bbs"]["username"]
+    assert '"users_babysitter"' in sql
+    assert '"users_client"' not in sql
+    assert '"reviews_review"' not in sql
+    assert '"users_user"."password"' not in sql
+
+
+def test_services_omit(api_client, client_user):
+    service = ServiceFactory(user_client=client_user)
+    response, sql = get_with_queries(
+        api_client,
+        reverse("services:services-detail", kwargs={"pk": service.pk}),
+        omit="user_client,user_bbs,service_origin"
+    )
+    assert "user_client" not in response.data
+    assert response.data["id"] == service.pk
+    assert "JOIN" not in sql
+
+
+def test_services_unknown_field(api_client):
+    response = api_client.get(reverse("services:services-list"), {"fields": "id,password"})
+    assert response.status_code == 400
+
+
+def test_services_fields_with_cursor_pagination(api_client, client_user):
+    ServiceFactory.create_batch(4, user_client=client_user)
+    url = reverse("services:services-list")
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(url, {"fields": "id", "pagination": "cursor", "limit": 2})
+    assert response.data["next"]
+    # Savepoint, participant ids, versions, page SELECT, release: the cursor
+    # columns are loaded with the page instead of one deferred query per row.
+    assert len(context.captured_queries) == 5
@@ -0,0 +1,47 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from hisitter.reviews.models import Review
+from hisitter.services.models import Service
+from hisitter.services.serializers import ServiceModelSerializer, ServiceValuesSerializer
+from hisitter.services.tests.factories import ServiceFactory
+from hisitter.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.mark.parametrize("fields", [None, ["id", "date", "user_bbs"]])
+def test_service_values_serializer_renders_the_same_json(fields):
+    started = timezone.now() - datetime.timedelta(hours=3)
+    finished = ServiceFactory(
+        is_active=False,
+        lat=Decimal("19.432608"),
+        long=Decimal("-99.133209"),
+        service_start=started,
+        service_end=started + datetime.timedelta(hours=2, minutes=5),
+        duration=datetime.timedelta(hours=2, minutes=5),
+        total_cost=Decimal("50.00"),
+        special_cares=None
+    )
+    Review.objects.create(service_origin=finished, reputation=5, review="Great")
+    pending = ServiceFactory(user_client=finished.user_client)
+    User.objects.filter(pk=pending.user_bbs.user_bbs_id).update(picture="pictures/me.png")
+
+    request = APIRequestFactory().get("/services/")
+    context = {"request": request}
+    if fields:
+        context["fields"] = fields
+    queryset = Service.objects.filter(pk__in=[finished.pk, pending.pk]).order_by("pk")
+    expected = ServiceModelSerializer(queryset, many=True, context=context).data
+    values_serializer = ServiceValuesSerializer(context=context)
+    rows = queryset.values(*values_serializer.get_columns())
+    assert render(values_serializer.serialize(rows)) == render(expected)
@@ -3,37 +3,53 @@
 # Python
 import datetime
 from datetime import timezone
-import logging
 
 # Django imports
-from django.db.models import Q
+from django.db.models import Count, Max
 
 # Django REST Framework imports
 from rest_framework.response import Response
 from rest_framework import status, viewsets, mixins
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.generics import get_object_or_404
 
 # Serializers
 from hisitter.services.serializers import (
     ServiceModelSerializer,
+    ServiceValuesSerializer,
+    ServiceEventSerializer,
     CreateServiceSerializer,
+    RecurringServiceSerializer,
     StartServiceSerializer,
     EndServiceSerializer,
     OnMyWaySerializer,
     ArrivalSerializer
 )
 
+from hisitter.users.serializers import FULL_NAME_FIELDS
+
 # Models
 from hisitter.users.models import Babysitter, Client
-from hisitter.services.models import Service
+from hisitter.services.models import Service, ServiceEvent
 
 # Permissions
 from hisitter.services.permissions import IsUserClient
 
+# Lifecycle
+from hisitter.services.lifecycle import transition
+
 # Utils
+from hisitter.utils.conditional import build_etag, conditional_response, latest
 from hisitter.utils.functions_utils import time_cost_treatment
+from hisitter.utils.pagination import (
+    KeysetPagination,
+    KeysetPaginationMixin,
+    ServiceKeysetPagination
+)
+from hisitter.utils.sparse_fields import SparseFieldsetViewMixin
+from hisitter.utils.values_serializers import ValuesListModelMixin
 
 # Swagger
 from drf_yasg.utils import swagger_auto_schema
@@ -44,6 +60,9 @@ from hisitter.utils.swagger import (
 )
 
 class ServiceViewSet(
+    KeysetPaginationMixin,
+    SparseFieldsetViewMixin,
+    ValuesListModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
@@ -51,16 +70,130 @@ class ServiceViewSet(
 ):
     """ Service View Set.
         Handle list, retrieve, update services.
+        The list accepts ?pagination=cursor for keyset pagination, list and
+        retrieve accept ?fields= and ?omit= to return only some fields, and
+        the list accepts ?status= to return the services in some states.
     """
+    keyset_pagination_class = ServiceKeysetPagination
+    values_serializer_class = ServiceValuesSerializer
+    # updated_at of the nested rows of a service's representation.
+    nested_version_columns = {
+        'user_client': 'user_client__user_client__updated_at',
+        'user_bbs': 'user_bbs__user_bbs__updated_at',
+        'service_origin': 'service_origin__updated_at'
+    }
+
+    sparse_relations = {
+        'user_client': {
+            'select_related': ['user_client__user_client'],
+            'only': [f'user_client__user_client__{name}' for name in FULL_NAME_FIELDS]
+        },
+        'user_bbs': {
+            'select_related': ['user_bbs__user_bbs'],
+            'only': [f'user_bbs__user_bbs__{name}' for name in FULL_NAME_FIELDS]
+        },
+        'service_origin': {
+            'select_related': ['service_origin'],
+            'only': ['service_origin__reputation', 'service_origin__review']
+        },
+    }
 
     def get_queryset(self):
-        """Return services for the authenticated user."""
-        if self.action in ('list', 'retrieve'):
-            return Service.objects.filter(
-                Q(user_client__user_client__username=self.request.user.username) |
-                Q(user_bbs__user_bbs__username=self.request.user.username)
+        """Return services for the authenticated user.
+
+        The participants and the review are joined in the same query,
+        so serializing a page of services costs a fixed number of queries.
+        With ?fields= or ?omit= only the requested columns and joins are read.
+        """
+        queryset = Service.objects.all()
+        if self.action in ('list', 'retrieve', 'timeline'):
+            queryset = queryset.for_participant(
+                client_id=self.request.roles.client_id,
+                babysitter_id=self.request.roles.babysitter_id
             )
-        return Service.objects.all()
+        if self.action == 'timeline':
+            return queryset
+        if self.action == 'list':
+            states = self.get_status_filter()
+            if states:
+                queryset = queryset.in_state(*states)
+            # The list reads .values() rows, see ServiceValuesSerializer.
+            return queryset
+        return self.apply_sparse_fieldset(queryset)
+
+    def list(self, request, *args, **kwargs):
+        """ List the services, 304 when none of them changed.
+
+            Changes move the updated_at of the rows, and deleted services
+            or reviews lower the number of rows joined, so the latest
+            timestamps and the counts, read in one aggregate, identify the
+            version of the list. Keyset pages don't count, their version is
+            read from the rows of the page, see get_page_versions().
+        """
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        columns = self.get_version_columns()
+        if isinstance(self.paginator, KeysetPagination):
+            versions, timestamps = self.get_page_versions(queryset, columns)
+        else:
+            versions = queryset.aggregate(
+                **{f'version_{index}': Max(column) for index, column in enumerate(columns)},
+                **{f'count_{index}': Count(column) for index, column in enumerate(columns)}
+            )
+            timestamps = [versions[f'version_{index}'] for index in range(len(columns))]
+            versions = list(versions.values())
+        return conditional_response(
+            request,
+            build_etag(request, *versions),
+            latest(*timestamps),
+            lambda: super(ServiceViewSet, self).list(request, *args, **kwargs)
+        )
+
+    def get_page_versions(self, queryset, columns):
+        """ Return the ETag parts and the timestamps of the keyset page the
+            request asks for: the ids and updated_at columns of its rows,
+            and whether it links to other pages. Reads the page with the
+            same seek as the list, so it costs O(page).
+        """
+        paginator = self.keyset_pagination_class()
+        rows = paginator.paginate_queryset(queryset.values('id', *columns), self.request, view=self)
+        versions = [tuple(row[name] for name in ('id', *columns)) for row in rows]
+        timestamps = [row[column] for row in rows for column in columns]
+        return [*versions, paginator.has_next, paginator.has_previous], timestamps
+
+    def retrieve(self, request, *args, **kwargs):
+        """ Return a service, 304 when it didn't change. """
+        versions = self.get_queryset().filter(
+            pk=kwargs['pk']
+        ).values_list(*self.get_version_columns()).first()
+        if versions is None:
+            raise NotFound()
+        return conditional_response(
+            request,
+            build_etag(request, *versions),
+            latest(*versions),
+            lambda: super(ServiceViewSet, self).retrieve(request, *args, **kwargs)
+        )
+
+    def get_version_columns(self):
+        """ Return the updated_at columns that version the response, the
+            nested rows left out by ?fields= or ?omit= aren't joined.
+        """
+        fields = self.get_sparse_fieldset()
+        return ['updated_at', *(
+            column for name, column in self.nested_version_columns.items()
+            if fields is None or name in fields
+        )]
+
+    def get_status_filter(self):
+        """ Return the states requested with ?status=, comma separated. """
+        value = self.request.query_params.get('status')
+        if not value:
+            return []
+        states = [state.strip() for state in value.split(',') if state.strip()]
+        unknown = set(states) - {state for state, label in Service.STATUSES}
+        if unknown:
+            raise ValidationError({'status': f'Unknown status: {", ".join(sorted(unknown))}'})
+        return states
 
     def get_permissions(self):
         """ Assign permissions bassed on actions."""
@@ -89,13 +222,11 @@ class ServiceViewSet(
     @action(detail=True, methods=['patch'])
     def start(self, request, *args, **kwargs):
         """ Start the service. """
-        self.service = Service.objects.get(pk=kwargs['pk'])
+        self.service = self.get_queryset().get(pk=kwargs['pk'])
         date = datetime.datetime.now()
-        if (request.user.user_client == 
-            self.service.user_client) or (
-                request.user.user_client == self.service.user_bbs):
-            logging.info('Permiso concedido')
-        else:
+        # Either participant can start or end the service, the cost is
+        # computed here from the babysitter's rate and the server clock.
+        if not request.roles.participates_in(self.service):
             error = {"You don't have permissions to acces in this service"}
             return Response(error, status=status.HTTP_401_UNAUTHORIZED)
         serializer = StartServiceSerializer(
@@ -105,7 +236,9 @@ class ServiceViewSet(
             context={'service': self.service}
         )
         serializer.is_valid(raise_exception=True)
-        service = serializer.save()
+        service = transition(
+            self.service, 'start', actor=request.user, **serializer.validated_data
+        )
         data = ServiceModelSerializer(service).data
         return Response(data, status=status.HTTP_200_OK)
 
@@ -117,15 +250,14 @@ class ServiceViewSet(
     @action(detail=True, methods=['patch'])
     def on_my_way(self, request, *args, **kwargs):
         """ Babysitter indicates they are on the way. """
-        self.service = Service.objects.get(pk=kwargs['pk'])
+        self.service = self.get_queryset().get(pk=kwargs['pk'])
         # Only the babysitter can set on_my_way
-        try:
-            if request.user.user_bbs != self.service.user_bbs:
-                error = {"Only the assigned babysitter can update this status"}
-                return Response(error, status=status.HTTP_403_FORBIDDEN)
-        except Exception:
+        if not request.roles.is_babysitter:
             error = {"Only babysitters can set on_my_way status"}
             return Response(error, status=status.HTTP_403_FORBIDDEN)
+        if not request.roles.is_babysitter_of(self.service):
+            error = {"Only the assigned babysitter can update this status"}
+            return Response(error, status=status.HTTP_403_FORBIDDEN)
 
         if self.service.on_my_way:
             error = {"Babysitter already marked as on the way"}
@@ -156,7 +288,9 @@ class ServiceViewSet(
             partial=True
         )
         serializer.is_valid(raise_exception=True)
-        service = serializer.save()
+        service = transition(
+            self.service, 'on_my_way', actor=request.user, **serializer.validated_data
+        )
         data = ServiceModelSerializer(service).data
         return Response(data, status=status.HTTP_200_OK)
 
@@ -168,15 +302,14 @@ class ServiceViewSet(
     @action(detail=True, methods=['patch'])
     def arrival(self, request, *args, **kwargs):
         """ Babysitter indicates they have arrived. """
-        self.service = Service.objects.get(pk=kwargs['pk'])
+        self.service = self.get_queryset().get(pk=kwargs['pk'])
         # Only the babysitter can set arrival
-        try:
-            if request.user.user_bbs != self.service.user_bbs:
-                error = {"Only the assigned babysitter can update this status"}
-                return Response(error, status=status.HTTP_403_FORBIDDEN)
-        except Exception:
+        if not request.roles.is_babysitter:
             error = {"Only babysitters can set arrival status"}
             return Response(error, status=status.HTTP_403_FORBIDDEN)
+        if not request.roles.is_babysitter_of(self.service):
+            error = {"Only the assigned babysitter can update this status"}
+            return Response(error, status=status.HTTP_403_FORBIDDEN)
 
         # Must have on_my_way set first
         if not self.service.on_my_way:
@@ -194,7 +327,9 @@ class ServiceViewSet(
             partial=True
         )
         serializer.is_valid(raise_exception=True)
-        service = serializer.save()
+        service = transition(
+            self.service, 'arrival', actor=request.user, **serializer.validated_data
+        )
         data = ServiceModelSerializer(service).data
         return Response(data, status=status.HTTP_200_OK)
 
@@ -207,7 +342,7 @@ class ServiceViewSet(
     @action(detail=True, methods=['patch'])
     def end(self, request, *args, **kwargs):
         """ End the service. """
-        self.service = Service.objects.get(pk=kwargs['pk'])
+        self.service = self.get_queryset().get(pk=kwargs['pk'])
         
         service_start = self.service.service_start
         if not service_start:
@@ -216,11 +351,7 @@ class ServiceViewSet(
         service_end = datetime.datetime.now(timezone.utc)
         self.babysitter = self.service.user_bbs
         cost_per_hour = self.babysitter.cost_of_service
-        if (request.user.user_client == 
-            self.service.user_client) or (
-                request.user.user_client == self.service.user_bbs):
-            logging.info('Permiso concedido')
-        else:
+        if not request.roles.participates_in(self.service):
             error = {"You don't have permissions to acces in this service"}
             return Response(error, status=status.HTTP_401_UNAUTHORIZED)
         total_cost, duration = time_cost_treatment(
@@ -241,11 +372,30 @@ class ServiceViewSet(
             context={'service': self.service}
         )
         serializer.is_valid(raise_exception=True)
-        service = serializer.save()
+        service = transition(
+            self.service, 'end', actor=request.user, **serializer.validated_data
+        )
         data = ServiceModelSerializer(service).data
         return Response(data, status=status.HTTP_200_OK)
 
 
+    @swagger_auto_schema(
+        responses={200: ServiceEventSerializer(many=True)},
+        manual_parameters=[
+            is_authenticated_permission
+        ]
+    )
+    @action(detail=True, methods=['get'])
+    def timeline(self, request, *args, **kwargs):
+        """ States the service went through, oldest first. """
+        if not self.get_queryset().filter(pk=kwargs['pk']).exists():
+            raise NotFound()
+        events = ServiceEvent.objects.filter(
+            service_id=kwargs['pk']
+        ).values('status', 'occurred_at', 'actor_id')
+        return Response(ServiceEventSerializer(events, many=True).data)
+
+
 class ServiceCreateViewSet(
     viewsets.GenericViewSet
 ):
@@ -256,7 +406,10 @@ class ServiceCreateViewSet(
     def dispatch(self, request, *args, **kwargs):
         """ Verify that Babysitter exists. """
         babysitter = kwargs['babysitter']
-        self.babysitter = get_object_or_404(Babysitter, user_bbs__username=babysitter)
+        self.babysitter = get_object_or_404(
+            Babysitter.objects.select_related('user_bbs'),
+            user_bbs__username=babysitter
+        )
         return super(ServiceCreateViewSet, self).dispatch(request, *args, **kwargs)
     
     def get_permissions(self):
@@ -274,11 +427,14 @@ class ServiceCreateViewSet(
         """ Add user and babysitter to serializer context. """
         context = super(ServiceCreateViewSet, self).get_serializer_context()
         context['babysitter'] = self.babysitter
+        return context
 
     def get_serializer_class(self):
         """ Return the serializer class for create a Service."""
         if self.action == 'create_service':
             return CreateServiceSerializer
+        if self.action == 'create_recurring':
+            return RecurringServiceSerializer
 
     operation_description= "Create a service with the information of the babysitter, and details of service."
     service_created_response = openapi.Response("Retrieve the partial detail of Serviece", ServiceModelSerializer)       
@@ -291,10 +447,8 @@ class ServiceCreateViewSet(
     @action(detail=False, methods=['post'], url_path=r'create/(?P<babysitter>[a-z-A-Z0-9_-]+)')
     def create_service(self, request, *args, **kwargs):
         """ Create the service with information of babysitter."""
-        user = request.user.pk
-        user_client = Client.objects.get(user_client=user)
         babysitter = self.babysitter.pk
-        request.data['user_client'] = user_client.pk
+        request.data['user_client'] = request.roles.client_id
         request.data['user_bbs'] = babysitter
         serializer_class = self.get_serializer_class()
         serializer = serializer_class(
@@ -306,3 +460,27 @@ class ServiceCreateViewSet(
         service = serializer.save()
         data = ServiceModelSerializer(service).data
         return Response(data, status=status.HTTP_201_CREATED)
+
+    recurring_description = "Book the same weekday and shift with the babysitter for several weeks."
+    @swagger_auto_schema(
+        operation_description=recurring_description,
+        request_body=RecurringServiceSerializer,
+        manual_parameters=[is_authenticated_permission, is_client_permission]
+    )
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path=r'create/(?P<babysitter>[a-z-A-Z0-9_-]+)/recurring'
+    )
+    def create_recurring(self, request, *args, **kwargs):
+        """ Create the weekly occurrences that are free and report each one. """
+        context = self.get_serializer_context()
+        context['client'] = Client.objects.select_related('user_client').get(
+            user_client=request.user
+        )
+        serializer = RecurringServiceSerializer(data=request.data, context=context)
+        serializer.is_valid(raise_exception=True)
+        results = serializer.save()
+        if any(result['accepted'] for result in results):
+            return Response(results, status=status.HTTP_201_CREATED)
+        return Response(results, status=status.HTTP_409_CONFLICT)
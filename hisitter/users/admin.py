@@ -5,7 +5,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
 # Models
-from hisitter.users.models import User, Babysitter, Availability, Client
+from hisitter.users.models import User, Babysitter, BabysitterCard, Availability, Client, GeocodeCache
 
 
 class CustomUserAdmin(UserAdmin):
@@ -22,6 +22,21 @@ class BabysitterAdmin(admin.ModelAdmin):
     list_filter = ("cost_of_service",)
 
 
+@admin.register(BabysitterCard)
+class BabysitterCardAdmin(admin.ModelAdmin):
+    """ Babysitter card Admin, the cards are rebuilt from their sources."""
+    list_display = ('username', 'reputation', 'cost_of_service', 'updated_at')
+    search_fields = ('username',)
+    readonly_fields = [field.name for field in BabysitterCard._meta.fields]
+
+
+@admin.register(GeocodeCache)
+class GeocodeCacheAdmin(admin.ModelAdmin):
+    """ Geocode cache Admin, deleting a row makes the address be geocoded again."""
+    list_display = ('address', 'lat', 'long', 'created_at')
+    search_fields = ('address',)
+
+
 @admin.register(Client)
 class ClientAdmin(admin.ModelAdmin):
     """ Client Admin."""
@@ -8,3 +8,7 @@ from django.utils.translation import gettext_lazy as _
 class UsersAppsConfig(AppConfig):
     name = "hisitter.users"
     verbose_name = _("Users")
+
+    def ready(self):
+        """ Connect the users signals. """
+        from hisitter.users import signals  # noqa: F401
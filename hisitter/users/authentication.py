@@ -0,0 +1,158 @@
+""" Signed (JWT) access and refresh tokens.
+
+    An access token carries the user's id, username and email, so a request
+    sent with "Authorization: Bearer <access>" is authenticated by checking
+    the signature, without reading authtoken_token or users_user. The user is
+    built with User.from_db(), any other field is loaded on first access.
+
+    Tokens are revoked through the cache: by jti until they expire, and per
+    user with a cutoff that rejects every token issued before it (rename,
+    password change, deactivation). Both are read with a single
+    get_many(). The user's row isn't read, so every way of deactivating a
+    user must set the cutoff: the pre_save signal covers save(), and
+    UserQuerySet.update() covers queryset updates. Raw SQL has to call
+    revoke_user_tokens() itself.
+
+    Opaque "Token <key>" tokens keep working through TokenAuthentication.
+"""
+
+# Python
+import time
+import uuid
+
+# Django imports
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router, transaction
+
+# Django REST Framework imports
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+# Models
+from hisitter.users.models import User
+
+# Utilities
+import jwt
+
+ACCESS = 'access'
+REFRESH = 'refresh'
+ALGORITHM = 'HS256'
+# User fields stored in the access token.
+CLAIMS = {'username': 'username', 'email': 'email'}
+
+
+def get_lifetime(token_type):
+    if token_type == ACCESS:
+        return settings.JWT_ACCESS_TOKEN_LIFETIME
+    return settings.JWT_REFRESH_TOKEN_LIFETIME
+
+
+def encode_token(user, token_type):
+    """ Return a signed token of the type for the user. """
+    now = time.time()
+    payload = {
+        'type': token_type,
+        'sub': str(user.pk),
+        'jti': uuid.uuid4().hex,
+        'iat': now,
+        'exp': int(now + get_lifetime(token_type))
+    }
+    if token_type == ACCESS:
+        payload.update((claim, getattr(user, field)) for claim, field in CLAIMS.items())
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=ALGORITHM)
+
+
+def issue_tokens(user):
+    """ Return a new access and refresh token pair for the user. """
+    return {
+        'access': encode_token(user, ACCESS),
+        'refresh': encode_token(user, REFRESH),
+        'expires_in': settings.JWT_ACCESS_TOKEN_LIFETIME
+    }
+
+
+def decode_token(token, token_type):
+    """ Return the payload of a valid, unrevoked token of the type. """
+    try:
+        payload = jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[ALGORITHM],
+            options={'require': ['exp', 'iat', 'jti', 'sub', 'type']}
+        )
+    except jwt.ExpiredSignatureError:
+        raise AuthenticationFailed('Token has expired.')
+    except jwt.PyJWTError:
+        raise AuthenticationFailed('Invalid token.')
+    # The email verification tokens are signed with the same key.
+    if payload['type'] != token_type:
+        raise AuthenticationFailed('Invalid token.')
+    if is_revoked(payload):
+        raise AuthenticationFailed('Token has been revoked.')
+    return payload
+
+
+def jti_key(jti):
+    return f'jwt:revoked:{jti}'
+
+
+def cutoff_key(user_id):
+    return f'jwt:revoked-before:{user_id}'
+
+
+def is_revoked(payload):
+    keys = [jti_key(payload['jti']), cutoff_key(payload['sub'])]
+    revoked = cache.get_many(keys)
+    if keys[0] in revoked:
+        return True
+    cutoff = revoked.get(keys[1])
+    return cutoff is not None and payload['iat'] < cutoff
+
+
+def revoke_token(payload):
+    """ Reject the token until it expires. """
+    timeout = int(payload['exp'] - time.time()) + 1
+    if timeout > 0:
+        cache.set(jti_key(payload['jti']), 1, timeout)
+
+
+def revoke_user_tokens(user_id):
+    """ Reject every token issued to the user so far, once the current
+        transaction commits.
+    """
+    transaction.on_commit(lambda: cache.set(
+        cutoff_key(user_id), time.time(), settings.JWT_REFRESH_TOKEN_LIFETIME
+    ))
+
+
+class JWTAuthentication(BaseAuthentication):
+    """ Authenticate "Authorization: Bearer <access token>" requests.
+
+        request.auth is the token payload. Returns None for other schemes so
+        TokenAuthentication can handle them.
+    """
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if not settings.JWT_AUTH_ENABLED:
+            return None
+        if len(auth) != 2:
+            raise AuthenticationFailed('Invalid token header.')
+        try:
+            token = auth[1].decode()
+        except UnicodeError:
+            raise AuthenticationFailed('Invalid token header.')
+        payload = decode_token(token, ACCESS)
+        user = User.from_db(
+            router.db_for_read(User),
+            ['id', *CLAIMS.values()],
+            [int(payload['sub']), *(payload[claim] for claim in CLAIMS)]
+        )
+        return user, payload
+
+    def authenticate_header(self, request):
+        return self.keyword
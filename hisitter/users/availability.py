@@ -0,0 +1,78 @@
+""" Weekly availability stored as bits.
+
+    Each babysitter keeps one 24 bit integer per weekday, bit n set means
+    the babysitter works from hour n to n + 1. The shifts of the Availability
+    rows map to fixed blocks of hours, so a shift is available when all of
+    its bits are set.
+"""
+
+# Python
+import datetime
+
+DAYS = (
+    'Monday',
+    'Tuesday',
+    'Wednesday',
+    'Thursday',
+    'Friday',
+    'Saturday',
+    'Sunday'
+)
+
+SHIFT_HOURS = {
+    'morning': range(6, 12),
+    'afternoon': range(12, 18),
+    'evening': range(18, 24),
+    'night': range(0, 6)
+}
+
+# Babysitter column of each weekday, in date.weekday() order.
+DAY_FIELDS = tuple(f'availability_{day.lower()}' for day in DAYS)
+
+
+def hours_mask(hours):
+    """ Return the bits of the given hours of a day. """
+    mask = 0
+    for hour in hours:
+        if not 0 <= hour < 24:
+            raise ValueError(f'Invalid hour: {hour}')
+        mask |= 1 << hour
+    return mask
+
+
+def shift_mask(shift):
+    """ Return the bits of the hours covered by a shift. """
+    return hours_mask(SHIFT_HOURS[shift])
+
+
+def day_field(day):
+    """ Return the Babysitter column for a date, a weekday number or a day name. """
+    if isinstance(day, datetime.date):
+        day = day.weekday()
+    elif isinstance(day, str):
+        day = DAYS.index(day)
+    return DAY_FIELDS[day]
+
+
+def week_from_shifts(shifts):
+    """ Return {column: bits} for an iterable of (day, shift) pairs. """
+    week = dict.fromkeys(DAY_FIELDS, 0)
+    for day, shift in shifts:
+        week[day_field(day)] |= shift_mask(shift)
+    return week
+
+
+def summary(week):
+    """ Return {day name: [shifts]} of the shifts fully covered by a
+        {column: bits} week, days without shifts are left out.
+    """
+    days = {}
+    for day, field in zip(DAYS, DAY_FIELDS):
+        bits = week.get(field, 0)
+        shifts = [
+            shift for shift in SHIFT_HOURS
+            if bits & shift_mask(shift) == shift_mask(shift)
+        ]
+        if shifts:
+            days[day] = shifts
+    return days
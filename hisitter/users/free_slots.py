@@ -0,0 +1,69 @@
+""" Cache of the babysitters free for a (date, shift) slot.
+
+    Each slot keeps the ordered ids of its free babysitters under a key
+    built from two versions: the version of the slot, bumped when a service
+    of the slot is booked or ended, and the version of its (weekday, shift),
+    bumped when an availability of that weekday and shift changes, since it
+    affects every date of the weekday (see hisitter.utils.cache).
+"""
+
+# Python
+import datetime
+
+# Availability bits
+from hisitter.users import availability
+
+# Utils
+from hisitter.utils.cache import bump_version, get_versions, read_through
+
+TIMEOUT = 60 * 60
+
+
+def weekday_version_key(weekday, shift):
+    return f'free-slots:version:{weekday}:{shift}'
+
+
+def slot_version_key(date, shift):
+    return f'free-slots:version:{date.isoformat()}:{shift}'
+
+
+def slot_key(date, shift):
+    """ Return the cache key of the slot at the current versions. """
+    keys = [weekday_version_key(date.weekday(), shift), slot_version_key(date, shift)]
+    versions = get_versions(keys, TIMEOUT)
+    return f'free-slots:{date.isoformat()}:{shift}:{versions[keys[0]]}:{versions[keys[1]]}'
+
+
+def get_free_ids(date, shift, compute):
+    """ Return the cached ids of the free babysitters of the slot, calling
+        compute() to read them on a miss.
+    """
+    return read_through(slot_key(date, shift), lambda: list(compute()), TIMEOUT)
+
+
+def invalidate_slot(date, shift):
+    """ Forget the slot once the current transaction commits. """
+    if isinstance(date, str):
+        date = datetime.date.fromisoformat(date)
+    bump_version(slot_version_key(date, shift), TIMEOUT)
+
+
+def invalidate_weekday(weekday, shift):
+    """ Forget every date of the weekday for the shift once the current
+        transaction commits.
+    """
+    bump_version(weekday_version_key(weekday, shift), TIMEOUT)
+
+
+def invalidate_changed_availability(old_week, new_week):
+    """ Invalidate the (weekday, shift) pairs whose shift coverage changed
+        between two {column: bits} weeks of a babysitter.
+    """
+    for weekday, field in enumerate(availability.DAY_FIELDS):
+        old_bits, new_bits = old_week.get(field, 0), new_week.get(field, 0)
+        if old_bits == new_bits:
+            continue
+        for shift in availability.SHIFT_HOURS:
+            mask = availability.shift_mask(shift)
+            if (old_bits & mask == mask) != (new_bits & mask == mask):
+                invalidate_weekday(weekday, shift)
@@ -0,0 +1,156 @@
+""" Address geocoding behind a persistent cache.
+
+    geocode() normalizes the address and looks it up in an in-process LRU,
+    then in the GeocodeCache table, and only then asks the geocoder backend
+    named by settings.GEOCODER_BACKEND. Concurrent lookups of the same
+    address in a process share a single lookup (single-flight). Results are
+    stored, "not found" included; backend errors aren't, so the caller can
+    retry. Meant for Celery workers, the backend can take
+    settings.GEOCODER_TIMEOUT seconds.
+"""
+
+# Python
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from decimal import Decimal
+
+# Django imports
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Models
+from hisitter.users.models import GeocodeCache
+
+# Utils
+from geopy.geocoders import Nominatim
+from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+
+# Decimal places of the stored coordinates, as in User.lat/long.
+PRECISION = Decimal('0.000001')
+
+
+class GeocodingError(Exception):
+    """ The geocoder backend failed, the lookup can be retried. """
+
+
+class NominatimGeocoder:
+    """ OpenStreetMap's Nominatim. """
+
+    def __init__(self, timeout):
+        self.geolocator = Nominatim(user_agent="hisitter-app", timeout=timeout)
+
+    def geocode(self, address):
+        """ Return (lat, long) of the address, None when it isn't found. """
+        try:
+            location = self.geolocator.geocode(address)
+        except (GeocoderTimedOut, GeocoderServiceError) as error:
+            raise GeocodingError(str(error)) from error
+        if location is None:
+            return None
+        return location.latitude, location.longitude
+
+
+class DummyGeocoder:
+    """ Geocoder for tests and local development, without network: every
+        address gets stable coordinates derived from its text, except the
+        ones containing "nowhere", which aren't found.
+    """
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+
+    def geocode(self, address):
+        if 'nowhere' in address:
+            return None
+        digest = int(hashlib.md5(address.encode()).hexdigest(), 16)
+        lat = digest % 180_000_000 / 1_000_000 - 90
+        long = digest // 180_000_000 % 360_000_000 / 1_000_000 - 180
+        return lat, long
+
+
+class SingleFlightLRU:
+    """ Least recently used values by key, computed once per key.
+
+        A miss computes the value while the other threads that miss the
+        same key wait for that computation instead of starting their own;
+        if it fails they all get its error and nothing is stored.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.values = OrderedDict()
+        self.flights = {}
+        self.lock = threading.Lock()
+
+    def get(self, key, compute):
+        with self.lock:
+            if key in self.values:
+                self.values.move_to_end(key)
+                return self.values[key]
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = Future()
+        if not leader:
+            return flight.result()
+        try:
+            value = compute()
+        except BaseException as error:
+            with self.lock:
+                del self.flights[key]
+            flight.set_exception(error)
+            raise
+        with self.lock:
+            self.values[key] = value
+            if len(self.values) > self.maxsize:
+                self.values.popitem(last=False)
+            del self.flights[key]
+        flight.set_result(value)
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.values.clear()
+
+
+lru = SingleFlightLRU(settings.GEOCODER_LRU_SIZE)
+
+
+def normalize_address(address):
+    """ Return the cache key of an address: lower case, single spaces. """
+    return ' '.join(address.casefold().split())[:255]
+
+
+def get_geocoder():
+    return import_string(settings.GEOCODER_BACKEND)(timeout=settings.GEOCODER_TIMEOUT)
+
+
+def geocode(address):
+    """ Return (lat, long) Decimals of the address, None when it isn't
+        found. Raise GeocodingError when the backend fails.
+    """
+    key = normalize_address(address)
+    if not key:
+        return None
+    return lru.get(key, lambda: lookup(key))
+
+
+def lookup(key):
+    """ Read the normalized address from GeocodeCache, asking the backend
+        and storing its answer when it isn't there.
+    """
+    row = GeocodeCache.objects.filter(address=key).values_list('lat', 'long').first()
+    if row is not None:
+        return None if row[0] is None else row
+    coordinates = get_geocoder().geocode(key)
+    if coordinates is not None:
+        coordinates = tuple(Decimal(str(value)).quantize(PRECISION) for value in coordinates)
+    lat, long = coordinates or (None, None)
+    # Another process may have stored the address meanwhile, same answer.
+    GeocodeCache.objects.bulk_create(
+        [GeocodeCache(address=key, lat=lat, long=long)],
+        ignore_conflicts=True
+    )
+    return coordinates
@@ -0,0 +1,195 @@
+"""Management command to geocode the users and services saved without coordinates."""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from hisitter.services.models import Service
+from hisitter.users import geocoding, profile_cache
+from hisitter.users.models import BabysitterCard, GeocodeCache, User
+from hisitter.utils.geohash import encode
+
+# Checkpoint keys, in the order they are backfilled.
+MODELS = {'users': User, 'services': Service}
+
+# Answer of an address whose lookup raised GeocodingError.
+FAILED = object()
+
+
+class RateLimiter:
+    """ Space the calls of all the threads at least 1/rate seconds apart. """
+
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self.next_call = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_call - now
+            self.next_call = max(now, self.next_call) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class Command(BaseCommand):
+    help = (
+        "Geocode the users and services whose lat/long are NULL, resuming "
+        "from the checkpoint of an interrupted run"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows read and updated per batch')
+        parser.add_argument('--workers', type=int, default=4, help='Threads asking the geocoder')
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=1.0,
+            help='Geocoder requests per second across all the threads'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default=str(settings.ROOT_DIR / '.backfill_coordinates.json'),
+            help='File storing the last primary key written per model'
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore the checkpoint and scan every row again'
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.checkpoint_path = options['checkpoint']
+        self.checkpoint = {} if options['restart'] else self.read_checkpoint()
+        self.limiter = RateLimiter(options['rate'])
+        pool = ThreadPoolExecutor(max_workers=options['workers'])
+        try:
+            for name, model in MODELS.items():
+                written, failed = self.backfill(name, model, pool)
+                self.stdout.write(self.style.SUCCESS(
+                    f"Geocoded {written} {name}, {failed} failed and can be retried"
+                ))
+        finally:
+            # Don't wait for the queued lookups of an interrupted run.
+            pool.shutdown(cancel_futures=True)
+        # Finished, the next run scans everything again.
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def read_checkpoint(self):
+        try:
+            with open(self.checkpoint_path) as checkpoint:
+                return json.load(checkpoint)
+        except FileNotFoundError:
+            return {}
+
+    def write_checkpoint(self):
+        partial = f'{self.checkpoint_path}.tmp'
+        with open(partial, 'w') as checkpoint:
+            json.dump(self.checkpoint, checkpoint)
+        os.replace(partial, self.checkpoint_path)
+
+    def backfill(self, name, model, pool):
+        """ Geocode the rows of the model after its checkpoint. Return the
+            number of rows written and of rows whose lookup failed.
+        """
+        fields = ['pk', 'address', 'username'] if model is User else ['pk', 'address']
+        rows = model.objects.filter(
+            Q(lat__isnull=True) | Q(long__isnull=True),
+            pk__gt=self.checkpoint.get(name, 0)
+        ).exclude(address='').order_by('pk').only(*fields).iterator(chunk_size=self.batch_size)
+        written = failed = 0
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            coordinates = self.geocode(
+                {geocoding.normalize_address(row.address) for row in batch}, pool
+            )
+            changed = []
+            now = timezone.now()
+            for row in batch:
+                found = coordinates.get(geocoding.normalize_address(row.address))
+                if found is FAILED:
+                    failed += 1
+                elif found is not None:
+                    row.lat, row.long = found
+                    row.updated_at = now
+                    changed.append(row)
+            written += self.write(model, changed)
+            self.checkpoint[name] = batch[-1].pk
+            self.write_checkpoint()
+        return written, failed
+
+    def geocode(self, keys, pool):
+        """ Return the coordinates of the normalized addresses, None when
+            not found and FAILED when the geocoder failed. Addresses already
+            in GeocodeCache are read in one query, only the others go
+            through the rate limited threads.
+        """
+        keys.discard('')
+        coordinates = {
+            address: None if lat is None else (lat, long)
+            for address, lat, long in GeocodeCache.objects.filter(
+                address__in=keys
+            ).values_list('address', 'lat', 'long')
+        }
+        missing = list(keys - coordinates.keys())
+        coordinates.update(zip(missing, pool.map(self.lookup, missing)))
+        return coordinates
+
+    def lookup(self, key):
+        self.limiter.wait()
+        try:
+            return geocoding.geocode(key)
+        except geocoding.GeocodingError:
+            return FAILED
+        finally:
+            # Threads of the pool don't go through Django's request cycle.
+            connection.close()
+
+    def write(self, model, rows):
+        """ Write the coordinates of the rows that still have the address
+            they were geocoded from and no coordinates, locking them first:
+            the user may have moved, or geocode_user filled them, while the
+            batch was geocoded. Return the number of rows written.
+
+            bulk_update() skips save() and the signals, so the geohash, the
+            cards and the cached profiles of users are kept here.
+        """
+        if not rows:
+            return 0
+        fields = ['lat', 'long', 'updated_at']
+        if model is User:
+            fields.append('geohash')
+        with transaction.atomic():
+            current = {
+                row['pk']: row for row in model.objects.select_for_update().filter(
+                    Q(lat__isnull=True) | Q(long__isnull=True),
+                    pk__in=[row.pk for row in rows]
+                ).values(*(['pk', 'address', 'username'] if model is User else ['pk', 'address']))
+            }
+            rows = [
+                row for row in rows
+                if row.pk in current and current[row.pk]['address'] == row.address
+            ]
+            if model is User:
+                for user in rows:
+                    user.geohash = encode(user.lat, user.long)
+                    user.username = current[user.pk]['username']
+            model.objects.bulk_update(rows, fields)
+            if model is User:
+                BabysitterCard.objects.refresh([user.pk for user in rows])
+                profile_cache.invalidate_profiles([user.username for user in rows])
+        return len(rows)
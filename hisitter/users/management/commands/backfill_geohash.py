@@ -0,0 +1,40 @@
+"""Management command to fill the geohash of users with coordinates."""
+
+from django.core.management.base import BaseCommand
+
+from hisitter.users.models import User
+from hisitter.utils.geohash import encode
+
+
+class Command(BaseCommand):
+    help = "Compute the geohash of the users that have coordinates"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Users updated per query')
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recompute every geohash, not only the missing ones'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        users = User.objects.filter(lat__isnull=False, long__isnull=False)
+        if not options['all']:
+            users = users.filter(geohash='')
+        users = users.order_by('pk').only('pk', 'lat', 'long', 'geohash')
+        updated, last_pk = 0, 0
+        while True:
+            batch = list(users.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            changed = []
+            for user in batch:
+                value = encode(user.lat, user.long)
+                if user.geohash != value:
+                    user.geohash = value
+                    changed.append(user)
+            User.objects.bulk_update(changed, ['geohash'])
+            updated += len(changed)
+            last_pk = batch[-1].pk
+        self.stdout.write(self.style.SUCCESS(f"Updated the geohash of {updated} users"))
@@ -0,0 +1,42 @@
+"""Management command to onboard the babysitters of a partner agency from a file."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hisitter.users.onboarding import import_babysitters, read_records
+
+
+class Command(BaseCommand):
+    help = "Create the babysitters of a CSV or JSONL file, reporting the rows left out"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSONL file of babysitters')
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'jsonl'],
+            help='Format of the file, taken from its extension by default'
+        )
+        parser.add_argument('--chunk-size', type=int, default=500, help='Rows validated and written per transaction')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Processes hashing the passwords, the number of CPUs by default'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        format = options['format'] or path.rsplit('.', 1)[-1].lower()
+        if format not in ('csv', 'jsonl'):
+            raise CommandError(f"Unknown format of {path}, use --format")
+        try:
+            created, errors = import_babysitters(
+                read_records(path, format),
+                chunk_size=options['chunk_size'],
+                workers=options['workers']
+            )
+        except OSError as error:
+            raise CommandError(error)
+        for line, row_errors in errors:
+            self.stderr.write(f"Line {line}: {row_errors}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created} babysitters, {len(errors)} rows left out"
+        ))
@@ -0,0 +1,32 @@
+"""Management command to regenerate the babysitter cards from their source tables."""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from hisitter.users.models import Babysitter, BabysitterCard
+
+
+class Command(BaseCommand):
+    help = "Rebuild the BabysitterCard rows from User, Babysitter and the availability bits"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Cards written per batch')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        user_ids = Babysitter.objects.order_by('user_bbs').values_list('user_bbs', flat=True)
+        written, last_id = 0, 0
+        while True:
+            batch = list(user_ids.filter(user_bbs__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            with transaction.atomic():
+                written += BabysitterCard.objects.refresh(batch)
+            last_id = batch[-1]
+        # Cards left by babysitters deleted without signals.
+        deleted, _ = BabysitterCard.objects.exclude(
+            user__in=Babysitter.objects.values('user_bbs')
+        ).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} babysitter cards, deleted {deleted} stale ones"
+        ))
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.4 on 2026-10-18 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_user_reputation_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="babysitter",
+            name="availability_monday",
+            field=models.IntegerField(default=0, verbose_name="Monday availability"),
+        ),
+        migrations.AddField(
+            model_name="babysitter",
+            name="availability_tuesday",
+            field=models.IntegerField(default=0, verbose_name="Tuesday availability"),
+        ),
+        migrations.AddField(
+            model_name="babysitter",
+            name="availability_wednesday",
+            field=models.IntegerField(default=0, verbose_name="Wednesday availability"),
+        ),
+        migrations.AddField(
+            model_name="babysitter",
+            name="availability_thursday",
+            field=models.IntegerField(default=0, verbose_name="Thursday availability"),
+        ),
+        migrations.AddField(
+            model_name="babysitter",
+            name="availability_friday",
+            field=models.IntegerField(default=0, verbose_name="Friday availability"),
+        ),
+        migrations.AddField(
+            model_name="babysitter",
+            name="availability_saturday",
+            field=models.IntegerField(default=0, verbose_name="Saturday availability"),
+        ),
+        migrations.AddField(
+            model_name="babysitter",
+            name="availability_sunday",
+            field=models.IntegerField(default=0, verbose_name="Sunday availability"),
+        ),
+    ]
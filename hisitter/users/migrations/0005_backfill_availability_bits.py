@@ -0,0 +1,31 @@
+# Generated by Django 5.1.4 on 2026-10-18 21:12
+
+from django.db import migrations
+
+from hisitter.users.availability import DAY_FIELDS, week_from_shifts
+
+
+def backfill_availability_bits(apps, schema_editor):
+    """ Build the availability bits from the existing Availability rows. """
+    Babysitter = apps.get_model("users", "Babysitter")
+    Availability = apps.get_model("users", "Availability")
+    shifts = {}
+    for bbs, day, shift in Availability.objects.values_list("bbs", "day", "shift").iterator():
+        shifts.setdefault(bbs, []).append((day, shift))
+    babysitters = []
+    for babysitter in Babysitter.objects.filter(pk__in=shifts).only("pk").iterator():
+        for field, bits in week_from_shifts(shifts[babysitter.pk]).items():
+            setattr(babysitter, field, bits)
+        babysitters.append(babysitter)
+    Babysitter.objects.bulk_update(babysitters, DAY_FIELDS, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_babysitter_availability_bits"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_availability_bits, migrations.RunPython.noop),
+    ]
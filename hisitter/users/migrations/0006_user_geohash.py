@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-18 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0005_backfill_availability_bits"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="geohash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Geohash of lat and long, kept up to date on save.",
+                max_length=12,
+                verbose_name="Geohash",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["geohash"],
+                name="user_geohash_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.1.4 on 2026-10-18 23:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0006_user_geohash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BabysitterCard",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="Date time on which the object was created.",
+                        verbose_name="created at",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Date time on which the object was modified",
+                        verbose_name="updated at",
+                    ),
+                ),
+                (
+                    "deleted_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="deleted at"),
+                ),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="babysitter_card",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("username", models.CharField(max_length=150, verbose_name="Username")),
+                ("first_name", models.CharField(blank=True, max_length=150, verbose_name="First name")),
+                ("last_name", models.CharField(blank=True, max_length=150, verbose_name="Last name")),
+                ("picture", models.ImageField(blank=True, upload_to="", verbose_name="Picture")),
+                (
+                    "reputation",
+                    models.DecimalField(decimal_places=1, max_digits=2, verbose_name="Reputation"),
+                ),
+                (
+                    "cost_of_service",
+                    models.DecimalField(decimal_places=2, max_digits=6, verbose_name="Cost of service"),
+                ),
+                (
+                    "availability",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Shifts of each weekday the babysitter works.",
+                        verbose_name="Availability",
+                    ),
+                ),
+                (
+                    "lat",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=10, null=True, verbose_name="Latitude"
+                    ),
+                ),
+                (
+                    "long",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=10, null=True, verbose_name="Longitude"
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-reputation", "-user_id"],
+                "indexes": [
+                    models.Index(fields=["-reputation", "-user"], name="babysitter_card_rank_idx")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.4 on 2026-10-18 23:41
+
+from django.db import migrations
+
+from hisitter.users.availability import DAY_FIELDS, summary
+
+SOURCES = {
+    "username": "user_bbs__username",
+    "first_name": "user_bbs__first_name",
+    "last_name": "user_bbs__last_name",
+    "picture": "user_bbs__picture",
+    "reputation": "user_bbs__reputation",
+    "lat": "user_bbs__lat",
+    "long": "user_bbs__long",
+    "cost_of_service": "cost_of_service",
+}
+
+
+def backfill_babysitter_cards(apps, schema_editor):
+    """ Build a card for every existing babysitter. """
+    Babysitter = apps.get_model("users", "Babysitter")
+    BabysitterCard = apps.get_model("users", "BabysitterCard")
+    rows = Babysitter.objects.values("user_bbs_id", *SOURCES.values(), *DAY_FIELDS)
+    BabysitterCard.objects.bulk_create(
+        (
+            BabysitterCard(
+                user_id=row["user_bbs_id"],
+                availability=summary(row),
+                **{field: row[source] for field, source in SOURCES.items()}
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0007_babysittercard"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_babysitter_cards, migrations.RunPython.noop),
+    ]
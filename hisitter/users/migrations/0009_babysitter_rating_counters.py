@@ -0,0 +1,44 @@
+# Generated by Django 5.1.4 on 2026-10-19 00:30
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_rating_counters(apps, schema_editor):
+    """ Count the existing reviews of each babysitter. """
+    Babysitter = apps.get_model("users", "Babysitter")
+    Review = apps.get_model("reviews", "Review")
+    totals = Review.objects.order_by().values("service_origin__user_bbs").annotate(
+        rating_sum=Sum("reputation"), rating_count=Count("id")
+    )
+    babysitters = [
+        Babysitter(
+            pk=row["service_origin__user_bbs"],
+            rating_sum=row["rating_sum"],
+            rating_count=row["rating_count"],
+        )
+        for row in totals
+    ]
+    Babysitter.objects.bulk_update(babysitters, ["rating_sum", "rating_count"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0008_backfill_babysitter_cards"),
+        ("reviews", "0002_review_service_origin"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="babysitter",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0, verbose_name="Sum of the ratings"),
+        ),
+        migrations.AddField(
+            model_name="babysitter",
+            name="rating_count",
+            field=models.PositiveIntegerField(default=0, verbose_name="Number of ratings"),
+        ),
+        migrations.RunPython(backfill_rating_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.4 on 2026-10-19 02:10
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_rating_histogram(apps, schema_editor):
+    """ Count the existing reviews of each babysitter by stars. """
+    Babysitter = apps.get_model("users", "Babysitter")
+    Review = apps.get_model("reviews", "Review")
+    rows = Review.objects.order_by().filter(reputation__range=(1, 5)).values(
+        "service_origin__user_bbs", "reputation"
+    ).annotate(total=Count("id"))
+    babysitters = {}
+    for row in rows:
+        pk = row["service_origin__user_bbs"]
+        babysitter = babysitters.setdefault(pk, Babysitter(pk=pk))
+        setattr(babysitter, f"rating_{row['reputation']}", row["total"])
+    fields = [f"rating_{stars}" for stars in range(1, 6)]
+    Babysitter.objects.bulk_update(babysitters.values(), fields, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0009_babysitter_rating_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="babysitter",
+            name="rating_1",
+            field=models.PositiveIntegerField(default=0, verbose_name="One star ratings"),
+        ),
+        migrations.AddField(
+            model_name="babysitter",
+            name="rating_2",
+            field=models.PositiveIntegerField(default=0, verbose_name="Two star ratings"),
+        ),
+        migrations.AddField(
+            model_name="babysitter",
+            name="rating_3",
+            field=models.PositiveIntegerField(default=0, verbose_name="Three star ratings"),
+        ),
+        migrations.AddField(
+            model_name="babysitter",
+            name="rating_4",
+            field=models.PositiveIntegerField(default=0, verbose_name="Four star ratings"),
+        ),
+        migrations.AddField(
+            model_name="babysitter",
+            name="rating_5",
+            field=models.PositiveIntegerField(default=0, verbose_name="Five star ratings"),
+        ),
+        migrations.RunPython(backfill_rating_histogram, migrations.RunPython.noop),
+    ]
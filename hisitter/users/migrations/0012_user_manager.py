@@ -0,0 +1,21 @@
+# Generated by Django 5.1.4 on 2026-10-19 11:40
+
+from django.db import migrations
+
+import hisitter.users.models.users
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0011_geocodecache"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="user",
+            managers=[
+                ("objects", hisitter.users.models.users.UserManager()),
+            ],
+        ),
+    ]
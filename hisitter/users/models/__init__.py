@@ -1,3 +1,5 @@
 from .users import User
 from .clients import Client
 from .babysitters import Babysitter, Availability
+from .cards import BabysitterCard
+from .geocoding import GeocodeCache
@@ -1,16 +1,89 @@
 """ Babysitters model."""
 
 # Django imports
+from django.apps import apps
 from django.db import models
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 # Utils Abstract Model
 from hisitter.utils.abstract_users import HisitterModel
 
+# Availability bits
+from hisitter.users import availability, free_slots, profile_cache
+
 # Models
 from .users import User
 
 
+class BabysitterQuerySet(models.QuerySet):
+    """ Queries over the babysitters' weekly availability. """
+
+    def available_at(self, day, shift=None, hours=None):
+        """ Babysitters that work all the hours of the shift, or the given
+            hours, on day (a date, a weekday number or a day name).
+        """
+        if hours is None:
+            mask = availability.shift_mask(shift)
+        else:
+            mask = availability.hours_mask(hours)
+        field = availability.day_field(day)
+        return self.alias(free_hours=F(field).bitand(mask)).filter(free_hours=mask)
+
+    def free_at(self, date, shift):
+        """ Babysitters available for the slot that have no active service
+            in it, as a NOT EXISTS anti-join.
+        """
+        Service = apps.get_model('services', 'Service')
+        booked = Service.objects.filter(
+            user_bbs=OuterRef('pk'),
+            date=date,
+            shift=shift,
+            is_active=True
+        )
+        return self.available_at(date, shift).filter(~Exists(booked))
+
+    def refresh_availability(self):
+        """ Rebuild the availability bits of the babysitters from their
+            Availability rows, updating the cards and invalidating the
+            cached slots and profiles they change. Return the number of
+            babysitters whose availability changed.
+        """
+        babysitters = list(
+            self.select_related('user_bbs').only(
+                'pk', 'user_bbs__username', *availability.DAY_FIELDS
+            )
+        )
+        if not babysitters:
+            return 0
+        shifts = {babysitter.pk: [] for babysitter in babysitters}
+        rows = Availability.objects.filter(bbs__in=shifts).values_list('bbs', 'day', 'shift')
+        for bbs, day, shift in rows:
+            shifts[bbs].append((day, shift))
+        changed = []
+        now = timezone.now()
+        for babysitter in babysitters:
+            week = availability.week_from_shifts(shifts[babysitter.pk])
+            old_week = {field: getattr(babysitter, field) for field in availability.DAY_FIELDS}
+            if old_week == week:
+                continue
+            free_slots.invalidate_changed_availability(old_week, week)
+            for field, bits in week.items():
+                setattr(babysitter, field, bits)
+            # The availabilities are part of the babysitter's representation.
+            babysitter.updated_at = now
+            changed.append(babysitter)
+        Babysitter.objects.bulk_update(
+            changed, [*availability.DAY_FIELDS, 'updated_at'], batch_size=500
+        )
+        apps.get_model('users', 'BabysitterCard').objects.refresh(
+            babysitter.user_bbs_id for babysitter in changed
+        )
+        profile_cache.invalidate_profiles(babysitter.user_bbs.username for babysitter in changed)
+        return len(changed)
+
+
 class Babysitter(HisitterModel):
     """This class is to match the user and the babysitter attributes."""
     user_bbs = models.OneToOneField(
@@ -34,6 +107,37 @@ class Babysitter(HisitterModel):
         decimal_places=2,
         blank=False
     )
+    # Running totals of the babysitter's review ratings, the reputation of
+    # its user is derived from them (see hisitter.reviews.reputation).
+    rating_sum = models.PositiveIntegerField(_("Sum of the ratings"), default=0)
+    rating_count = models.PositiveIntegerField(_("Number of ratings"), default=0)
+    # How many reviews gave each number of stars, shown with the reviews.
+    rating_1 = models.PositiveIntegerField(_("One star ratings"), default=0)
+    rating_2 = models.PositiveIntegerField(_("Two star ratings"), default=0)
+    rating_3 = models.PositiveIntegerField(_("Three star ratings"), default=0)
+    rating_4 = models.PositiveIntegerField(_("Four star ratings"), default=0)
+    rating_5 = models.PositiveIntegerField(_("Five star ratings"), default=0)
+    # Hours of each weekday the babysitter works, kept in sync with the
+    # Availability rows by hisitter.users.signals.
+    availability_monday = models.IntegerField(_("Monday availability"), default=0)
+    availability_tuesday = models.IntegerField(_("Tuesday availability"), default=0)
+    availability_wednesday = models.IntegerField(_("Wednesday availability"), default=0)
+    availability_thursday = models.IntegerField(_("Thursday availability"), default=0)
+    availability_friday = models.IntegerField(_("Friday availability"), default=0)
+    availability_saturday = models.IntegerField(_("Saturday availability"), default=0)
+    availability_sunday = models.IntegerField(_("Sunday availability"), default=0)
+
+    objects = BabysitterQuerySet.as_manager()
+
+    def is_available(self, day, shift=None, hours=None):
+        """ Return True when the babysitter works all the hours of the
+            shift, or the given hours, on day.
+        """
+        if hours is None:
+            mask = availability.shift_mask(shift)
+        else:
+            mask = availability.hours_mask(hours)
+        return getattr(self, availability.day_field(day)) & mask == mask
 
     def __str__(self):
         return str(self.user_bbs)
@@ -0,0 +1,110 @@
+""" Babysitter cards model. """
+
+# Django imports
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+# Utils Abstract Model
+from hisitter.utils.abstract_users import HisitterModel
+
+# Availability bits
+from hisitter.users import availability
+
+# Models
+from .users import User
+from .babysitters import Babysitter
+
+# Card column: source path of the babysitter's .values() row.
+SOURCES = {
+    'username': 'user_bbs__username',
+    'first_name': 'user_bbs__first_name',
+    'last_name': 'user_bbs__last_name',
+    'picture': 'user_bbs__picture',
+    'reputation': 'user_bbs__reputation',
+    'lat': 'user_bbs__lat',
+    'long': 'user_bbs__long',
+    'cost_of_service': 'cost_of_service',
+}
+
+# User columns copied to the card.
+USER_FIELDS = frozenset(
+    source.split('__')[1] for source in SOURCES.values() if source.startswith('user_bbs__')
+)
+
+
+class BabysitterCardQuerySet(models.QuerySet):
+    """ Maintenance of the cards from their source tables. """
+
+    def refresh(self, user_ids):
+        """ Rebuild the cards of the users from User, Babysitter and the
+            availability bits, dropping those that aren't babysitters
+            anymore. Return the number of cards written.
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return 0
+        rows = Babysitter.objects.filter(user_bbs__in=user_ids).values(
+            'user_bbs_id', *SOURCES.values(), *availability.DAY_FIELDS
+        )
+        cards = [
+            BabysitterCard(
+                user_id=row['user_bbs_id'],
+                availability=availability.summary(row),
+                **{field: row[source] for field, source in SOURCES.items()}
+            )
+            for row in rows
+        ]
+        BabysitterCard.objects.bulk_create(
+            cards,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=[*SOURCES, 'availability', 'updated_at']
+        )
+        gone = user_ids - {card.user_id for card in cards}
+        if gone:
+            BabysitterCard.objects.filter(user__in=gone).delete()
+        return len(cards)
+
+
+class BabysitterCard(HisitterModel):
+    """ Denormalized row of the babysitters listing.
+
+        Holds what a card of the listing shows, copied from User,
+        Babysitter and the availability bits, so the listing reads a single
+        narrow table in index order. hisitter.users.signals keeps it in sync,
+        rebuild_babysitter_cards regenerates it.
+    """
+    user = models.OneToOneField(
+        User,
+        primary_key=True,
+        related_name='babysitter_card',
+        on_delete=models.CASCADE
+    )
+    username = models.CharField(_("Username"), max_length=150)
+    first_name = models.CharField(_("First name"), max_length=150, blank=True)
+    last_name = models.CharField(_("Last name"), max_length=150, blank=True)
+    picture = models.ImageField(_("Picture"), blank=True)
+    reputation = models.DecimalField(_("Reputation"), max_digits=2, decimal_places=1)
+    cost_of_service = models.DecimalField(_("Cost of service"), max_digits=6, decimal_places=2)
+    availability = models.JSONField(
+        _("Availability"),
+        default=dict,
+        help_text='Shifts of each weekday the babysitter works.'
+    )
+    lat = models.DecimalField(_("Latitude"), max_digits=10, decimal_places=6, null=True, blank=True)
+    long = models.DecimalField(_("Longitude"), max_digits=10, decimal_places=6, null=True, blank=True)
+
+    objects = BabysitterCardQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['-reputation', '-user_id']
+        indexes = [
+            models.Index(
+                fields=['-reputation', '-user'],
+                name='babysitter_card_rank_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return self.username
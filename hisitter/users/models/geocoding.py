@@ -0,0 +1,38 @@
+""" Geocode cache model. """
+
+# Django imports
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+# Utils Abstract Model
+from hisitter.utils.abstract_users import HisitterModel
+
+
+class GeocodeCache(HisitterModel):
+    """ Coordinates the geocoder returned for a normalized address, so an
+        address is only sent to the geocoder once. lat and long are None
+        when the geocoder didn't find the address.
+    """
+    address = models.CharField(
+        _("Address"),
+        max_length=255,
+        unique=True,
+        help_text='Address in lower case with single spaces.'
+    )
+    lat = models.DecimalField(
+        _("Latitude"),
+        max_digits=10,
+        decimal_places=6,
+        blank=True,
+        null=True
+    )
+    long = models.DecimalField(
+        _("Longitude"),
+        max_digits=10,
+        decimal_places=6,
+        blank=True,
+        null=True
+    )
+
+    def __str__(self):
+        return self.address
@@ -1,7 +1,7 @@
 """User model module."""
 
 # Django imports
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import RegexValidator
@@ -11,6 +11,30 @@ from django.db import models
 # Utils Abstract model
 from hisitter.utils.abstract_users import HisitterModel
 
+# Utils
+from hisitter.utils import geohash
+
+
+class UserQuerySet(models.QuerySet):
+    """ Users queries. """
+
+    def update(self, **kwargs):
+        """ Revoke the signed tokens of the users, as the pre_save signal
+            does, when the update renames them, changes their password or
+            deactivates them: queryset updates (admin actions, scripts)
+            don't send signals.
+        """
+        if kwargs.get('is_active') is False or {'username', 'password'} & kwargs.keys():
+            # Imported here, authentication imports this model.
+            from hisitter.users.authentication import revoke_user_tokens
+            for user_id in self.values_list('pk', flat=True):
+                revoke_user_tokens(user_id)
+        return super().update(**kwargs)
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    """ Django's user manager over UserQuerySet. """
+
 
 class User(AbstractUser, HisitterModel):
     """ Default user for hisitter.
@@ -70,6 +94,14 @@ class User(AbstractUser, HisitterModel):
         blank=True,
         null=True
     )
+    geohash = models.CharField(
+        _("Geohash"),
+        max_length=12,
+        blank=True,
+        default='',
+        editable=False,
+        help_text='Geohash of lat and long, kept up to date on save.'
+    )
     GENRES = [
         ('male', 'male'),
         ('female', 'female'),
@@ -80,6 +112,8 @@ class User(AbstractUser, HisitterModel):
         choices=GENRES,
         default='unspecified'
     )
+    objects = UserManager()
+
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name', 'birthdate', 'address', 'phone_number']
 
@@ -92,9 +126,32 @@ class User(AbstractUser, HisitterModel):
         """
         return reverse("users:detail", kwargs={"username": self.username})
 
+    def save(self, *args, **kwargs):
+        """ Keep the geohash in sync with the coordinates. """
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'lat', 'long'} & set(update_fields):
+            if self.lat is None or self.long is None:
+                self.geohash = ''
+            else:
+                self.geohash = geohash.encode(self.lat, self.long)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'geohash'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         """Return user's str representation."""
         return self.username + ', ' + self.email
 
     class Meta:
         ordering = ['-reputation']
+        indexes = [
+            models.Index(
+                fields=['-reputation', '-id'],
+                name='user_reputation_id_idx'
+            ),
+            # Cell range scans of the proximity search.
+            models.Index(
+                fields=['geohash'],
+                name='user_geohash_idx'
+            ),
+        ]
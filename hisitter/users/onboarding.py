@@ -0,0 +1,185 @@
+""" Bulk onboarding of the babysitters of partner agencies.
+
+    import_babysitters() reads the records of a CSV or JSONL file in
+    chunks. The rows of a chunk are validated with
+    BabysitterImportSerializer, and their emails and usernames are checked
+    against the database in one query. Their passwords are hashed in a
+    process pool. The users, babysitters and availabilities are then
+    written with one bulk_create each, in one transaction per chunk. Rows
+    that fail are reported with their line and left out, the others are
+    imported.
+"""
+
+# Python
+import csv
+import json
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+# Django imports
+import django
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Q
+
+# Models
+from hisitter.users.models import Availability, Babysitter, BabysitterCard, User
+
+# Serializers
+from hisitter.users.serializers import BabysitterImportSerializer
+
+# Availability bits
+from hisitter.users import availability, free_slots
+
+# Celery task
+from hisitter.outbox.tasks import enqueue_many
+from hisitter.users.tasks import geocode_user, send_confirmation_email
+
+# CSV columns nested under user_bbs.
+BABYSITTER_COLUMNS = ('education_degree', 'about_me', 'cost_of_service')
+
+
+def read_records(path, format=None):
+    """ Yield (line, record) pairs of a CSV or JSONL file, the format is
+        taken from the extension unless given. The records have the shape
+        of the signup payload. A JSONL line that isn't valid JSON yields a
+        None record.
+
+        CSV files have a column per user field, the BABYSITTER_COLUMNS, and
+        an availability column of "day shift" pairs separated by ";",
+        e.g. "Monday morning; Friday night". Empty cells are left out.
+    """
+    format = format or str(path).rsplit('.', 1)[-1].lower()
+    with open(path, newline='', encoding='utf-8') as records:
+        if format == 'jsonl':
+            for line, text in enumerate(records, start=1):
+                if not text.strip():
+                    continue
+                try:
+                    yield line, json.loads(text)
+                except json.JSONDecodeError:
+                    yield line, None
+        elif format == 'csv':
+            reader = csv.DictReader(records)
+            for row in reader:
+                yield reader.line_num, record_from_row(row)
+        else:
+            raise ValueError(f'Unknown format: {format}')
+
+
+def record_from_row(row):
+    record = {column: value for column, value in row.items() if column and value}
+    record['user_bbs'] = {
+        column: record.pop(column) for column in BABYSITTER_COLUMNS if column in record
+    }
+    pairs = record.pop('availability', '')
+    record['availability'] = [
+        dict(zip(('day', 'shift'), pair.split())) for pair in pairs.split(';') if pair.strip()
+    ]
+    return record
+
+
+def import_babysitters(records, chunk_size=500, workers=None):
+    """ Import the (line, record) pairs. Return the number of babysitters
+        created and the [(line, errors)] of the rows left out. workers is
+        the size of the password hashing pool, 1 hashes in this process.
+    """
+    pool = None if workers == 1 else ProcessPoolExecutor(workers, initializer=django.setup)
+    created, errors = 0, []
+    try:
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            created += import_chunk(chunk, pool, errors)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return created, errors
+
+
+def import_chunk(chunk, pool, errors):
+    """ Write the valid rows of the chunk, appending the others to errors.
+        Return the number of babysitters created.
+    """
+    valid = []
+    for line, record in chunk:
+        if record is None:
+            errors.append((line, {'non_field_errors': ['Invalid JSON']}))
+            continue
+        serializer = BabysitterImportSerializer(data=record)
+        if not serializer.is_valid():
+            errors.append((line, serializer.errors))
+            continue
+        data = serializer.validated_data
+        # As create_user() does.
+        data['email'] = User.objects.normalize_email(data['email'])
+        data['username'] = User.normalize_username(data['username'])
+        valid.append((line, data))
+    taken = set()
+    for email, username in User.objects.filter(
+        Q(email__in=[data['email'] for _, data in valid])
+        | Q(username__in=[data['username'] for _, data in valid])
+    ).values_list('email', 'username'):
+        taken |= {('email', email), ('username', username)}
+    accepted = []
+    for line, data in valid:
+        keys = {('email', data['email']), ('username', data['username'])}
+        if keys & taken:
+            errors.append((line, {
+                field: [f'A user with that {field} already exists'] for field, _ in keys & taken
+            }))
+            continue
+        # Also rejects the repeated rows of the chunk.
+        taken |= keys
+        accepted.append(data)
+    if not accepted:
+        return 0
+    passwords = [data.pop('password') for data in accepted]
+    hashes = pool.map(make_password, passwords, chunksize=16) if pool else map(make_password, passwords)
+    for data, password in zip(accepted, hashes):
+        data['password'] = password
+    write(accepted)
+    return len(accepted)
+
+
+def write(accepted):
+    """ Create the users, babysitters and availabilities of the validated
+        rows. bulk_create() skips the signals, so the availability bits,
+        the cards and the free slot caches are kept here.
+    """
+    with transaction.atomic():
+        users = User.objects.bulk_create(
+            User(
+                is_verified=False,
+                **{
+                    field: value for field, value in data.items()
+                    if field not in ('user_bbs', 'availability')
+                }
+            )
+            for data in accepted
+        )
+        babysitters, shifts = [], []
+        for user, data in zip(users, accepted):
+            pairs = [(shift['day'], shift['shift']) for shift in data.get('availability', [])]
+            babysitters.append(Babysitter(
+                user_bbs=user, **data['user_bbs'], **availability.week_from_shifts(pairs)
+            ))
+            shifts.append(pairs)
+        # The free slots of every (weekday, shift) some babysitter works.
+        free_slots.invalidate_changed_availability({}, availability.week_from_shifts(
+            pair for pairs in shifts for pair in pairs
+        ))
+        Babysitter.objects.bulk_create(babysitters)
+        Availability.objects.bulk_create(
+            Availability(bbs=babysitter, day=day, shift=shift)
+            for babysitter, pairs in zip(babysitters, shifts)
+            for day, shift in pairs
+        )
+        BabysitterCard.objects.refresh(user.pk for user in users)
+        enqueue_many(send_confirmation_email, [
+            {'username': user.username, 'email': user.email} for user in users
+        ])
+        enqueue_many(geocode_user, [
+            {'user_id': user.pk, 'address': user.address} for user in users
+        ])
@@ -3,9 +3,6 @@
 #Django REST
 from rest_framework.permissions import BasePermission
 
-# Models
-from hisitter.users.models import User
-
 
 class IsAccountOwner(BasePermission):
     """Allow access only to objects owned by the requesting user."""
@@ -25,12 +22,7 @@ class IsClient(BasePermission):
     """ Allow retrieve the babysitters only if the request user is a client."""
 
     def has_permission(self, request, view):
-        """ Check if the user is a babysitter. """
-        user = request.user
-        try:
-            user.user_client
-            return True
-        except Exception:
-            return False
+        """ Check if the user is a client. """
+        return request.roles.is_client
 
         
\ No newline at end of file
@@ -0,0 +1,34 @@
+""" Read-through cache of the babysitter_data payloads.
+
+    The owner and the public payloads of a babysitter share a version,
+    bumped by the signals of the models they are built from.
+"""
+
+# Utils
+from hisitter.utils.cache import bump_version, get_versions, read_through
+
+TIMEOUT = 15 * 60
+GRACE = 5 * 60
+
+
+def version_key(username):
+    return f'babysitter-profile:version:{username}'
+
+
+def get_profile(username, owner, compute):
+    """ Return the cached payload, calling compute() to build it on a miss. """
+    key = version_key(username)
+    version = get_versions([key], TIMEOUT + GRACE)[key]
+    variant = 'owner' if owner else 'public'
+    return read_through(
+        f'babysitter-profile:{username}:{variant}:{version}',
+        compute,
+        TIMEOUT,
+        GRACE
+    )
+
+
+def invalidate_profiles(usernames):
+    """ Forget the payloads of the users once the current transaction commits. """
+    for username in usernames:
+        bump_version(version_key(username), TIMEOUT + GRACE)
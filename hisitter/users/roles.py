@@ -0,0 +1,93 @@
+""" Client and Babysitter identities of the request's user.
+
+    RolesMiddleware sets request.roles, read by the permission classes and
+    the views instead of touching user.user_client / user.user_bbs. The
+    identities are read on first use with a single query joining both
+    tables, and reused for the rest of the request.
+"""
+
+# Django imports
+from django.utils.functional import cached_property
+
+# Models
+from hisitter.users.models import Babysitter, Client, User
+
+
+class Roles:
+    """ The roles of a user, resolved lazily. """
+
+    def __init__(self, user):
+        self.user = user
+
+    @cached_property
+    def ids(self):
+        """ Return (client id, babysitter id), None for a missing role. """
+        if not self.user.is_authenticated:
+            return None, None
+        ids = User.objects.filter(pk=self.user.pk).values_list('user_client', 'user_bbs').first()
+        return ids or (None, None)
+
+    @property
+    def client_id(self):
+        return self.ids[0]
+
+    @property
+    def babysitter_id(self):
+        return self.ids[1]
+
+    @property
+    def is_client(self):
+        return self.client_id is not None
+
+    @property
+    def is_babysitter(self):
+        return self.babysitter_id is not None
+
+    @cached_property
+    def client(self):
+        """ The user's Client, only its keys are loaded. """
+        if not self.is_client:
+            return None
+        return Client.from_db(None, ['id', 'user_client_id'], [self.client_id, self.user.pk])
+
+    @cached_property
+    def babysitter(self):
+        """ The user's Babysitter, only its keys are loaded. """
+        if not self.is_babysitter:
+            return None
+        return Babysitter.from_db(None, ['id', 'user_bbs_id'], [self.babysitter_id, self.user.pk])
+
+    def is_client_of(self, service):
+        return self.is_client and service.user_client_id == self.client_id
+
+    def is_babysitter_of(self, service):
+        return self.is_babysitter and service.user_bbs_id == self.babysitter_id
+
+    def participates_in(self, service):
+        return self.is_client_of(service) or self.is_babysitter_of(service)
+
+
+class RolesMiddleware:
+    """ Set request.roles.
+
+        Resolution waits for the first access, after Django REST Framework
+        authenticated the request and set its user.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.roles = LazyRoles(request)
+        return self.get_response(request)
+
+
+class LazyRoles(Roles):
+    """ Roles of request.user as it is when first read. """
+
+    def __init__(self, request):
+        self.request = request
+
+    @cached_property
+    def user(self):
+        return self.request.user
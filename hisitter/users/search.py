@@ -0,0 +1,63 @@
+""" Proximity search of babysitters. """
+
+# Python
+import heapq
+
+# Django imports
+from django.db.models import Q
+
+# Models
+from hisitter.users.models import Babysitter, User
+
+# Utils
+from hisitter.utils.geohash import bounding_box, cell_ranges, covering_cells, haversine
+
+
+def nearby_babysitters(
+    lat,
+    long,
+    radius,
+    columns,
+    date=None,
+    shift=None,
+    min_cost=None,
+    max_cost=None,
+    min_reputation=None,
+    limit=20):
+    """ Return the `limit` closest babysitters within `radius` km of the
+        point as (distance, row) pairs, row holding the .values() columns.
+
+        The geohash cells covering the circle prune the candidates with
+        range scans of user_geohash_idx, the rest of the filters run
+        in the same query and the candidates are ranked by their exact
+        haversine distance.
+    """
+    in_cells = Q()
+    for low, high in cell_ranges(covering_cells(lat, long, radius)):
+        if high is None:
+            in_cells |= Q(geohash__gte=low)
+        else:
+            in_cells |= Q(geohash__gte=low, geohash__lt=high)
+    # The cells overshoot the circle, the box trims them before the rows
+    # leave the database.
+    min_lat, min_long, max_lat, max_long = bounding_box(lat, long, radius)
+    in_box = Q(lat__gte=min_lat, lat__lte=max_lat)
+    if min_long >= -180 and max_long <= 180:
+        in_box &= Q(long__gte=min_long, long__lte=max_long)
+    users = User.objects.filter(in_cells, in_box, user_bbs__isnull=False)
+    if shift is not None:
+        users = users.filter(user_bbs__in=Babysitter.objects.available_at(date, shift))
+    if min_cost is not None:
+        users = users.filter(user_bbs__cost_of_service__gte=min_cost)
+    if max_cost is not None:
+        users = users.filter(user_bbs__cost_of_service__lte=max_cost)
+    if min_reputation is not None:
+        users = users.filter(reputation__gte=min_reputation)
+    # Ranked below, an ORDER BY would only steer the planner off the cells.
+    rows = users.order_by().values(*dict.fromkeys([*columns, 'lat', 'long']))
+    candidates = []
+    for row in rows.iterator(chunk_size=2000):
+        distance = haversine(lat, long, row['lat'], row['long'])
+        if distance <= radius:
+            candidates.append((distance, row))
+    return heapq.nsmallest(limit, candidates, key=lambda candidate: candidate[0])
@@ -4,7 +4,10 @@
 from rest_framework import serializers
 
 # Models
-from hisitter.users.models import Babysitter
+from hisitter.users.models import Babysitter, BabysitterCard, Availability, User
+
+# Utils
+from hisitter.utils.values_serializers import ValuesSerializer
 
 
 
@@ -32,6 +35,62 @@ class AvailabilitySerializer(serializers.Serializer):
         ]
     )
 
+class FreeSlotSerializer(serializers.Serializer):
+    """ Query parameters of the free babysitters of a slot. """
+    date = serializers.DateField()
+    shift = serializers.ChoiceField(
+        choices=[
+            ('morning', 'morning'),
+            ('afternoon', 'afternoon'),
+            ('evening', 'evening'),
+            ('night', 'night')
+        ]
+    )
+
+
+class BabysitterSearchSerializer(serializers.Serializer):
+    """ Query parameters of the proximity search, radius in km. """
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    long = serializers.FloatField(min_value=-180, max_value=180)
+    radius = serializers.FloatField(min_value=0.1, max_value=100, default=10)
+    date = serializers.DateField(required=False)
+    shift = serializers.ChoiceField(
+        choices=[
+            ('morning', 'morning'),
+            ('afternoon', 'afternoon'),
+            ('evening', 'evening'),
+            ('night', 'night')
+        ],
+        required=False
+    )
+    min_cost = serializers.DecimalField(max_digits=6, decimal_places=2, required=False)
+    max_cost = serializers.DecimalField(max_digits=6, decimal_places=2, required=False)
+    min_reputation = serializers.DecimalField(max_digits=2, decimal_places=1, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+    def validate(self, data):
+        """ A shift is searched on a date. """
+        if ('date' in data) != ('shift' in data):
+            raise serializers.ValidationError('date and shift must be sent together.')
+        return data
+
+# User columns read by BabysitterFullNameSerializer and ClientFullNameSerializer.
+FULL_NAME_FIELDS = (
+    'first_name',
+    'last_name',
+    'username',
+    'email',
+    'phone_number',
+    'reputation',
+    'birthdate',
+    'genre',
+    'address',
+    'lat',
+    'long',
+    'picture'
+)
+
+
 class BabysitterFullNameSerializer(serializers.BaseSerializer):
     """ Return the first and last name for a babysitter."""
     def to_representation(self, instance):
@@ -105,4 +164,132 @@ class BabysitterPublicSerializer(serializers.BaseSerializer):
         else:
             data['picture'] = None
 
-        return data
\ No newline at end of file
+        return data
+
+
+class AvailabilityValuesSerializer(ValuesSerializer):
+    """ AvailabilitySerializer built from .values() rows. """
+    serializer_class = AvailabilitySerializer
+
+
+class BabysitterValuesSerializer(ValuesSerializer):
+    """ BabysitterModelSerializer built from .values() rows. """
+    serializer_class = BabysitterModelSerializer
+    many = {'availabilities': (AvailabilityValuesSerializer, Availability, 'bbs')}
+    null_column = 'id'
+
+
+class FullNameValuesSerializer(ValuesSerializer):
+    """ BabysitterFullNameSerializer and ClientFullNameSerializer
+        built from .values() rows of the user.
+    """
+
+    def build_plan(self):
+        self.picture_storage = User._meta.get_field('picture').storage
+        return []
+
+    def get_columns(self):
+        return [self.prefix + name for name in FULL_NAME_FIELDS]
+
+    def to_representation(self, row):
+        prefix = self.prefix
+        data = {
+            'fullname': row[prefix + 'first_name'] + ' ' + row[prefix + 'last_name'],
+            'username': row[prefix + 'username'],
+            'email': row[prefix + 'email'],
+            'phone_number': row[prefix + 'phone_number'],
+            'reputation': row[prefix + 'reputation'],
+            'birthdate': row[prefix + 'birthdate'],
+            'genre': row[prefix + 'genre'],
+            'address': row[prefix + 'address'],
+            'lat': row[prefix + 'lat'],
+            'long': row[prefix + 'long']
+        }
+        if row[prefix + 'picture']:
+            data['picture'] = self.picture_storage.url(row[prefix + 'picture'])
+        return data
+
+
+class BabysitterPublicValuesSerializer(ValuesSerializer):
+    """ BabysitterPublicSerializer built from .values() rows of the user. """
+    columns = (
+        'username',
+        'first_name',
+        'last_name',
+        'reputation',
+        'genre',
+        'picture',
+        'user_bbs__id',
+        'user_bbs__education_degree',
+        'user_bbs__about_me',
+        'user_bbs__cost_of_service'
+    )
+
+    def build_plan(self):
+        self.picture_storage = User._meta.get_field('picture').storage
+        self.availabilities = {}
+        return []
+
+    def get_columns(self):
+        return [self.prefix + name for name in self.columns]
+
+    def prefetch(self, rows):
+        ids = {row[self.prefix + 'user_bbs__id'] for row in rows} - {None}
+        self.availabilities = {}
+        if not ids:
+            return
+        availabilities = Availability.objects.filter(
+            bbs__in=ids
+        ).order_by('pk').values_list('bbs', 'day', 'shift')
+        for bbs, day, shift in availabilities:
+            self.availabilities.setdefault(bbs, []).append({'day': day, 'shift': shift})
+
+    def to_representation(self, row):
+        prefix = self.prefix
+        bbs_data = None
+        bbs_id = row[prefix + 'user_bbs__id']
+        if bbs_id is not None:
+            bbs_data = {
+                'education_degree': row[prefix + 'user_bbs__education_degree'],
+                'about_me': row[prefix + 'user_bbs__about_me'],
+                'cost_of_service': str(row[prefix + 'user_bbs__cost_of_service']),
+                'availabilities': self.availabilities.get(bbs_id, [])
+            }
+        first_name, last_name = row[prefix + 'first_name'], row[prefix + 'last_name']
+        data = {
+            'username': row[prefix + 'username'],
+            'first_name': first_name,
+            'last_name': last_name,
+            'fullname': f"{first_name} {last_name}",
+            'reputation': str(row[prefix + 'reputation']),
+            'genre': row[prefix + 'genre'],
+            'user_bbs': bbs_data
+        }
+        picture = row[prefix + 'picture']
+        data['picture'] = self.picture_storage.url(picture) if picture else None
+        return data
+
+
+class BabysitterCardSerializer(serializers.ModelSerializer):
+    """ Card of the babysitters listing. """
+
+    class Meta:
+        """ Meta class."""
+        model = BabysitterCard
+        fields = (
+            'username',
+            'first_name',
+            'last_name',
+            'picture',
+            'reputation',
+            'cost_of_service',
+            'availability',
+            'lat',
+            'long'
+        )
+        read_only_fields = fields
+
+
+class BabysitterCardValuesSerializer(ValuesSerializer):
+    """ BabysitterCardSerializer built from .values() rows. """
+    serializer_class = BabysitterCardSerializer
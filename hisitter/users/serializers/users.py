@@ -19,16 +19,28 @@ from rest_framework.validators import UniqueValidator
 from hisitter.users.models import User, Babysitter, Client, Availability
 from .babysitters import (
     BabysitterModelSerializer,
-    AvailabilitySerializer
+    AvailabilitySerializer,
+    BabysitterValuesSerializer
+)
+
+# Signed tokens
+from hisitter.users.authentication import (
+    REFRESH,
+    decode_token,
+    issue_tokens,
+    revoke_token
 )
 
 # Celery task
-from hisitter.users.tasks import send_confirmation_email
+from hisitter.outbox.tasks import enqueue
+from hisitter.users.tasks import geocode_user, send_confirmation_email
+
+# Sparse fieldsets
+from hisitter.utils.sparse_fields import SparseFieldsetSerializerMixin
+from hisitter.utils.values_serializers import ValuesSerializer
 
 # Utils
 import jwt
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut, GeocoderServiceError
 
 
 class ClientFullNameSerializer(serializers.BaseSerializer):
@@ -54,7 +66,7 @@ class ClientFullNameSerializer(serializers.BaseSerializer):
         return client_json
 
 
-class UserModelSerializer(serializers.ModelSerializer):
+class UserModelSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """ User model Serializer."""
     user_bbs = BabysitterModelSerializer(read_only=True, required=False)
     
@@ -82,6 +94,12 @@ class UserModelSerializer(serializers.ModelSerializer):
         )
 
 
+class UserValuesSerializer(ValuesSerializer):
+    """ UserModelSerializer built from .values() rows. """
+    serializer_class = UserModelSerializer
+    nested = {'user_bbs': (BabysitterValuesSerializer, 'user_bbs')}
+
+
 class UserSignupSerializer(serializers.Serializer):
     """ User signup Serializer.
         Handle sign up data validation and user/type user creation.
@@ -121,15 +139,6 @@ class UserSignupSerializer(serializers.Serializer):
         if passwd != passwd_conf:
             raise serializers.ValidationError("Passwords don't match.")
         password_validation.validate_password(passwd)
-        # Geocode address (graceful fallback if service unavailable)
-        try:
-            geolocator = Nominatim(user_agent="hisitter-app", timeout=10)
-            location = geolocator.geocode(data['address'])
-            if location:
-                data['lat'], data['long'] = location.latitude, location.longitude
-        except (GeocoderTimedOut, GeocoderServiceError) as e:
-            logging.warning(f"Geocoding failed for address: {e}")
-            # Continue without coordinates - can be updated later
         return data
 
     def validate_availability(self, value):
@@ -156,18 +165,39 @@ class UserSignupSerializer(serializers.Serializer):
             user = User.objects.create_user(**data, is_verified=False)
             if babysitter:
                 bbs = Babysitter.objects.create(user_bbs=user, **babysitter)
-                for shift in availability:
-                    Availability.objects.create(bbs=bbs, **shift)
+                Availability.objects.bulk_create(
+                    Availability(bbs=bbs, **shift) for shift in availability
+                )
+                # bulk_create() doesn't send the signals that keep the bits.
+                Babysitter.objects.filter(pk=bbs.pk).refresh_availability()
         except KeyError:
             logging.info('This is a instance client')
             user = User.objects.create_user(**data, is_verified=False)
             logging.info(f'User created, whit pk {user.pk}')
             client = Client.objects.create(user_client=user)
         logging.info(f'User pk is already to pass {user.pk}')
-        send_confirmation_email.delay(username=user.username, email=user.email )
+        enqueue(send_confirmation_email, username=user.username, email=user.email)
+        # The coordinates are filled by a worker once the signup commits.
+        enqueue(geocode_user, user_id=user.pk, address=user.address)
         return user
 
 
+class BabysitterImportSerializer(UserSignupSerializer):
+    """ One babysitter of an agency import (see hisitter.users.onboarding).
+        There is no password confirmation, and the email and username are
+        checked against the database once per chunk instead of per row.
+    """
+    email = serializers.EmailField()
+    username = serializers.CharField(min_length=4, max_length=20)
+    password_confirmation = None
+    user_bbs = BabysitterModelSerializer()
+
+    def validate(self, data):
+        """Validate the password."""
+        password_validation.validate_password(data['password'])
+        return data
+
+
 class AccountVerificationSerializer(serializers.Serializer):
     """ Account verification serializer."""
     token = serializers.CharField()
@@ -214,3 +244,50 @@ class UserLoginSerializer(serializers.Serializer):
         """ Generate or retrieve new token."""
         token, created = Token.objects.get_or_create(user=self.context['user'])
         return self.context['user'], token.key
+
+
+class TokenRefreshSerializer(serializers.Serializer):
+    """ Exchange a refresh token for a new access/refresh pair.
+        Refresh tokens are rotated, each one can be used once.
+    """
+    refresh = serializers.CharField()
+
+    def validate_refresh(self, data):
+        """ Check the token and that its user can still log in."""
+        if not settings.JWT_AUTH_ENABLED:
+            raise serializers.ValidationError('Signed tokens are disabled')
+        payload = decode_token(data, REFRESH)
+        user = User.objects.filter(pk=payload['sub'], is_active=True).first()
+        if user is None:
+            raise serializers.ValidationError('Invalid token')
+        self.context['payload'] = payload
+        self.context['user'] = user
+        return data
+
+    def create(self, data):
+        """ Revoke the refresh token and issue a new pair."""
+        revoke_token(self.context['payload'])
+        return issue_tokens(self.context['user'])
+
+
+class LogoutSerializer(serializers.Serializer):
+    """ Revoke the token of the request and, optionally, a refresh token
+        of the same user.
+    """
+    refresh = serializers.CharField(required=False)
+
+    def validate_refresh(self, data):
+        payload = decode_token(data, REFRESH)
+        if payload['sub'] != str(self.context['request'].user.pk):
+            raise serializers.ValidationError('Invalid token')
+        self.context['refresh_payload'] = payload
+        return data
+
+    def save(self):
+        auth = self.context['request'].auth
+        if isinstance(auth, dict):
+            revoke_token(auth)
+        elif isinstance(auth, Token):
+            auth.delete()
+        if 'refresh_payload' in self.context:
+            revoke_token(self.context['refresh_payload'])
@@ -0,0 +1,98 @@
+""" Users signals. """
+
+# Django imports
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+# Models
+from hisitter.users.models import Availability, Babysitter, BabysitterCard, User
+from hisitter.users.models.cards import USER_FIELDS
+
+# Cache
+from hisitter.users import profile_cache
+
+# Signed tokens
+from hisitter.users.authentication import revoke_user_tokens
+
+# Celery task
+from hisitter.outbox.tasks import enqueue
+from hisitter.users.tasks import geocode_user
+
+
+@receiver(post_save, sender=Availability)
+@receiver(post_delete, sender=Availability)
+def refresh_babysitter_availability(sender, instance, **kwargs):
+    """ Rebuild the availability bits of the babysitter of the row, which
+        also updates its card and invalidates its cached profile when they
+        change.
+
+        bulk_create() and queryset updates don't send signals, callers
+        using them refresh with Babysitter.objects.refresh_availability().
+    """
+    Babysitter.objects.filter(pk=instance.bbs_id).refresh_availability()
+
+
+@receiver(pre_save, sender=User)
+def compare_with_stored_user(sender, instance, update_fields=None, **kwargs):
+    """ Forget the profile cached under the old username of a renamed user,
+        revoke the signed tokens of a user who was renamed, whose password
+        changed or who was deactivated, and geocode a new address unless
+        the coordinates were changed with it.
+    """
+    watched = {'username', 'password', 'is_active', 'address'}
+    if instance.pk is None or (update_fields is not None and not watched & set(update_fields)):
+        return
+    stored = User.objects.filter(pk=instance.pk).values(
+        'username', 'password', 'is_active', 'address', 'lat', 'long'
+    ).first()
+    if stored is None:
+        return
+    if stored['address'] != instance.address and (stored['lat'], stored['long']) == (instance.lat, instance.long):
+        enqueue(geocode_user, user_id=instance.pk, address=instance.address)
+    if stored['username'] != instance.username:
+        profile_cache.invalidate_profiles([stored['username']])
+    # Signed tokens carry the username, the owner checks compare it.
+    if (
+        stored['username'] != instance.username
+        or stored['password'] != instance.password
+        or (stored['is_active'] and not instance.is_active)
+    ):
+        revoke_user_tokens(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_profile(sender, instance, update_fields=None, **kwargs):
+    """ Forget the cached profile of the user, logins only touch last_login. """
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    profile_cache.invalidate_profiles([instance.username])
+
+
+@receiver(post_save, sender=User)
+def refresh_user_card(sender, instance, created, update_fields=None, **kwargs):
+    """ Copy the changes of a babysitter's user to its card. A new user
+        isn't a babysitter yet, deleting it cascades to the card, saves
+        that don't touch the card's columns are skipped and clients,
+        which have no card, only pay for the lookup.
+    """
+    if created or (update_fields is not None and not USER_FIELDS & set(update_fields)):
+        return
+    if BabysitterCard.objects.filter(user=instance.pk).exists():
+        BabysitterCard.objects.refresh([instance.pk])
+
+
+@receiver(post_save, sender=Babysitter)
+@receiver(post_delete, sender=Babysitter)
+def invalidate_babysitter_profile(sender, instance, **kwargs):
+    """ Forget the cached profile of the babysitter's user. """
+    profile_cache.invalidate_profiles(
+        User.objects.filter(pk=instance.user_bbs_id).values_list('username', flat=True)
+    )
+
+
+@receiver(post_save, sender=Babysitter)
+@receiver(post_delete, sender=Babysitter)
+def refresh_babysitter_card(sender, instance, **kwargs):
+    """ Create, update or drop the card of the babysitter. """
+    BabysitterCard.objects.refresh([instance.user_bbs_id])
@@ -12,6 +12,9 @@ from celery import shared_task
 # Models
 from hisitter.users.models import User
 
+# Geocoding
+from hisitter.users import geocoding
+
 # Utilities
 import jwt
 from datetime import timedelta
@@ -47,3 +50,17 @@ def send_confirmation_email(username, email):
     )
     msg.attach_alternative(content, "text/html")
     msg.send()
+
+
+@shared_task(name='geocode_user')
+def geocode_user(user_id, address):
+    """ Fill the coordinates of the user from its address, unless the
+        address changed since the task was queued. A geocoder failure
+        raises, and the outbox retries the message.
+    """
+    coordinates = geocoding.geocode(address) or (None, None)
+    user = User.objects.filter(pk=user_id, address=address).first()
+    if user is None or (user.lat, user.long) == coordinates:
+        return
+    user.lat, user.long = coordinates
+    user.save(update_fields=['lat', 'long', 'updated_at'])
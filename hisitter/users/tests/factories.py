@@ -1,9 +1,11 @@
 from typing import Any, Sequence
 
 from django.contrib.auth import get_user_model
-from factory import Faker, post_generation
+from factory import Faker, SubFactory, post_generation
 from factory.django import DjangoModelFactory
 
+from hisitter.users.models import Babysitter, Client
+
 
 class UserFactory(DjangoModelFactory):
 
@@ -24,3 +26,22 @@ class UserFactory(DjangoModelFactory):
         model = get_user_model()
         django_get_or_create = ["username"]
         skip_postgeneration_save = True
+
+
+class ClientFactory(DjangoModelFactory):
+
+    user_client = SubFactory(UserFactory)
+
+    class Meta:
+        model = Client
+
+
+class BabysitterFactory(DjangoModelFactory):
+
+    user_bbs = SubFactory(UserFactory)
+    education_degree = "Early Childhood Education"
+    about_me = Faker("sentence")
+    cost_of_service = "25.00"
+
+    class Meta:
+        model = Babysitter
@@ -0,0 +1,61 @@
+import datetime
+
+import pytest
+
+from hisitter.users.availability import hours_mask, shift_mask
+from hisitter.users.models import Availability, Babysitter
+from hisitter.users.tests.factories import BabysitterFactory
+
+pytestmark = pytest.mark.django_db
+
+MONDAY = datetime.date(2030, 1, 7)
+
+
+def test_availability_rows_set_the_bits():
+    babysitter = BabysitterFactory()
+    Availability.objects.create(bbs=babysitter, day="Monday", shift="morning")
+    Availability.objects.create(bbs=babysitter, day="Monday", shift="night")
+    Availability.objects.create(bbs=babysitter, day="Sunday", shift="evening")
+
+    babysitter.refresh_from_db()
+
+    assert babysitter.availability_monday == shift_mask("morning") | shift_mask("night")
+    assert babysitter.availability_sunday == hours_mask(range(18, 24))
+    assert babysitter.availability_tuesday == 0
+    assert babysitter.is_available(MONDAY, "morning")
+    assert babysitter.is_available("Monday", hours=[7, 8])
+    assert not babysitter.is_available(MONDAY, "afternoon")
+    assert not babysitter.is_available(MONDAY, hours=[11, 12])
+
+
+def test_deleting_a_row_clears_its_bits():
+    babysitter = BabysitterFactory()
+    availability = Availability.objects.create(bbs=babysitter, day="Monday", shift="morning")
+    Availability.objects.create(bbs=babysitter, day="Monday", shift="afternoon")
+
+    availability.delete()
+    babysitter.refresh_from_db()
+
+    assert babysitter.availability_monday == shift_mask("afternoon")
+
+
+def test_available_at_filters_with_the_bits():
+    morning, afternoon, nobody = BabysitterFactory.create_batch(3)
+    Availability.objects.create(bbs=morning, day="Monday", shift="morning")
+    Availability.objects.create(bbs=afternoon, day="Monday", shift="afternoon")
+    Availability.objects.create(bbs=afternoon, day="Tuesday", shift="morning")
+
+    assert list(Babysitter.objects.available_at(MONDAY, "morning")) == [morning]
+    assert list(Babysitter.objects.available_at(0, hours=[12, 13])) == [afternoon]
+    assert not Babysitter.objects.available_at("Monday", hours=[11, 12]).exists()
+
+
+def test_refresh_availability_after_bulk_create():
+    babysitter = BabysitterFactory()
+    Availability.objects.bulk_create([
+        Availability(bbs=babysitter, day="Friday", shift="evening"),
+    ])
+
+    assert Babysitter.objects.filter(pk=babysitter.pk).refresh_availability() == 1
+    babysitter.refresh_from_db()
+    assert babysitter.is_available("Friday", "evening")
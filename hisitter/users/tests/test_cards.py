@@ -0,0 +1,88 @@
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from hisitter.users.models import Availability, BabysitterCard
+from hisitter.users.tests.factories import BabysitterFactory, ClientFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_cards_follow_their_sources():
+    babysitter = BabysitterFactory(cost_of_service="30.00")
+    user = babysitter.user_bbs
+    card = BabysitterCard.objects.get(user=user)
+    assert card.username == user.username
+    assert card.cost_of_service == Decimal("30.00")
+    assert card.availability == {}
+
+    Availability.objects.create(bbs=babysitter, day="Monday", shift="morning")
+    Availability.objects.create(bbs=babysitter, day="Monday", shift="evening")
+    user.first_name = "Renamed"
+    user.save()
+
+    card.refresh_from_db()
+    assert card.first_name == "Renamed"
+    assert card.availability == {"Monday": ["morning", "evening"]}
+
+    babysitter.delete()
+    assert not BabysitterCard.objects.filter(user=user).exists()
+
+
+def test_clients_have_no_card():
+    ClientFactory()
+    assert not BabysitterCard.objects.exists()
+
+
+def test_only_card_changes_of_babysitters_refresh_the_card():
+    client_user = ClientFactory().user_client
+    babysitter_user = BabysitterFactory().user_bbs
+    with mock.patch.object(BabysitterCard.objects, "refresh") as refresh:
+        client_user.first_name = "Client"
+        client_user.save()
+        babysitter_user.is_verified = True
+        babysitter_user.save(update_fields=["is_verified"])
+        refresh.assert_not_called()
+
+        babysitter_user.first_name = "Sitter"
+        babysitter_user.save()
+        refresh.assert_called_once_with([babysitter_user.pk])
+
+
+def test_cards_listing_reads_one_table(api_client):
+    for reputation in ("3.0", "5.0", "4.0"):
+        user = BabysitterFactory().user_bbs
+        user.reputation = reputation
+        user.save()
+
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(reverse("users:users-cards"), {"pagination": "cursor"})
+
+    assert response.status_code == 200
+    assert [card["reputation"] for card in response.data["results"]] == ["5.0", "4.0", "3.0"]
+    queries = [query["sql"] for query in context.captured_queries if query["sql"].startswith("SELECT")]
+    assert len(queries) == 1
+    assert "JOIN" not in queries[0]
+
+
+def test_rebuild_command_regenerates_the_cards():
+    kept, dropped = BabysitterFactory.create_batch(2)
+    BabysitterCard.objects.filter(user=kept.user_bbs).update(first_name="Stale")
+    BabysitterCard.objects.filter(user=dropped.user_bbs).delete()
+    orphan = ClientFactory().user_client
+    BabysitterCard.objects.create(
+        user=orphan, username=orphan.username, reputation="5.0", cost_of_service="1.00"
+    )
+
+    call_command("rebuild_babysitter_cards", batch_size=1)
+
+    cards = dict(BabysitterCard.objects.values_list("user", "first_name"))
+    assert cards == {
+        kept.user_bbs_id: kept.user_bbs.first_name,
+        dropped.user_bbs_id: dropped.user_bbs.first_name,
+    }
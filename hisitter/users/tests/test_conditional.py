@@ -0,0 +1,66 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from hisitter.users.models import Availability
+from hisitter.users.tests.factories import BabysitterFactory, ClientFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def babysitter():
+    return BabysitterFactory()
+
+
+@pytest.fixture
+def owner_client(babysitter):
+    api_client = APIClient()
+    api_client.force_authenticate(babysitter.user_bbs)
+    return api_client
+
+
+def test_retrieve_answers_304_until_the_availability_changes(owner_client, babysitter):
+    url = reverse("users:users-detail", args=[babysitter.user_bbs.username])
+    response = owner_client.get(url)
+    assert response.status_code == 200
+
+    not_modified = owner_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert not_modified.status_code == 304
+    assert not not_modified.content
+
+    Availability.objects.create(bbs=babysitter, day="Monday", shift="morning")
+    assert owner_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code == 200
+
+
+def test_babysitter_data_revalidates_from_the_cache(
+        django_capture_on_commit_callbacks, babysitter):
+    api_client = APIClient()
+    api_client.force_authenticate(ClientFactory().user_client)
+    url = reverse("users:users-babysitter-data", args=[babysitter.user_bbs.username])
+    response = api_client.get(url)
+
+    with CaptureQueriesContext(connection) as context:
+        not_modified = api_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert not_modified.status_code == 304
+    assert not any(query["sql"].startswith("SELECT") for query in context.captured_queries)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        babysitter.about_me = "Updated"
+        babysitter.save()
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code == 200
+
+
+def test_owner_and_public_payloads_have_different_etags(owner_client, babysitter):
+    api_client = APIClient()
+    api_client.force_authenticate(ClientFactory().user_client)
+    url = reverse("users:users-babysitter-data", args=[babysitter.user_bbs.username])
+    assert api_client.get(url)["ETag"] != owner_client.get(url)["ETag"]
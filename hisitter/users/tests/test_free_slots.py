@@ -0,0 +1,100 @@
+import datetime
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from hisitter.services.lifecycle import transition
+from hisitter.services.tests.factories import ServiceFactory
+from hisitter.users.models import Availability, Babysitter
+from hisitter.users.tests.factories import BabysitterFactory
+
+pytestmark = pytest.mark.django_db
+
+MONDAY = datetime.date(2030, 1, 7)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def babysitters():
+    babysitters = BabysitterFactory.create_batch(3)
+    for babysitter in babysitters:
+        Availability.objects.create(bbs=babysitter, day="Monday", shift="morning")
+    return babysitters
+
+
+def free_usernames(api_client, date=MONDAY, shift="morning"):
+    response = api_client.get(
+        reverse("users:users-available"), {"date": date.isoformat(), "shift": shift}
+    )
+    assert response.status_code == 200
+    return {row["username"] for row in response.data["results"]}
+
+
+def usernames(*babysitters):
+    return {babysitter.user_bbs.username for babysitter in babysitters}
+
+
+def test_free_at_is_an_anti_join(babysitters):
+    ServiceFactory(user_bbs=babysitters[0], date=MONDAY, shift="morning")
+    ServiceFactory(user_bbs=babysitters[1], date=MONDAY, shift="morning", is_active=False)
+
+    with CaptureQueriesContext(connection) as context:
+        free = set(Babysitter.objects.free_at(MONDAY, "morning"))
+
+    assert free == set(babysitters[1:])
+    (query,) = context.captured_queries
+    assert "NOT EXISTS" in query["sql"]
+
+
+def test_slot_is_cached(api_client, babysitters):
+    assert free_usernames(api_client) == usernames(*babysitters)
+    with CaptureQueriesContext(connection) as context:
+        assert free_usernames(api_client) == usernames(*babysitters)
+    assert not any("EXISTS" in query["sql"] for query in context.captured_queries)
+
+
+def test_booking_and_ending_invalidate_the_slot(
+        django_capture_on_commit_callbacks, api_client, babysitters):
+    other_slot = MONDAY + datetime.timedelta(weeks=1)
+    free_usernames(api_client)
+    free_usernames(api_client, date=other_slot)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        service = ServiceFactory(
+            user_bbs=babysitters[0],
+            date=MONDAY,
+            shift="morning",
+            service_start=timezone.now(),
+            status="in_progress"
+        )
+    assert free_usernames(api_client) == usernames(*babysitters[1:])
+    assert free_usernames(api_client, date=other_slot) == usernames(*babysitters)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        transition(service, "end", is_active=False, service_end=timezone.now())
+    assert free_usernames(api_client) == usernames(*babysitters)
+
+
+def test_availability_changes_invalidate_the_weekday(
+        django_capture_on_commit_callbacks, api_client, babysitters):
+    next_monday = MONDAY + datetime.timedelta(weeks=1)
+    free_usernames(api_client)
+    free_usernames(api_client, date=next_monday)
+    free_usernames(api_client, shift="afternoon")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Availability.objects.filter(bbs=babysitters[0]).delete()
+        newcomer = BabysitterFactory()
+        Availability.objects.create(bbs=newcomer, day="Monday", shift="afternoon")
+
+    assert free_usernames(api_client) == usernames(*babysitters[1:])
+    assert free_usernames(api_client, date=next_monday) == usernames(*babysitters[1:])
+    assert free_usernames(api_client, shift="afternoon") == usernames(newcomer)
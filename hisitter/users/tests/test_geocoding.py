@@ -0,0 +1,181 @@
+import json
+import threading
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from hisitter.outbox.models import OutboxMessage
+from hisitter.outbox.tasks import drain_outbox
+from hisitter.services.tests.factories import ServiceFactory
+from hisitter.users import geocoding
+from hisitter.users.geocoding import DummyGeocoder, GeocodingError, SingleFlightLRU
+from hisitter.users.models import GeocodeCache, User
+from hisitter.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+ADDRESS = "123 Benchmark Street, Mexico City"
+
+
+@pytest.fixture(autouse=True)
+def empty_lru():
+    geocoding.lru.clear()
+    yield
+    geocoding.lru.clear()
+
+
+def test_signup_geocodes_after_commit(django_capture_on_commit_callbacks):
+    with mock.patch.object(DummyGeocoder, "geocode") as backend:
+        with mock.patch.object(drain_outbox, "delay") as delay:
+            with django_capture_on_commit_callbacks(execute=True):
+                response = APIClient().post(reverse("users:users-signup"), {
+                    "email": "signup@hisitter.test",
+                    "username": "signup",
+                    "phone_number": "+5215555555555",
+                    "password": "a-long-password-9",
+                    "password_confirmation": "a-long-password-9",
+                    "first_name": "Sign",
+                    "last_name": "Up",
+                    "birthdate": "1990-01-01",
+                    "address": ADDRESS,
+                    "genre": "female",
+                }, format="json")
+
+    assert response.status_code == 201
+    backend.assert_not_called()
+    delay.assert_called()
+    assert OutboxMessage.objects.filter(task="geocode_user").exists()
+
+    drain_outbox()
+
+    user = User.objects.get(username="signup")
+    assert (user.lat, user.long) == geocoding.geocode(ADDRESS)
+    assert user.lat is not None and user.geohash
+
+
+def test_addresses_are_geocoded_once(django_assert_num_queries):
+    with mock.patch.object(DummyGeocoder, "geocode", return_value=(19.4326077, -99.133208)) as backend:
+        assert geocoding.geocode(ADDRESS) == (Decimal("19.432608"), Decimal("-99.133208"))
+        # Same normalized address, served from memory.
+        with django_assert_num_queries(0):
+            assert geocoding.geocode(f"  {ADDRESS.upper()} ") == (Decimal("19.432608"), Decimal("-99.133208"))
+        # Another process reads the table.
+        geocoding.lru.clear()
+        assert geocoding.geocode(ADDRESS) == (Decimal("19.432608"), Decimal("-99.133208"))
+    backend.assert_called_once_with(geocoding.normalize_address(ADDRESS))
+    assert GeocodeCache.objects.get().address == "123 benchmark street, mexico city"
+
+
+def test_missing_and_failed_lookups():
+    assert geocoding.geocode("Street from nowhere 1") is None
+    assert GeocodeCache.objects.get().lat is None
+
+    with mock.patch.object(DummyGeocoder, "geocode", side_effect=GeocodingError("timeout")):
+        with pytest.raises(GeocodingError):
+            geocoding.geocode(ADDRESS)
+    # Failures aren't cached, the next lookup asks again.
+    assert geocoding.geocode(ADDRESS) is not None
+
+
+def test_concurrent_misses_share_one_computation():
+    lru = SingleFlightLRU(maxsize=2)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    leader = threading.Thread(target=lru.get, args=("key", compute))
+    leader.start()
+    started.wait(5)
+    results = []
+    followers = [
+        threading.Thread(target=lambda: results.append(lru.get("key", compute)))
+        for _ in range(3)
+    ]
+    for follower in followers:
+        follower.start()
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ["value"] * 3
+    lru.get("b", lambda: 2)
+    lru.get("c", lambda: 3)
+    assert list(lru.values) == ["b", "c"]
+
+
+def test_address_change_is_geocoded(django_capture_on_commit_callbacks):
+    user = UserFactory(address="Old address 1")
+    user.address = ADDRESS
+    with django_capture_on_commit_callbacks():
+        user.save()
+
+    message = OutboxMessage.objects.get(task="geocode_user")
+    assert message.payload == {"user_id": user.pk, "address": ADDRESS}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_backfill_fills_missing_coordinates(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    users = [UserFactory(address=f"{n} Backfill Street") for n in range(3)]
+    lost = UserFactory(address="Street from nowhere 2")
+    service = ServiceFactory(address=ADDRESS)
+
+    call_command("backfill_coordinates", batch_size=2, rate=1000, checkpoint=str(checkpoint))
+
+    for user in users:
+        user.refresh_from_db()
+        assert (user.lat, user.long) == geocoding.geocode(user.address)
+        assert user.geohash
+    lost.refresh_from_db()
+    assert lost.lat is None
+    service.refresh_from_db()
+    assert (service.lat, service.long) == geocoding.geocode(ADDRESS)
+    # A finished run starts over next time.
+    assert not checkpoint.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_backfill_resumes_from_checkpoint(tmp_path):
+    done, pending = UserFactory(address="1 Resume Street"), UserFactory(address="2 Resume Street")
+    checkpoint = tmp_path / "checkpoint.json"
+    checkpoint.write_text(json.dumps({"users": done.pk}))
+
+    with mock.patch.object(DummyGeocoder, "geocode", side_effect=GeocodingError("timeout")) as backend:
+        call_command("backfill_coordinates", rate=1000, checkpoint=str(checkpoint))
+    backend.assert_called_once_with("2 resume street")
+
+    call_command("backfill_coordinates", rate=1000, checkpoint=str(checkpoint))
+
+    done.refresh_from_db()
+    pending.refresh_from_db()
+    assert done.lat is not None and pending.lat is not None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_backfill_keeps_rows_changed_while_geocoding(tmp_path):
+    moved = UserFactory(address="1 Moving Street")
+    filled = UserFactory(address="2 Filled Street")
+    geocode = geocoding.geocode
+
+    def change_rows(address):
+        User.objects.filter(pk=moved.pk).update(address="3 New Street")
+        User.objects.filter(pk=filled.pk).update(lat=Decimal("1.5"), long=Decimal("2.5"))
+        return geocode(address)
+
+    with mock.patch.object(geocoding, "geocode", side_effect=change_rows):
+        call_command("backfill_coordinates", rate=1000, checkpoint=str(tmp_path / "checkpoint.json"))
+
+    moved.refresh_from_db()
+    filled.refresh_from_db()
+    assert moved.lat is None
+    assert (filled.lat, filled.long) == (Decimal("1.5"), Decimal("2.5"))
@@ -0,0 +1,132 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from hisitter.users.models import User
+from hisitter.users.tasks import gen_verification_token
+from hisitter.users.tests.factories import BabysitterFactory, UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def jwt_enabled(settings):
+    settings.JWT_AUTH_ENABLED = True
+    cache.clear()
+
+
+@pytest.fixture
+def user():
+    user = UserFactory()
+    user.is_verified = True
+    user.save()
+    return user
+
+
+def login(user):
+    response = APIClient().post(
+        reverse("users:users-login"),
+        {"email": user.email, "password": "testpass123!"},
+        format="json",
+    )
+    assert response.status_code == 201
+    return response.data
+
+
+def bearer(access):
+    api_client = APIClient()
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+    return api_client
+
+
+def test_bearer_requests_skip_the_token_and_user_tables(user):
+    tokens = login(user)["jwt"]
+    BabysitterFactory()
+
+    with CaptureQueriesContext(connection) as context:
+        response = bearer(tokens["access"]).get(reverse("users:users-cards"))
+
+    assert response.status_code == 200
+    queries = " ".join(query["sql"] for query in context.captured_queries)
+    assert "authtoken_token" not in queries
+    assert '"users_user"' not in queries
+
+
+def test_opaque_tokens_keep_working(user):
+    data = login(user)
+    api_client = APIClient()
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {data['access_token']}")
+    assert api_client.get(reverse("users:users-cards")).status_code == 200
+
+
+def test_login_without_signed_tokens(settings, user):
+    settings.JWT_AUTH_ENABLED = False
+    data = login(user)
+    assert "jwt" not in data
+    assert Token.objects.filter(user=user, key=data["access_token"]).exists()
+
+
+def test_refresh_tokens_are_rotated(user):
+    refresh = login(user)["jwt"]["refresh"]
+    url = reverse("users:users-token-refresh")
+
+    response = APIClient().post(url, {"refresh": refresh}, format="json")
+    assert response.status_code == 200
+    assert bearer(response.data["access"]).get(reverse("users:users-cards")).status_code == 200
+
+    assert APIClient().post(url, {"refresh": refresh}, format="json").status_code == 401
+
+
+def test_logout_revokes_the_tokens(user):
+    tokens = login(user)["jwt"]
+    api_client = bearer(tokens["access"])
+
+    response = api_client.post(
+        reverse("users:users-logout"), {"refresh": tokens["refresh"]}, format="json"
+    )
+
+    assert response.status_code == 204
+    assert api_client.get(reverse("users:users-cards")).status_code == 401
+    refresh = APIClient().post(
+        reverse("users:users-token-refresh"), {"refresh": tokens["refresh"]}, format="json"
+    )
+    assert refresh.status_code == 401
+
+
+def test_password_change_revokes_every_token(django_capture_on_commit_callbacks, user):
+    access = login(user)["jwt"]["access"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.set_password("another-pass123!")
+        user.save()
+
+    assert bearer(access).get(reverse("users:users-cards")).status_code == 401
+
+
+def test_queryset_deactivation_revokes_every_token(django_capture_on_commit_callbacks, user):
+    access = login(user)["jwt"]["access"]
+
+    # Admin actions deactivate with a queryset update, without signals.
+    with django_capture_on_commit_callbacks(execute=True):
+        User.objects.filter(pk=user.pk).update(is_active=False)
+
+    assert bearer(access).get(reverse("users:users-cards")).status_code == 401
+
+
+def test_rename_revokes_every_token(django_capture_on_commit_callbacks, user):
+    access = login(user)["jwt"]["access"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.username = "renamed"
+        user.save()
+
+    assert bearer(access).get(reverse("users:users-cards")).status_code == 401
+
+
+def test_other_signed_tokens_are_not_access_tokens(user):
+    token = gen_verification_token(user.username)
+    assert bearer(token).get(reverse("users:users-cards")).status_code == 401
@@ -0,0 +1,95 @@
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from hisitter.users.models import Availability, User
+from hisitter.users.tests.factories import BabysitterFactory, UserFactory
+from hisitter.utils.geohash import covering_cells, encode, haversine
+
+pytestmark = pytest.mark.django_db
+
+# Zocalo, Mexico City.
+CENTER = (19.432608, -99.133209)
+
+
+def babysitter_at(lat, long, **kwargs):
+    user = UserFactory(lat=Decimal(str(lat)), long=Decimal(str(long)))
+    return BabysitterFactory(user_bbs=user, **kwargs)
+
+
+def search(api_client, **params):
+    params = {"lat": CENTER[0], "long": CENTER[1], **params}
+    return api_client.get(reverse("users:users-nearby"), params)
+
+
+def test_geohash_helpers():
+    assert encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert haversine(*CENTER, *CENTER) == 0
+    assert round(haversine(0, 0, 0, 1), 1) == 111.2
+    point = encode(19.45, -99.12)
+    assert any(point.startswith(cell) for cell in covering_cells(*CENTER, 5))
+
+
+def test_geohash_is_kept_on_save():
+    user = UserFactory(lat=Decimal("19.432608"), long=Decimal("-99.133209"))
+    assert user.geohash == encode(*CENTER)
+
+    user.lat, user.long = Decimal("40.7128"), Decimal("-74.0060")
+    user.save(update_fields=["lat", "long"])
+    user.refresh_from_db()
+    assert user.geohash == encode(40.7128, -74.0060)
+
+    user.lat = None
+    user.save()
+    assert user.geohash == ""
+
+
+def test_backfill_geohash_command():
+    user = UserFactory(lat=Decimal("19.432608"), long=Decimal("-99.133209"))
+    User.objects.filter(pk=user.pk).update(geohash="")
+
+    call_command("backfill_geohash", batch_size=1)
+
+    user.refresh_from_db()
+    assert user.geohash == encode(*CENTER)
+
+
+def test_nearby_ranks_by_distance_within_the_radius(api_client):
+    far = babysitter_at(19.50, -99.20)
+    close = babysitter_at(19.4330, -99.1340)
+    middle = babysitter_at(19.45, -99.14)
+    babysitter_at(20.67, -103.35)
+
+    response = search(api_client, radius=15)
+
+    assert response.status_code == 200
+    usernames = [row["username"] for row in response.data["results"]]
+    assert usernames == [
+        close.user_bbs.username, middle.user_bbs.username, far.user_bbs.username
+    ]
+    distances = [row["distance_km"] for row in response.data["results"]]
+    assert distances == sorted(distances) and distances[-1] <= 15
+    assert "email" not in response.data["results"][0]
+    assert [row["username"] for row in search(api_client, radius=5).data["results"]] == [
+        close.user_bbs.username, middle.user_bbs.username
+    ]
+
+
+def test_nearby_filters(api_client):
+    cheap = babysitter_at(19.433, -99.134, cost_of_service="15.00")
+    available = babysitter_at(19.434, -99.134, cost_of_service="30.00")
+    Availability.objects.create(bbs=available, day="Monday", shift="morning")
+    User.objects.filter(pk=cheap.user_bbs_id).update(reputation=Decimal("3.5"))
+
+    def usernames(**params):
+        response = search(api_client, **params)
+        assert response.status_code == 200
+        return [row["username"] for row in response.data["results"]]
+
+    assert usernames(max_cost="20") == [cheap.user_bbs.username]
+    assert usernames(min_cost="20") == [available.user_bbs.username]
+    assert usernames(min_reputation="4.0") == [available.user_bbs.username]
+    assert usernames(date="2030-01-07", shift="morning") == [available.user_bbs.username]
+    assert search(api_client, shift="morning").status_code == 400
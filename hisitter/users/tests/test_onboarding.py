@@ -0,0 +1,78 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+from hisitter.outbox.models import OutboxMessage
+from hisitter.users.models import Availability, Babysitter, BabysitterCard, User
+from hisitter.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+BABYSITTER = {
+    "phone_number": "+5215555555555",
+    "password": "a-long-password-9",
+    "first_name": "Agency",
+    "last_name": "Sitter",
+    "birthdate": "1990-01-01",
+    "address": "123 Agency Street, Mexico City",
+    "genre": "female",
+    "user_bbs": {
+        "education_degree": "Early Childhood Education",
+        "about_me": "Ten years caring for children",
+        "cost_of_service": "30.00",
+    },
+}
+
+
+def babysitter(username, **fields):
+    return {**BABYSITTER, "email": f"{username}@agency.test", "username": username, **fields}
+
+
+def test_import_jsonl(tmp_path, capsys):
+    UserFactory(username="taken", email="taken@hisitter.test")
+    rows = [
+        babysitter("first", availability=[
+            {"day": "Monday", "shift": "morning"},
+            {"day": "Friday", "shift": "night"},
+        ]),
+        babysitter("second"),
+        babysitter("taken"),
+        babysitter("again", email="first@agency.test"),
+        babysitter("nodegree", user_bbs={}),
+    ]
+    path = tmp_path / "babysitters.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n{not json\n")
+
+    call_command("import_babysitters", str(path), chunk_size=2, workers=1)
+
+    first = Babysitter.objects.get(user_bbs__username="first")
+    assert first.is_available("Monday", "morning") and first.is_available("Friday", "night")
+    assert not first.is_available("Monday", "afternoon")
+    assert Availability.objects.filter(bbs=first).count() == 2
+    user = first.user_bbs
+    assert user.check_password("a-long-password-9") and not user.is_verified
+    assert set(BabysitterCard.objects.values_list("username", flat=True)) == {"first", "second"}
+    assert not User.objects.filter(username__in=["again", "nodegree"]).exists()
+    assert OutboxMessage.objects.filter(task="send_confirmation_email").count() == 2
+    assert OutboxMessage.objects.filter(task="geocode_user").count() == 2
+
+    err = capsys.readouterr().err
+    assert "Line 3:" in err and "Line 4:" in err and "Line 5:" in err and "Line 6:" in err
+
+
+def test_import_csv(tmp_path):
+    path = tmp_path / "babysitters.csv"
+    path.write_text(
+        "email,username,phone_number,password,first_name,last_name,birthdate,address,genre,"
+        "education_degree,about_me,cost_of_service,availability\n"
+        "csv@agency.test,csvsitter,+5215555555555,a-long-password-9,Csv,Sitter,1990-01-01,"
+        "\"123 Agency Street, Mexico City\",male,Nursing,Calm and patient,20.00,"
+        "Tuesday evening; Sunday morning\n"
+    )
+
+    call_command("import_babysitters", str(path), workers=1)
+
+    imported = Babysitter.objects.get(user_bbs__username="csvsitter")
+    assert imported.cost_of_service == 20
+    assert imported.is_available("Tuesday", "evening") and imported.is_available("Sunday", "morning")
@@ -0,0 +1,26 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from hisitter.users.models import User
+from hisitter.users.tests.factories import BabysitterFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_babysitters_cursor_pagination_orders_by_reputation_and_id(user):
+    babysitters = BabysitterFactory.create_batch(9)
+    for index, babysitter in enumerate(babysitters):
+        # Groups of ties, the primary key breaks them.
+        User.objects.filter(pk=babysitter.user_bbs_id).update(reputation=3 + index % 3)
+    api_client = APIClient()
+    api_client.force_authenticate(user)
+    url = reverse("users:users-list") + "?pagination=cursor&limit=2"
+    seen = []
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == 200
+        seen += [row["username"] for row in response.data["results"]]
+        url = response.data["next"]
+    expected = User.objects.filter(user_bbs__isnull=False).order_by("-reputation", "-id")
+    assert seen == [babysitter.username for babysitter in expected]
@@ -0,0 +1,136 @@
+import time
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from hisitter.reviews.models import Review
+from hisitter.services.tests.factories import ServiceFactory
+from hisitter.users.models import Availability
+from hisitter.users.tests.factories import BabysitterFactory
+from hisitter.utils import cache as cache_utils
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def babysitter():
+    return BabysitterFactory()
+
+
+def select_count(context):
+    # ATOMIC_REQUESTS wraps each request in a savepoint.
+    return sum(query["sql"].startswith("SELECT") for query in context.captured_queries)
+
+
+def get_profile(api_client, babysitter):
+    url = reverse("users:users-babysitter-data", args=[babysitter.user_bbs.username])
+    response = api_client.get(url)
+    assert response.status_code == 200
+    return response.data
+
+
+def test_profile_is_cached(api_client, babysitter):
+    data = get_profile(api_client, babysitter)
+
+    with CaptureQueriesContext(connection) as context:
+        assert get_profile(api_client, babysitter) == data
+    assert select_count(context) == 0
+
+
+def test_owner_and_public_payloads_are_cached_apart(api_client, babysitter):
+    public = get_profile(api_client, babysitter)
+    owner_client = APIClient()
+    owner_client.force_authenticate(babysitter.user_bbs)
+
+    owner = get_profile(owner_client, babysitter)
+
+    assert "email" in owner
+    assert "email" not in public
+
+
+def test_errors_are_not_cached(api_client):
+    url = reverse("users:users-babysitter-data", args=["nobody"])
+    assert api_client.get(url).status_code == 404
+
+    with CaptureQueriesContext(connection) as context:
+        assert api_client.get(url).status_code == 404
+    assert select_count(context) == 1
+
+
+def test_model_changes_invalidate_the_profile(
+        django_capture_on_commit_callbacks, api_client, babysitter):
+    user = babysitter.user_bbs
+    get_profile(api_client, babysitter)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.first_name = "Renamed"
+        user.save()
+    assert get_profile(api_client, babysitter)["first_name"] == "Renamed"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        babysitter.about_me = "Updated"
+        babysitter.save()
+    assert get_profile(api_client, babysitter)["user_bbs"]["about_me"] == "Updated"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        service = ServiceFactory(user_bbs=babysitter)
+        Review.objects.create(service_origin=service, reputation=4)
+        user.reputation = 4
+        user.save(update_fields=["reputation"])
+    assert get_profile(api_client, babysitter)["reputation"] == "4.0"
+
+
+def test_availability_changes_invalidate_the_owner_profile(
+        django_capture_on_commit_callbacks, babysitter):
+    owner_client = APIClient()
+    owner_client.force_authenticate(babysitter.user_bbs)
+    assert get_profile(owner_client, babysitter)["user_bbs"]["availabilities"] == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Availability.objects.create(bbs=babysitter, day="Monday", shift="morning")
+
+    availabilities = get_profile(owner_client, babysitter)["user_bbs"]["availabilities"]
+    assert [row["day"] for row in availabilities] == ["Monday"]
+
+
+def test_logins_keep_the_profile(django_capture_on_commit_callbacks, api_client, babysitter):
+    get_profile(api_client, babysitter)
+    user = babysitter.user_bbs
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        user.save(update_fields=["last_login"])
+    assert callbacks == []
+
+
+def test_stale_value_is_served_while_one_reader_refreshes():
+    cache.set("key", ("old", time.time() - 1), 60)
+    cache.add("key:lock", 1)
+    calls = []
+
+    assert cache_utils.read_through("key", lambda: calls.append(1) or "new", 10) == "old"
+    assert calls == []
+
+    cache.delete("key:lock")
+    assert cache_utils.read_through("key", lambda: calls.append(1) or "new", 10) == "new"
+    assert calls == [1]
+    assert cache.get("key:lock") is None
+
+
+def test_miss_waits_for_the_lock_holder(monkeypatch):
+    cache.add("key:lock", 1)
+    monkeypatch.setattr(cache_utils, "WAIT", 0.2)
+
+    def sleep(seconds):
+        cache.set("key", ("filled", time.time() + 10), 10)
+
+    monkeypatch.setattr(cache_utils.time, "sleep", sleep)
+    assert cache_utils.read_through("key", lambda: "computed", 10) == "filled"
@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from hisitter.services.tests.factories import ServiceFactory
+from hisitter.users.roles import Roles
+from hisitter.users.tests.factories import BabysitterFactory, ClientFactory, UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def service():
+    return ServiceFactory(is_active=False)
+
+
+def request(user, method, url):
+    api_client = APIClient()
+    api_client.force_authenticate(user)
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(api_client, method)(url, {}, format="json")
+    return response, len(context.captured_queries)
+
+
+def test_roles_are_read_with_one_query(service):
+    client = service.user_client
+    roles = Roles(client.user_client)
+
+    with CaptureQueriesContext(connection) as context:
+        assert roles.is_client and not roles.is_babysitter
+        assert roles.client.pk == client.pk
+        assert roles.is_client_of(service)
+        assert not roles.is_babysitter_of(service)
+    assert len(context.captured_queries) == 1
+
+
+def test_users_without_roles():
+    roles = Roles(UserFactory())
+    assert roles.ids == (None, None)
+    assert roles.client is None and roles.babysitter is None
+
+
+def test_babysitter_cannot_review(service):
+    url = reverse("reviews:reviews-list", kwargs={"service": service.pk})
+    response, queries = request(service.user_bbs.user_bbs, "post", url)
+    assert response.status_code == 403
+    # Savepoint, service with its client, rollback, release.
+    assert queries == 4
+
+
+def test_babysitter_cannot_book(service):
+    babysitter = BabysitterFactory().user_bbs
+    url = reverse("services:services-creation-create-service", kwargs={"babysitter": babysitter.username})
+    response, queries = request(service.user_bbs.user_bbs, "post", url)
+    assert response.status_code == 403
+    # Savepoint, babysitter, roles, rollback, release.
+    assert queries == 5
+
+
+def test_client_cannot_set_on_my_way(service):
+    url = reverse("services:services-on-my-way", kwargs={"pk": service.pk})
+    response, queries = request(service.user_client.user_client, "patch", url)
+    assert response.status_code == 403
+    # Savepoint, roles, service, release.
+    assert queries == 4
+
+
+def test_outsider_cannot_start():
+    service = ServiceFactory(scheduled_start=timezone.now())
+    url = reverse("services:services-start", kwargs={"pk": service.pk})
+    response, queries = request(ClientFactory().user_client, "patch", url)
+    assert response.status_code == 401
+    # Savepoint, service, roles, release.
+    assert queries == 4
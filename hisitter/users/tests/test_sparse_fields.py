@@ -0,0 +1,40 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from hisitter.users.models import Availability
+from hisitter.users.tests.factories import BabysitterFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_users_list_fields_skip_babysitter_join_and_prefetch(user):
+    BabysitterFactory.create_batch(2)
+    api_client = APIClient()
+    api_client.force_authenticate(user)
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(reverse("users:users-list"), {"fields": "username,reputation"})
+    assert response.status_code == 200
+    assert [set(row) for row in response.data["results"]] == [{"username", "reputation"}] * 2
+    queries = " ".join(query["sql"] for query in context.captured_queries)
+    assert "users_availability" not in queries
+    assert '"users_user"."email"' not in queries
+
+
+def test_users_list_nested_babysitter_is_prefetched(user):
+    for babysitter in BabysitterFactory.create_batch(3):
+        Availability.objects.create(bbs=babysitter, day="Monday", shift="morning")
+    api_client = APIClient()
+    api_client.force_authenticate(user)
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(reverse("users:users-list"), {"fields": "username,user_bbs"})
+    results = response.data["results"]
+    assert [row["user_bbs"]["availabilities"] for row in results] == [
+        [{"day": "Monday", "shift": "morning"}]
+    ] * 3
+    availability_queries = [
+        query for query in context.captured_queries if "users_availability" in query["sql"]
+    ]
+    assert len(availability_queries) == 1
@@ -0,0 +1,45 @@
+from decimal import Decimal
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from hisitter.users.models import Availability, User
+from hisitter.users.serializers import (
+    BabysitterPublicSerializer,
+    BabysitterPublicValuesSerializer,
+    UserModelSerializer,
+    UserValuesSerializer
+)
+from hisitter.users.tests.factories import BabysitterFactory, UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.fixture
+def users():
+    babysitter = BabysitterFactory(cost_of_service=Decimal("32.50"))
+    Availability.objects.create(bbs=babysitter, day="Tuesday", shift="evening")
+    Availability.objects.create(bbs=babysitter, day="Monday", shift="morning")
+    User.objects.filter(pk=babysitter.user_bbs_id).update(
+        picture="pictures/bbs.png", lat=Decimal("19.4"), reputation=Decimal("4.5")
+    )
+    BabysitterFactory()
+    UserFactory()
+    return User.objects.order_by("pk")
+
+
+@pytest.mark.parametrize("serializer_class, values_serializer_class", [
+    (UserModelSerializer, UserValuesSerializer),
+    (BabysitterPublicSerializer, BabysitterPublicValuesSerializer),
+])
+def test_values_serializers_render_the_same_json(users, serializer_class, values_serializer_class):
+    context = {"request": APIRequestFactory().get("/users/")}
+    expected = serializer_class(users, many=True, context=context).data
+    values_serializer = values_serializer_class(context=context)
+    rows = users.values(*values_serializer.get_columns())
+    assert render(values_serializer.serialize(rows)) == render(expected)
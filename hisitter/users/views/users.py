@@ -4,6 +4,7 @@
 import json
 
 # Django imports
+from django.conf import settings
 from django.db.models import Q
 from django.shortcuts import render, redirect
 
@@ -16,23 +17,50 @@ from rest_framework.permissions import (
     IsAuthenticated
 )
 from rest_framework.generics import get_object_or_404
+from rest_framework.settings import api_settings
 
 # Serializers
 from hisitter.users.serializers import (
     UserModelSerializer,
+    UserValuesSerializer,
     UserSignupSerializer,
     AccountVerificationSerializer,
     BabysitterModelSerializer,
-    BabysitterPublicSerializer,
+    BabysitterPublicValuesSerializer,
+    BabysitterSearchSerializer,
+    BabysitterCardValuesSerializer,
+    FreeSlotSerializer,
     UserLoginSerializer,
+    TokenRefreshSerializer,
+    LogoutSerializer,
     AvailabilitySerializer
 )
 
 # Permissions
 from hisitter.users.permissions import IsAccountOwner, IsClient
 
+# Cache
+from hisitter.users import profile_cache
+
+# Signed tokens
+from hisitter.users.authentication import issue_tokens
+
 # Models
-from hisitter.users.models import User, Babysitter, Client
+from hisitter.users.models import User, Babysitter, BabysitterCard, Client
+
+# Search
+from hisitter.users import free_slots
+from hisitter.users.search import nearby_babysitters
+
+# Utils
+from hisitter.utils.conditional import build_etag, conditional_response, latest
+from hisitter.utils.pagination import (
+    KeysetPaginationMixin,
+    BabysitterKeysetPagination,
+    BabysitterCardKeysetPagination
+)
+from hisitter.utils.sparse_fields import SparseFieldsetViewMixin
+from hisitter.utils.values_serializers import ValuesListModelMixin
 
 # Swagger
 from drf_yasg.utils import swagger_auto_schema
@@ -43,6 +71,9 @@ from hisitter.utils.swagger import (
 )
 
 class UserViewSet(
+    KeysetPaginationMixin,
+    SparseFieldsetViewMixin,
+    ValuesListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
     mixins.ListModelMixin,
@@ -50,26 +81,50 @@ class UserViewSet(
 ):
     """ User view set.
         Handle sign up, login and account verification.
+        The list accepts ?pagination=cursor for keyset pagination, list and
+        retrieve accept ?fields= and ?omit= to return only some fields.
     """
     serializer_class = UserModelSerializer
+    keyset_pagination_class = BabysitterKeysetPagination
+    values_serializer_class = UserValuesSerializer
     lookup_field = 'username'
 
+    sparse_relations = {
+        'user_bbs': {
+            'select_related': ['user_bbs'],
+            'prefetch_related': ['user_bbs__availabilities'],
+            'only': [
+                'user_bbs__education_degree',
+                'user_bbs__about_me',
+                'user_bbs__cost_of_service'
+            ]
+        },
+    }
+
     def get_queryset(self):
         """ Restrict the list to public only."""
         if self.action == 'list':
+            # The list reads .values() rows, see UserValuesSerializer.
             queryset = User.objects.filter(user_bbs__isnull=False)
             return queryset
+        elif self.action == 'retrieve':
+            return self.apply_sparse_fieldset(User.objects.all())
         else:
             queryset = User.objects.all()
             return queryset
 
+    def get_keyset_pagination_class(self):
+        if self.action == 'cards':
+            return BabysitterCardKeysetPagination
+        return super().get_keyset_pagination_class()
+
     def get_permissions(self):
         """Assign permissions based on actions."""
-        if self.action in ['signup', 'login', 'verify']:
+        if self.action in ['signup', 'login', 'verify', 'token_refresh']:
             permissions = [AllowAny]
         elif self.action in ['retrieve', 'update', 'partial_update']:
             permissions = [IsAuthenticated, IsAccountOwner]
-        elif self.action in ['list', 'babysitter_data']:
+        elif self.action in ['list', 'babysitter_data', 'nearby', 'available', 'cards', 'logout']:
             permissions = [IsAuthenticated]
         else:
             permissions = [IsAuthenticated, IsClient]
@@ -85,8 +140,30 @@ class UserViewSet(
             'user': UserModelSerializer(user).data,
             'access_token': token
         }
+        if settings.JWT_AUTH_ENABLED:
+            data['jwt'] = issue_tokens(user)
         return Response(data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=['post'], url_path='token/refresh')
+    def token_refresh(self, request):
+        """ Exchange a refresh token for a new access/refresh pair."""
+        serializer = TokenRefreshSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.save(), status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        manual_parameters=[is_authenticated_permission]
+    )
+    @action(detail=False, methods=['post'])
+    def logout(self, request):
+        """ Revoke the access token of the request, and the refresh token
+            sent in the body if any.
+        """
+        serializer = LogoutSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
     @action(detail=False, methods=['post'])
     def signup(self, request):
         """ User signup."""
@@ -115,23 +192,115 @@ class UserViewSet(
 
         Returns full data if requester is the owner, otherwise returns public data only.
         """
-        try:
-            bbs_user = User.objects.get(username=kwargs['username'])
-        except User.DoesNotExist:
-            return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
-
-        if not hasattr(bbs_user, 'user_bbs') or not bbs_user.user_bbs:
-            return Response({'error': f'{bbs_user.username} is not a babysitter'}, status=status.HTTP_400_BAD_REQUEST)
-
         # Owner gets full data, others get public data only
-        if request.user.username == kwargs['username']:
-            user_data = UserModelSerializer(bbs_user).data
+        owner = request.user.username == kwargs['username']
+        if owner:
+            values_serializer = UserValuesSerializer()
         else:
-            user_data = BabysitterPublicSerializer(bbs_user).data
+            values_serializer = BabysitterPublicValuesSerializer()
+        columns = dict.fromkeys([
+            'username',
+            'updated_at',
+            'user_bbs__id',
+            'user_bbs__updated_at',
+            *values_serializer.get_columns()
+        ])
+        rows = []
 
-        return Response(user_data)
+        def load():
+            bbs_user = User.objects.filter(username=kwargs['username']).values(*columns).first()
+            rows.append(bbs_user)
+            if bbs_user is None or bbs_user['user_bbs__id'] is None:
+                return None
+            return {
+                'data': values_serializer.serialize([bbs_user])[0],
+                'updated_at': latest(bbs_user['updated_at'], bbs_user['user_bbs__updated_at'])
+            }
+
+        # The validators are cached with the payload, a hit costs no query.
+        profile = profile_cache.get_profile(kwargs['username'], owner, load)
+        if profile is None:
+            # Not cached, load() ran in this request.
+            bbs_user = rows[-1]
+            if bbs_user is None:
+                return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+            return Response({'error': f'{bbs_user["username"]} is not a babysitter'}, status=status.HTTP_400_BAD_REQUEST)
+        return conditional_response(
+            request,
+            build_etag(request, owner, profile['updated_at']),
+            profile['updated_at'],
+            lambda: Response(profile['data'])
+        )
     
     
+    @swagger_auto_schema(
+        manual_parameters=[is_authenticated_permission]
+    )
+    @action(detail=False, methods=['get'])
+    def cards(self, request, *args, **kwargs):
+        """ Babysitter cards, best rated first.
+
+            Reads the BabysitterCard table alone in the order of its index,
+            accepts ?pagination=cursor like the list.
+        """
+        values_serializer = BabysitterCardValuesSerializer(context=self.get_serializer_context())
+        queryset = BabysitterCard.objects.order_by('-reputation', '-user_id').values(
+            *values_serializer.get_columns()
+        )
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(values_serializer.serialize(page))
+
+    @swagger_auto_schema(
+        query_serializer=BabysitterSearchSerializer,
+        manual_parameters=[is_authenticated_permission]
+    )
+    @action(detail=False, methods=['get'])
+    def nearby(self, request, *args, **kwargs):
+        """ Babysitters around a point, closest first.
+
+            Takes lat, long and radius (km), optionally date and shift,
+            min_cost, max_cost and min_reputation to narrow the search.
+        """
+        serializer = BabysitterSearchSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = dict(serializer.validated_data)
+        values_serializer = BabysitterPublicValuesSerializer()
+        results = nearby_babysitters(columns=values_serializer.get_columns(), **params)
+        data = values_serializer.serialize(row for distance, row in results)
+        for item, (distance, row) in zip(data, results):
+            item['distance_km'] = round(distance, 3)
+        return Response({'results': data})
+
+    @swagger_auto_schema(
+        query_serializer=FreeSlotSerializer,
+        manual_parameters=[is_authenticated_permission]
+    )
+    @action(detail=False, methods=['get'])
+    def available(self, request, *args, **kwargs):
+        """ Babysitters that can take a service on date and shift, best
+            rated first. The ids of the slot are cached until a service of
+            the slot or an availability of its weekday changes.
+        """
+        serializer = FreeSlotSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        date, shift = serializer.validated_data['date'], serializer.validated_data['shift']
+        ids = free_slots.get_free_ids(
+            date,
+            shift,
+            lambda: Babysitter.objects.free_at(date, shift).order_by(
+                '-user_bbs__reputation', '-user_bbs_id'
+            ).values_list('user_bbs_id', flat=True)
+        )
+        # Offset pages of the cached list, ?pagination=cursor doesn't apply.
+        paginator = api_settings.DEFAULT_PAGINATION_CLASS()
+        page = paginator.paginate_queryset(ids, request, view=self)
+        values_serializer = BabysitterPublicValuesSerializer()
+        rows = User.objects.filter(pk__in=page).values('pk', *values_serializer.get_columns())
+        rows = {row['pk']: row for row in rows}
+        # A babysitter deleted since the ids were cached is skipped.
+        data = values_serializer.serialize(rows[pk] for pk in page if pk in rows)
+        return paginator.get_paginated_response(data)
+
     @swagger_auto_schema(
         manual_parameters=[
             is_authenticated_permission,
@@ -139,5 +308,15 @@ class UserViewSet(
             ]
     )
     def retrieve(self, request, *args, **kwargs):
-        """ Return user data. """
-        return super(UserViewSet, self).retrieve(request, *args, **kwargs)
+        """ Return user data, 304 when the client already has it. """
+        # IsAccountOwner let the request in, so the user is request.user.
+        user = request.user
+        bbs_updated_at = Babysitter.objects.filter(
+            user_bbs=user
+        ).values_list('updated_at', flat=True).first()
+        return conditional_response(
+            request,
+            build_etag(request, user.pk, user.updated_at, bbs_updated_at),
+            latest(user.updated_at, bbs_updated_at),
+            lambda: super(UserViewSet, self).retrieve(request, *args, **kwargs)
+        )
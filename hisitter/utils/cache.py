@@ -0,0 +1,77 @@
+""" Cache helpers: versioned keys and a read-through with stampede protection.
+
+    A versioned key embeds the current version of what it depends on.
+    Invalidating bumps the version after the transaction commits, and a
+    reader builds the key before reading the database, so a reader that
+    saw the old data can only write it under a key nobody reads anymore.
+    A missing version (never set or evicted) gets a fresh one, so it can't
+    point back at older data.
+"""
+
+# Python
+import time
+
+# Django imports
+from django.core.cache import cache
+from django.db import transaction
+
+# Time a refresh may hold the lock of a key.
+LOCK_TIMEOUT = 10
+# Time a reader waits for another one to fill a missing key.
+WAIT = 0.5
+POLL_INTERVAL = 0.05
+
+
+def new_version():
+    return time.time_ns()
+
+
+def get_versions(keys, timeout):
+    """ Return {key: version} for the version keys, creating the missing ones. """
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, new_version(), timeout)
+            versions[key] = cache.get(key, new_version())
+    return versions
+
+
+def bump_version(key, timeout):
+    """ Give the version key a new value once the current transaction commits. """
+    transaction.on_commit(lambda: cache.set(key, new_version(), timeout))
+
+
+def read_through(key, compute, timeout, grace=60):
+    """ Return the cached value of key, computing and storing it on a miss.
+
+        Values are kept `grace` seconds past their `timeout`. The first
+        reader after the timeout refreshes the value while the others keep
+        getting the stale one; on a miss a single reader computes it and
+        the others wait for it up to WAIT seconds. None is not cached.
+    """
+    lock_key = f'{key}:lock'
+    entry = cache.get(key)
+    if entry is not None:
+        value, fresh_until = entry
+        if time.time() < fresh_until or not cache.add(lock_key, 1, LOCK_TIMEOUT):
+            return value
+        return _refresh(key, lock_key, compute, timeout, grace)
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        return _refresh(key, lock_key, compute, timeout, grace)
+    deadline = time.monotonic() + WAIT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+    return compute()
+
+
+def _refresh(key, lock_key, compute, timeout, grace):
+    try:
+        value = compute()
+        if value is not None:
+            cache.set(key, (value, time.time() + timeout), timeout + grace)
+        return value
+    finally:
+        cache.delete(lock_key)
@@ -0,0 +1,45 @@
+""" Conditional GETs (ETag / Last-Modified) from updated_at timestamps.
+
+    The views read the updated_at of the rows a response is built from,
+    usually with a single narrow query, and answer 304 Not Modified when
+    the client already holds that version, without running the serializer.
+    The ETag is weak: it identifies the version of the rows, the query
+    string and the variant of the payload, not its bytes.
+"""
+
+# Python
+import hashlib
+
+# Django imports
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+
+def build_etag(request, *parts):
+    """ Return a weak ETag of the parts and the full path of the request. """
+    key = repr((request.get_full_path(), parts)).encode()
+    return f'W/"{hashlib.md5(key, usedforsecurity=False).hexdigest()}"'
+
+
+def latest(*timestamps):
+    """ Return the most recent of the timestamps, ignoring the missing ones. """
+    timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+    return max(timestamps) if timestamps else None
+
+
+def conditional_response(request, etag, last_modified, render):
+    """ Return 304 when the request's If-None-Match or If-Modified-Since
+        match the validators, otherwise the response of render().
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = render()
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        # Authenticated data: only the client may keep it, and must revalidate.
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ['Authorization'])
+    return response
@@ -0,0 +1,119 @@
+""" Geohash encoding and the geometry used by the proximity search.
+
+    A geohash names a cell of a grid over the globe, and the points inside
+    it share its prefix, so they sort together: "points in these cells"
+    is a few range scans of an indexed column. The cells only prune the candidates,
+    the exact distance is computed with the haversine formula.
+"""
+
+# Python
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def encode(lat, lon, precision=PRECISION):
+    """ Return the geohash of a point. """
+    lat, lon = float(lat), float(lon)
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    geohash, bits, value, even = [], 0, 0, True
+    while len(geohash) < precision:
+        interval, coordinate = (lon_range, lon) if even else (lat_range, lat)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            geohash.append(BASE32[value])
+            bits, value = 0, 0
+    return ''.join(geohash)
+
+
+def cell_size(precision):
+    """ Return the (height, width) in degrees of the cells of a precision. """
+    lon_bits = math.ceil(5 * precision / 2)
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def bounding_box(lat, lon, radius_km):
+    """ Return (min_lat, min_lon, max_lat, max_lon) around a point. """
+    lat, lon = float(lat), float(lon)
+    delta_lat = radius_km / KM_PER_DEGREE
+    cos_lat = math.cos(math.radians(lat))
+    if cos_lat < 1e-6:
+        delta_lon = 180.0
+    else:
+        delta_lon = min(radius_km / (KM_PER_DEGREE * cos_lat), 180.0)
+    return (
+        max(lat - delta_lat, -90.0),
+        lon - delta_lon,
+        min(lat + delta_lat, 90.0),
+        lon + delta_lon
+    )
+
+
+def covering_cells(lat, lon, radius_km, max_cells=64):
+    """ Return the geohash prefixes of the cells covering the circle's
+        bounding box, at the finest precision that needs at most max_cells.
+    """
+    min_lat, min_lon, max_lat, max_lon = bounding_box(lat, lon, radius_km)
+    for precision in range(PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = math.ceil((max_lat - min_lat) / height) + 1
+        columns = math.ceil((max_lon - min_lon) / width) + 1
+        if rows * columns <= max_cells or precision == 1:
+            break
+    cells = set()
+    for row in range(rows + 1):
+        cell_lat = min(min_lat + row * height, max_lat)
+        for column in range(columns + 1):
+            cell_lon = min(min_lon + column * width, max_lon)
+            # Wrap the longitude around the antimeridian.
+            cell_lon = (cell_lon + 180.0) % 360.0 - 180.0
+            cells.add(encode(cell_lat, cell_lon, precision))
+    return sorted(cells)
+
+
+def next_cell(cell):
+    """ Return the geohash that follows cell at the same precision, None
+        after the last one. Every geohash starting with cell sorts between
+        cell and its next cell.
+    """
+    cell = cell.rstrip(BASE32[-1])
+    if not cell:
+        return None
+    return cell[:-1] + BASE32[BASE32.index(cell[-1]) + 1]
+
+
+def cell_ranges(cells):
+    """ Return [low, high) geohash ranges covering the cells, merging the
+        contiguous ones; high is None for a range open to the end.
+    """
+    ranges = []
+    for cell in sorted(cells):
+        high = next_cell(cell)
+        if ranges and ranges[-1][1] is not None and ranges[-1][1] >= cell:
+            if high is None or high > ranges[-1][1]:
+                ranges[-1][1] = high
+            continue
+        ranges.append([cell, high])
+    return [tuple(cell_range) for cell_range in ranges]
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """ Return the great-circle distance in km between two points. """
+    lat1, lon1, lat2, lon2 = map(math.radians, map(float, (lat1, lon1, lat2, lon2)))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
@@ -0,0 +1,220 @@
+""" Pagination classes shared by the list endpoints. """
+
+# Python
+import json
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+
+# Django imports
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+# Django REST Framework imports
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """ Keyset (seek) pagination.
+
+        The cursor stores the ordering values of the last row sent, and the
+        next page is read with a WHERE on those values instead of an OFFSET,
+        so deep pages cost the same as the first one and no COUNT(*) is run.
+        The last ordering field must be unique (usually the primary key).
+    """
+    ordering = ('-created_at', '-id')
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """ Return the page of rows that follows the requested cursor. """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.fields = [
+            queryset.model._meta.get_field(name.lstrip('-')) for name in self.ordering
+        ]
+        position, self.reverse = self.decode_cursor(request)
+        queryset = self.load_ordering_fields(queryset)
+        ordering = self.ordering
+        if self.reverse:
+            ordering = [self.invert(name) for name in ordering]
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.seek(ordering, position))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.page = rows
+        return rows
+
+    def load_ordering_fields(self, queryset):
+        """ Make sure the rows carry the fields the cursor is built from,
+            also when the view narrowed the columns with .only() or .values().
+        """
+        names = [field.name for field in self.fields]
+        if queryset._fields:
+            missing = [name for name in names if name not in queryset._fields]
+            return queryset.values(*queryset._fields, *missing) if missing else queryset
+        loaded, deferred = queryset.query.deferred_loading
+        if loaded and not deferred:
+            return queryset.only(*loaded, *names)
+        return queryset
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        """ Read the page size from the request, bounded by max_page_size. """
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.build_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.build_link(self.page[0], reverse=True)
+
+    def build_link(self, row, reverse):
+        """ Return the url of the page next to the given row. """
+        position = [
+            self.get_row_value(row, field) for field in self.fields
+        ]
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            self.encode_cursor(position, reverse)
+        )
+
+    def get_row_value(self, row, field):
+        """ Return the value of an ordering field for a model or a values() row. """
+        if isinstance(row, dict):
+            value = row[field.attname] if field.attname in row else row[field.name]
+        else:
+            value = getattr(row, field.attname)
+        return field.get_prep_value(value)
+
+    def encode_cursor(self, position, reverse):
+        """ Return an opaque cursor for the position. """
+        payload = {'p': [None if value is None else str(value) for value in position]}
+        if reverse:
+            payload['r'] = 1
+        data = json.dumps(payload, separators=(',', ':')).encode('ascii')
+        return b64encode(data).decode('ascii')
+
+    def decode_cursor(self, request):
+        """ Return the position and direction stored in the cursor. """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            payload = json.loads(b64decode(encoded.encode('ascii')).decode('ascii'))
+            position = [
+                field.to_python(value) for field, value in zip(self.fields, payload['p'])
+            ]
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        if len(position) != len(self.fields):
+            raise NotFound(self.invalid_cursor_message)
+        return position, bool(payload.get('r'))
+
+    def seek(self, ordering, position):
+        """ Return the filter for the rows after the position in the ordering.
+
+            For (a DESC, b DESC) it builds a <= x AND (a < x OR (a = x AND b < y)),
+            the leading bound lets the database range-scan the index.
+        """
+        conditions = Q()
+        equal = {}
+        for name, value in zip(ordering, position):
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            field = name.lstrip('-')
+            conditions |= Q(**equal, **{f'{field}__{lookup}': value})
+            equal[field] = value
+        first = ordering[0]
+        bound = 'lte' if first.startswith('-') else 'gte'
+        return Q(**{f'{first.lstrip("-")}__{bound}': position[0]}) & conditions
+
+    @staticmethod
+    def invert(name):
+        return name[1:] if name.startswith('-') else f'-{name}'
+
+
+class ServiceKeysetPagination(KeysetPagination):
+    """ Newest services first. """
+    ordering = ('-created_at', '-id')
+
+
+class BabysitterKeysetPagination(KeysetPagination):
+    """ Best rated babysitters first. """
+    ordering = ('-reputation', '-id')
+
+
+class BabysitterCardKeysetPagination(KeysetPagination):
+    """ Best rated babysitter cards first. """
+    ordering = ('-reputation', '-user_id')
+
+
+class ReviewKeysetPagination(KeysetPagination):
+    """ Newest reviews first. """
+    ordering = ('-created_at', '-id')
+
+
+class KeysetPaginationMixin:
+    """ Let a list endpoint switch to keyset pagination with
+        ?pagination=cursor, keeping limit/offset as the default.
+    """
+    keyset_pagination_class = None
+    pagination_mode_query_param = 'pagination'
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            mode = self.request.query_params.get(self.pagination_mode_query_param)
+            keyset_pagination_class = self.get_keyset_pagination_class()
+            if mode == 'cursor' and keyset_pagination_class is not None:
+                self._paginator = keyset_pagination_class()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+
+    def get_keyset_pagination_class(self):
+        return self.keyset_pagination_class
@@ -0,0 +1,105 @@
+""" Sparse fieldsets (?fields= / ?omit=) for serializers and querysets. """
+
+# Django imports
+from django.core.exceptions import FieldDoesNotExist
+
+# Django REST Framework imports
+from rest_framework.exceptions import ValidationError
+
+
+class SparseFieldsetSerializerMixin:
+    """ Drop the serializer fields that were not requested.
+
+        The requested names arrive in the serializer context under
+        'fields', the view puts them there; without it every field is kept.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get('fields')
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsetViewMixin:
+    """ Read ?fields= and ?omit= and narrow the queryset to match.
+
+        sparse_relations maps a nested serializer field to the joins and
+        columns it needs:
+            'select_related': paths joined in the same query.
+            'prefetch_related': paths loaded in a second query.
+            'only': the columns of the related rows that are read.
+        Any other requested field is loaded with .only() when it's a column
+        of the model. A relation that isn't requested isn't joined.
+    """
+    sparse_relations = {}
+    sparse_fieldset_actions = ('list', 'retrieve')
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def get_sparse_fieldset(self):
+        """ Return the requested field names, None means all of them. """
+        if hasattr(self, '_sparse_fieldset'):
+            return self._sparse_fieldset
+        self._sparse_fieldset = None
+        if self.action not in self.sparse_fieldset_actions:
+            return None
+        fields = self.parse_field_names(self.fields_query_param)
+        omit = self.parse_field_names(self.omit_query_param)
+        if fields is None and omit is None:
+            return None
+        available = list(self.get_serializer_class()().fields)
+        unknown = set(fields or []) | set(omit or [])
+        unknown -= set(available)
+        if unknown:
+            raise ValidationError({
+                'fields': f'Unknown fields: {", ".join(sorted(unknown))}'
+            })
+        selected = [name for name in available if fields is None or name in fields]
+        self._sparse_fieldset = [name for name in selected if name not in (omit or [])]
+        return self._sparse_fieldset
+
+    def parse_field_names(self, param):
+        """ Return the comma separated names of the query param. """
+        value = self.request.query_params.get(param)
+        if value is None:
+            return None
+        return [name.strip() for name in value.split(',') if name.strip()]
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        fields = self.get_sparse_fieldset()
+        if fields is not None:
+            context['fields'] = fields
+        return context
+
+    def apply_sparse_fieldset(self, queryset):
+        """ Add the joins, prefetches and column list for the requested fields. """
+        fields = self.get_sparse_fieldset()
+        requested = self.sparse_relations if fields is None else fields
+        select_related, prefetch_related = [], []
+        only = [queryset.model._meta.pk.name]
+        narrow = fields is not None
+        for name in requested:
+            relation = self.sparse_relations.get(name)
+            if relation is not None:
+                select_related += relation.get('select_related', [])
+                prefetch_related += relation.get('prefetch_related', [])
+                only += relation.get('only', [])
+                continue
+            try:
+                field = queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                narrow = False
+                continue
+            if not field.concrete:
+                narrow = False
+            only.append(name)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        if narrow:
+            queryset = queryset.only(*only)
+        return queryset
@@ -10,7 +10,7 @@ is_authenticated_permission = Parameter(
     You need to have an account and access token, that will be send in the next
     format:
     KEY             VALUE
-    Authorization   Token <token>
+    Authorization   Token <token>, or Bearer <access token>
     """,
     required=True,
     type='string'
@@ -25,7 +25,7 @@ is_client_permission = Parameter(
     The access token must be send, in the next
     format:
     KEY             VALUE
-    Authorization   Token <token>
+    Authorization   Token <token>, or Bearer <access token>
     """,
     required=True,
     type='string'
@@ -40,7 +40,7 @@ is_account_owner_permission = Parameter(
     The access token must be send, in the next
     format:
     KEY             VALUE
-    Authorization   Token <token>
+    Authorization   Token <token>, or Bearer <access token>
     """,
     required=True,
     type='string'
@@ -56,7 +56,7 @@ is_service_owner_permission = Parameter(
     The access token must be send, in the next
     format:
     KEY             VALUE
-    Authorization   Token <token>
+    Authorization   Token <token>, or Bearer <access token>
     """,
     required=True,
     type='string'
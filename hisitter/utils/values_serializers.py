@@ -0,0 +1,196 @@
+""" Read-only serializers that build the representation from .values() rows.
+
+    A ValuesSerializer mirrors a DRF serializer: it reads the fields of that
+    serializer once, turns each of them into a column and a converter, and
+    then builds every row's dict straight from the database values. The output
+    is the same as the DRF serializer's, without instantiating model objects
+    or running the per-field machinery for each row.
+"""
+
+# Python
+from collections import defaultdict
+
+# Django imports
+from django.utils.duration import duration_string
+
+# Django REST Framework imports
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def to_isoformat(value):
+    """ Return the ISO 8601 string of a date. """
+    return value.isoformat()
+
+
+class ValuesSerializer:
+    """ Build the representation of serializer_class from .values() rows.
+
+        nested maps a nested serializer field to the ValuesSerializer that
+        renders it and the path of the related row, for example
+        {'service_origin': (ReviewValuesSerializer, 'service_origin')}.
+        many maps a many=True nested field to the ValuesSerializer of the
+        items, their model and the foreign key pointing to this row; the
+        items are read with one query for all the rows.
+    """
+    serializer_class = None
+    nested = {}
+    many = {}
+    # Column that is None when a nullable related row does not exist.
+    null_column = None
+
+    def __init__(self, prefix='', context=None):
+        self.prefix = prefix
+        self.context = context or {}
+        self.plan = self.build_plan()
+
+    def build_plan(self):
+        """ Return (key, column, converter) for each readable field.
+
+            For nested fields the converter is a ValuesSerializer, for many
+            fields the column is None.
+        """
+        serializer = self.serializer_class(context=self.context)
+        model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+        # The sparse fieldset only applies to the top level serializer.
+        nested_context = {
+            key: value for key, value in self.context.items() if key != 'fields'
+        }
+        plan = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if name in self.nested:
+                values_serializer, path = self.nested[name]
+                plan.append((
+                    name,
+                    None,
+                    values_serializer(prefix=f'{self.prefix}{path}__', context=nested_context)
+                ))
+                continue
+            if name in self.many:
+                values_serializer, related_model, related_field = self.many[name]
+                plan.append((
+                    name,
+                    None,
+                    (values_serializer(context=nested_context), related_model, related_field, {})
+                ))
+                continue
+            source = field.source.replace('.', '__')
+            plan.append((name, self.prefix + source, self.get_converter(field, model, source)))
+        return plan
+
+    def get_converter(self, field, model, source):
+        """ Return the function that turns a column value into the field's
+            representation, None when the value is already the representation.
+        """
+        if isinstance(field, serializers.FileField):
+            return self.file_url_converter(model._meta.get_field(source).storage)
+        if isinstance(field, (serializers.DateTimeField, serializers.DecimalField)):
+            return field.to_representation
+        if isinstance(field, serializers.DateField):
+            output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+            if output_format is not None and output_format.lower() == ISO_8601:
+                return to_isoformat
+            return field.to_representation
+        if isinstance(field, serializers.DurationField):
+            return duration_string
+        if isinstance(field, (
+            serializers.IntegerField,
+            serializers.CharField,
+            serializers.ChoiceField,
+            serializers.BooleanField,
+            serializers.ReadOnlyField
+        )):
+            return None
+        return field.to_representation
+
+    def file_url_converter(self, storage):
+        """ Return the url of a stored file name, absolute when there is a request. """
+        request = self.context.get('request')
+
+        def file_url(name):
+            if not name:
+                return None
+            url = storage.url(name)
+            if request is not None:
+                return request.build_absolute_uri(url)
+            return url
+        return file_url
+
+    def get_columns(self):
+        """ Return the .values() paths needed to build the rows. """
+        columns = []
+        if self.null_column:
+            columns.append(self.prefix + self.null_column)
+        for name, column, converter in self.plan:
+            if column is not None:
+                columns.append(column)
+            elif isinstance(converter, ValuesSerializer):
+                columns += converter.get_columns()
+            else:
+                columns.append(self.prefix + 'id')
+        return list(dict.fromkeys(columns))
+
+    def prefetch(self, rows):
+        """ Read the items of the many fields for all the rows at once. """
+        for name, column, converter in self.plan:
+            if isinstance(converter, ValuesSerializer):
+                converter.prefetch(rows)
+            elif column is None:
+                values_serializer, related_model, related_field, items = converter
+                ids = {row[self.prefix + 'id'] for row in rows} - {None}
+                items.clear()
+                if not ids:
+                    continue
+                related_rows = related_model.objects.filter(
+                    **{f'{related_field}__in': ids}
+                ).order_by('pk').values(related_field, *values_serializer.get_columns())
+                related_rows = list(related_rows)
+                values_serializer.prefetch(related_rows)
+                grouped = defaultdict(list)
+                for related_row in related_rows:
+                    grouped[related_row[related_field]].append(
+                        values_serializer.to_representation(related_row)
+                    )
+                items.update(grouped)
+
+    def to_representation(self, row):
+        """ Return the representation of one row. """
+        if self.null_column and row[self.prefix + self.null_column] is None:
+            return None
+        data = {}
+        for name, column, converter in self.plan:
+            if column is None:
+                if isinstance(converter, ValuesSerializer):
+                    data[name] = converter.to_representation(row)
+                else:
+                    data[name] = converter[3].get(row[self.prefix + 'id'], [])
+                continue
+            value = row[column]
+            if value is None or converter is None:
+                data[name] = value
+            else:
+                data[name] = converter(value)
+        return data
+
+    def serialize(self, rows):
+        """ Return the representation of all the rows. """
+        rows = list(rows)
+        self.prefetch(rows)
+        return [self.to_representation(row) for row in rows]
+
+
+class ValuesListModelMixin:
+    """ List endpoint that serializes the page with values_serializer_class. """
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = self.values_serializer_class(context=self.get_serializer_context())
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.values(*values_serializer.get_columns())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.serialize(page))
+        return Response(values_serializer.serialize(queryset))